@@ -0,0 +1,121 @@
+"""
+Times :class:`instatus.analytics.IncidentHistory` on a synthetic history with millions
+of outage intervals, against the per component Python loop it replaces.
+
+    python benchmarks/analytics.py --intervals 5000000 --components 2000
+
+The loop is only run on a sample of the components (``--loop-components``) and
+extrapolated, it would take minutes on all of them. The results of both are compared
+on that sample. Building the history from payloads is timed separately, on
+``--payloads`` incidents shaped like the API's.
+"""
+
+import time
+import random
+import argparse
+import datetime
+
+import numpy as np
+
+from instatus.analytics import IncidentHistory
+
+YEAR_START = int(datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc).timestamp() * 1000)
+YEAR_END = int(datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc).timestamp() * 1000)
+
+
+def synthetic(intervals: int, components: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    start = rng.integers(YEAR_START, YEAR_END, intervals, dtype=np.int64)
+    # mostly minutes, a few hours long
+    end = start + rng.exponential(20 * 60 * 1000, intervals).astype(np.int64) + 1000
+    component = rng.integers(0, components, intervals, dtype=np.int32)
+    impact = rng.integers(2, 5, intervals, dtype=np.int8)
+    kind = (rng.random(intervals) < 0.1).astype(np.int8)
+    return start, end, component, impact, kind
+
+
+def loop_downtime(rows, edges, min_impact=3):
+    # what the callers did before: merge the intervals of each component in Python, per window
+    result = []
+    for window_start, window_end in zip(edges[:-1], edges[1:]):
+        intervals = sorted((max(start, window_start), min(end, window_end)) for start, end, impact, kind in rows
+                           if impact >= min_impact and kind == 0 and end > window_start and start < window_end)
+        total = 0
+        current_start = current_end = None
+        for start, end in intervals:
+            if current_end is None or start > current_end:
+                if current_end is not None:
+                    total += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        if current_end is not None:
+            total += current_end - current_start
+        result.append(total / 1000)
+    return result
+
+
+def payloads(count: int, components: int):
+    rng = random.Random(0)
+    ids = ['cl%023d' % i for i in range(components)]
+    impacts = ('DEGRADEDPERFORMANCE', 'PARTIALOUTAGE', 'MAJOROUTAGE')
+    items = []
+    for _ in range(count):
+        started = datetime.datetime(2022, 1, 1) + datetime.timedelta(seconds=rng.randrange(365 * 86400))
+        resolved = started + datetime.timedelta(seconds=rng.randrange(60, 7200))
+        items.append({
+            'started': started.isoformat(timespec='milliseconds') + 'Z',
+            'resolved': resolved.isoformat(timespec='milliseconds') + 'Z',
+            'impact': rng.choice(impacts),
+            'components': [{'id': rng.choice(ids)} for _ in range(rng.randint(1, 3))],
+        })
+    return items, ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--intervals', type=int, default=5000000)
+    parser.add_argument('--components', type=int, default=2000)
+    parser.add_argument('--loop-components', type=int, default=20)
+    parser.add_argument('--payloads', type=int, default=200000)
+    args = parser.parse_args()
+
+    start, end, component, impact, kind = synthetic(args.intervals, args.components)
+    edges = IncidentHistory.month_edges('2022-01', '2023-01')
+    print('%d intervals on %d components, 12 monthly windows\n' % (args.intervals, args.components))
+
+    started = time.perf_counter()
+    history = IncidentHistory(start, end, component, impact, kind, components=[str(i) for i in range(args.components)])
+    build = time.perf_counter() - started
+    started = time.perf_counter()
+    downtime = history.downtime_windows(edges)
+    first = time.perf_counter() - started
+    started = time.perf_counter()
+    history.uptime_windows(edges)
+    history.reliability(int(edges[0]), int(edges[-1]))
+    cached = time.perf_counter() - started
+    print('%-44s %8.3f s' % ('sort into columns', build))
+    print('%-44s %8.3f s' % ('merge + monthly downtime of all components', first))
+    print('%-44s %8.3f s' % ('monthly uptime + reliability (merge cached)', cached))
+
+    sample = range(args.loop_components)
+    rows = {index: [] for index in sample}
+    for row in zip(start.tolist(), end.tolist(), component.tolist(), impact.tolist(), kind.tolist()):
+        if row[2] in rows:
+            rows[row[2]].append((row[0], row[1], row[3], row[4]))
+    started = time.perf_counter()
+    expected = [loop_downtime(rows[index], edges.tolist()) for index in sample]
+    loop = (time.perf_counter() - started) / len(sample) * args.components
+    assert np.allclose(downtime[:len(sample)], expected), 'the vectorized downtime differs from the loop'
+    print('%-44s %8.1f s  (extrapolated from %d components, results equal)' % ('Python loop per component', loop,
+                                                                                 len(sample)))
+
+    items, ids = payloads(args.payloads, args.components)
+    started = time.perf_counter()
+    history = IncidentHistory.from_payloads(items, components=ids)
+    print('\n%-44s %8.3f s  (%d rows)' % ('from_payloads, %d incidents' % args.payloads, time.perf_counter() - started,
+                                          len(history)))
+
+
+if __name__ == '__main__':
+    main()
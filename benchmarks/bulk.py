@@ -0,0 +1,67 @@
+"""
+Measures the wall-clock time of updating many components against
+:class:`instatus.testing.FakeInstatus`, once one request after the other and once
+through :meth:`StatusClient.bulk_update_components` at a few concurrencies.
+
+    python benchmarks/bulk.py --components 200 --latency 0.02 --rate-limit 1000
+
+With a server latency of ``L`` the sequential loop needs about ``components * L``;
+the bulk operation should get close to ``components * L / concurrency`` until the
+rate limit of the bucket becomes the bound. No api key or network is needed, and
+every run gets a fresh server so the buckets start full.
+"""
+
+import time
+import asyncio
+import argparse
+
+from instatus.testing import FakeInstatus
+
+
+async def sequential(client, page_id, components, concurrency):
+    for component in components:
+        await client.update_component(page_id, component, {'status': 'OPERATIONAL'})
+
+
+async def bulk(client, page_id, components, concurrency):
+    updates = {component: {'status': 'OPERATIONAL'} for component in components}
+    result = await client.bulk_update_components(page_id, updates, concurrency=concurrency)
+    if not result.ok:
+        raise RuntimeError('%d updates failed' % len(result.failed))
+
+
+async def run(args, workload, concurrency):
+    async with FakeInstatus(rate_limit=args.rate_limit, window=args.window, latency=args.latency) as fake:
+        page_id = fake.add_page(components=args.components)
+        components = list(fake.pages[page_id]['components'])
+        client = fake.client(coalesce_requests=False)
+        started = time.perf_counter()
+        await workload(client, page_id, components, concurrency)
+        elapsed = time.perf_counter() - started
+        await client.close()
+
+    return elapsed, fake.stats
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--components', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.02, help='server latency in seconds')
+    parser.add_argument('--rate-limit', type=int, default=1000)
+    parser.add_argument('--window', type=float, default=1.0)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 5, 10, 25])
+    args = parser.parse_args()
+
+    print('%-24s %9s %8s %8s %8s %8s' % ('run', 'seconds', 'items/s', 'requests', '429s', 'speedup'))
+    runs = [('sequential loop', sequential, 1)]
+    runs.extend(('bulk, concurrency=%d' % concurrency, bulk, concurrency) for concurrency in args.concurrency)
+    baseline = None
+    for name, workload, concurrency in runs:
+        elapsed, stats = await run(args, workload, concurrency)
+        baseline = baseline or elapsed
+        print('%-24s %9.3f %8.0f %8d %8d %7.1fx' % (name, elapsed, args.components / elapsed, stats['requests'],
+                                                    stats['rate_limited'], baseline / elapsed))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+"""
+Compares the CPU time and peak memory of decoding and encoding a large
+``get_all_incidents`` sized payload with each installed :class:`instatus.codec.JSONCodec`,
+and with how the client did it before (``response.text()`` followed by ``json.loads``,
+``json.dumps`` with ``ensure_ascii``).
+
+    python benchmarks/codec.py --count 20000 --repeat 5
+
+Decoding goes through :func:`instatus.http_requests.json_or_text` with a response whose
+body is already read, so only the work on the body is measured. The CPU time is the
+best of ``--repeat`` runs of :func:`time.process_time`; the peak memory is measured in a
+separate run under tracemalloc, which would otherwise slow the timed runs down, and
+doesn't count the body itself.
+"""
+
+import gc
+import json
+import time
+import random
+import asyncio
+import argparse
+import tracemalloc
+
+from instatus.codec import OrjsonCodec, StdlibCodec, UjsonCodec
+from instatus.http_requests import json_or_text
+
+
+class Response:
+    # just enough of an aiohttp response for json_or_text
+    def __init__(self, body: bytes):
+        self.body = body
+        self.headers = {'content-type': 'application/json; charset=utf-8'}
+        self.charset = 'utf-8'
+
+    async def read(self) -> bytes:
+        return self.body
+
+    async def text(self) -> str:
+        return self.body.decode(self.charset)
+
+
+def incidents(count: int, updates: int) -> list:
+    rng = random.Random(0)
+    statuses = ('INVESTIGATING', 'IDENTIFIED', 'MONITORING', 'RESOLVED')
+    result = []
+    for i in range(count):
+        started = '2022-05-%02dT10:%02d:00.000Z' % (i % 28 + 1, i % 60)
+        result.append({
+            'id': 'cl%023x' % rng.getrandbits(92),
+            'name': 'Incident %d – degraded API' % i,
+            'status': 'RESOLVED',
+            'impact': 'MAJOROUTAGE',
+            'notify': True,
+            'started': started,
+            'resolved': started,
+            'createdAt': started,
+            'updatedAt': started,
+            'components': [{'id': 'cl%023x' % rng.getrandbits(92), 'name': 'API', 'status': 'OPERATIONAL'}],
+            'incidentUpdates': [{
+                'id': 'cl%023x' % rng.getrandbits(92),
+                'message': 'We are looking into elevated error rates on the API (%d).' % j,
+                'markdown': 'We are looking into **elevated error rates** on the API (%d).' % j,
+                'status': statuses[j % 4],
+                'notify': True,
+                'started': started,
+                'createdAt': started,
+                'updatedAt': started,
+            } for j in range(updates)],
+        })
+    return result
+
+
+async def old_decode(response):
+    return json.loads(await response.text())
+
+
+def old_encode(obj) -> bytes:
+    # utils.to_json, then the request encoded the str
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=True).encode('utf-8')
+
+
+def codecs():
+    found = [StdlibCodec()]
+    for cls in (OrjsonCodec, UjsonCodec):
+        try:
+            found.append(cls())
+        except ImportError:
+            pass
+    return found
+
+
+def cpu(function, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        started = time.process_time()
+        result = function()
+        elapsed = time.process_time() - started
+        del result
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def peak(function) -> int:
+    gc.collect()
+    tracemalloc.start()
+    result = function()
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=20000)
+    parser.add_argument('--updates', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    data = incidents(args.count, args.updates)
+    body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    loop = asyncio.new_event_loop()
+
+    def decoder(decode):
+        return lambda: loop.run_until_complete(decode(Response(body)))
+
+    runs = [('decode', 'text() + json.loads', decoder(old_decode))]
+    runs.extend(('decode', codec.name + ' from bytes', decoder(lambda r, codec=codec: json_or_text(r, codec)))
+                for codec in codecs())
+    runs.append(('encode', 'json.dumps(ensure_ascii)', lambda: old_encode(data)))
+    runs.extend(('encode', codec.name + ' to bytes', lambda codec=codec: codec.dumps(data)) for codec in codecs())
+
+    print('%d incidents with %d updates each (%.1f MiB of JSON)\n' % (args.count, args.updates, len(body) / 2 ** 20))
+    print('%-7s %-26s %10s %10s' % ('', 'codec', 'CPU ms', 'peak MiB'))
+    for kind, name, function in runs:
+        print('%-7s %-26s %10.1f %10.1f' % (kind, name, cpu(function, args.repeat) * 1000, peak(function) / 2 ** 20))
+    loop.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Feeds metric data points into a :class:`instatus.DatapointWriter` from several threads
+and a coroutine at once, against :class:`instatus.testing.FakeInstatus`, and reports
+the sustained ingest rate, the requests it took and the flush latency.
+
+    python benchmarks/ingest.py --threads 4 --metrics 8 --seconds 5 --overflow block
+
+Once the writer is closed every point it still held has to have reached the server,
+in timestamp order per metric; the script checks both.
+"""
+
+import time
+import asyncio
+import argparse
+import threading
+
+from instatus.testing import FakeInstatus
+
+
+def produce(writer, page_id, metric_ids, stop, rate):
+    sent = 0
+    started = time.perf_counter()
+    while not stop.is_set():
+        for metric_id in metric_ids:
+            writer.write(page_id, metric_id, float(sent), timeout=1.0)
+        sent += 1
+        if rate:
+            # paced to ``rate`` points per second
+            delay = started + sent * len(metric_ids) / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--metrics', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--rate', type=float, default=0, help='the points per second of each thread; 0 is unpaced')
+    parser.add_argument('--latency', type=float, default=0.02, help='the seconds the server takes per request')
+    parser.add_argument('--max-batch', type=int, default=1000)
+    parser.add_argument('--max-age', type=float, default=0.5)
+    parser.add_argument('--max-pending', type=int, default=50000)
+    parser.add_argument('--overflow', default='block', choices=('block', 'drop_newest', 'drop_oldest'))
+    args = parser.parse_args()
+
+    async with FakeInstatus(rate_limit=100000, latency=args.latency) as fake:
+        page_id = fake.add_page(metrics=args.metrics)
+        metric_ids = list(fake.pages[page_id]['metrics'])
+        client = fake.client()
+        writer = client.datapoint_writer(max_batch=args.max_batch, max_age=args.max_age,
+                                         max_pending=args.max_pending, overflow=args.overflow)
+        stop = threading.Event()
+        threads = [threading.Thread(target=produce, args=(writer, page_id, metric_ids, stop, args.rate))
+                   for _ in range(args.threads)]
+
+        async def from_coroutine():
+            sent = 0
+            while not stop.is_set():
+                await writer.put(page_id, metric_ids[sent % len(metric_ids)], float(sent))
+                sent += 1
+                if sent % 100 == 0:
+                    await asyncio.sleep(100 / args.rate if args.rate else 0)
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        coroutine = asyncio.ensure_future(from_coroutine())
+        await asyncio.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            await asyncio.get_running_loop().run_in_executor(None, thread.join)
+        await coroutine
+        before_close = time.perf_counter()
+        await client.close()
+        closed = time.perf_counter()
+
+        stats = writer.stats()
+        received = sum(point for metric in fake.pages[page_id]['metrics'].values() for point in [len(metric['data'])])
+        in_order = all(
+            all(a['timestamp'] <= b['timestamp'] for a, b in zip(metric['data'], metric['data'][1:]))
+            for metric in fake.pages[page_id]['metrics'].values()
+        )
+        elapsed = before_close - started
+
+        print('%d threads + 1 coroutine at %s, %d metrics, %.1f s, overflow=%s, server latency %.0f ms\n'
+              % (args.threads, '%.0f points/s each' % args.rate if args.rate else 'full speed', args.metrics,
+                 args.seconds, args.overflow, args.latency * 1000))
+        print('%-28s %12d' % ('points offered', stats['received']))
+        print('%-28s %12d' % ('accepted', stats['accepted']))
+        print('%-28s %12d' % ('dropped', stats['dropped']))
+        print('%-28s %12d' % ('late', stats['late']))
+        print('%-28s %12.0f /s' % ('sustained ingest', stats['accepted'] / elapsed))
+        print('%-28s %12d  (%.0f points each)' % ('requests', stats['batches'], stats['flushed'] / max(stats['batches'], 1)))
+        print('%-28s %12.3f s' % ('flush latency p50', stats['latency_p50']))
+        print('%-28s %12.3f s' % ('flush latency p99', stats['latency_p99']))
+        print('%-28s %12.3f s' % ('close (final flush)', closed - before_close))
+        # with drop_oldest, the dropped points were accepted before
+        sent = received == stats['flushed'] and not stats['pending'] and not stats['failed']
+        print('%-28s %12s' % ('all queued points sent', sent))
+        print('%-28s %12s' % ('in timestamp order', in_order))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+"""
+Load tests the client against :class:`instatus.testing.FakeInstatus`, which rate limits
+like the real api, and reports the requests per second, the p50/p99 latency and how many
+of the requests the server answered with a 429.
+
+    python benchmarks/load.py --rate-limit 30 --window 1 --latency 0.005 --error-rate 0.01
+
+No api key or network is needed. Every workload gets a fresh client, so the rate limit
+state of one doesn't leak into the next.
+"""
+
+import time
+import asyncio
+import argparse
+import statistics
+
+from instatus.retry import RetryPolicy
+from instatus.testing import FakeInstatus
+
+
+async def timed(latencies: list, coro):
+    started = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        latencies.append(time.perf_counter() - started)
+
+
+async def burst_reads(client, pages, latencies, requests):
+    # everything at once on a single page, far more than one window allows
+    page = pages[0]
+    await asyncio.gather(*(timed(latencies, client.get_component(page.id, page.components[i % len(page.components)]))
+                           for i in range(requests)))
+
+
+async def mixed(client, pages, latencies, requests):
+    # reads and writes spread over the pages, so their buckets are used side by side
+    async def one(i):
+        page = pages[i % len(pages)]
+        component = page.components[i % len(page.components)]
+        if i % 4 == 0:
+            await client.update_component(page.id, component, {'status': 'DEGRADEDPERFORMANCE'})
+        elif i % 4 == 1:
+            await client.add_incident(page.id, {'name': 'Load %d' % i, 'status': 'INVESTIGATING'})
+        else:
+            await client.get_component(page.id, component)
+
+    await asyncio.gather(*(timed(latencies, one(i)) for i in range(requests)))
+
+
+async def paginate(client, pages, latencies, requests):
+    per_page = 25
+
+    async def walk(page):
+        async for _ in client.paginate_components(page.id, per_page=per_page):
+            pass
+
+    walks = max(requests // (len(pages[0].components) // per_page + 1), 1)
+    await asyncio.gather(*(timed(latencies, walk(pages[i % len(pages)])) for i in range(walks)))
+
+
+async def bulk_updates(client, pages, latencies, requests):
+    page = pages[0]
+    updates = {component: {'status': 'OPERATIONAL'} for component in page.components[:requests]}
+    await timed(latencies, client.bulk_update_components(page.id, updates))
+
+
+WORKLOADS = {
+    'burst reads': burst_reads,
+    'mixed reads/writes': mixed,
+    'pagination': paginate,
+    'bulk updates': bulk_updates,
+}
+
+
+class Page:
+    def __init__(self, fake: FakeInstatus, components: int):
+        self.id = fake.add_page(components=components)
+        self.components = list(fake.pages[self.id]['components'])
+
+
+async def run(args, name, workload):
+    fake = FakeInstatus(rate_limit=args.rate_limit, window=args.window, global_limit=args.global_limit,
+                        latency=(0, args.latency * 2) if args.latency else 0.0, error_rate=args.error_rate,
+                        seed=args.seed)
+    async with fake:
+        pages = [Page(fake, args.components) for _ in range(args.pages)]
+        client = fake.client(retry_policy=RetryPolicy(6, backoff_base=0.05), coalesce_requests=False)
+        latencies = []
+        started = time.perf_counter()
+        await workload(client, pages, latencies, args.requests)
+        elapsed = time.perf_counter() - started
+        await client.close()
+
+    stats = fake.stats
+    latencies.sort()
+    p99 = latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)]
+    print('%-20s %8.0f %9.1f %9.1f %8d %7.1f%% %7d' % (
+        name, stats['requests'] / elapsed, statistics.median(latencies) * 1000, p99 * 1000,
+        stats['requests'], stats['rate_limited'] / stats['requests'] * 100, stats['faults']))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--pages', type=int, default=4)
+    parser.add_argument('--components', type=int, default=200)
+    parser.add_argument('--rate-limit', type=int, default=30)
+    parser.add_argument('--window', type=float, default=1.0)
+    parser.add_argument('--global-limit', type=int, default=None)
+    parser.add_argument('--latency', type=float, default=0.005, help='mean server latency in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workload', choices=WORKLOADS, nargs='+', default=list(WORKLOADS))
+    args = parser.parse_args()
+
+    print('%-20s %8s %9s %9s %8s %8s %7s' % ('workload', 'rps', 'p50 ms', 'p99 ms', 'requests', '429s', 'faults'))
+    for name in args.workload:
+        await run(args, name, WORKLOADS[name])
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+"""
+Compares the memory of holding a large list of incidents as the decoded payloads
+(a list of nested dicts) and as :class:`instatus.models.Incident` models.
+
+    python benchmarks/models_memory.py --count 100000
+
+The payloads are decoded from JSON like a response body, so every object is its
+own allocation, as it is in practice. The memory is what tracemalloc still sees
+allocated once the list is built and everything else is released.
+
+An untouched :class:`ModelSequence` holds the decoded payloads, so it costs as much
+as the list of dicts. Once the models are built, the dicts are gone and the enum
+values are shared, but the ids, texts and timestamp strings are still one object
+per field. With the defaults this comes to roughly 72% of the dicts, so not the
+fraction one might hope for.
+"""
+
+import gc
+import json
+import time
+import random
+import argparse
+import tracemalloc
+
+from instatus.models import Incident, ModelSequence
+
+
+def payload(count: int, updates: int) -> bytes:
+    rng = random.Random(0)
+    statuses = ('INVESTIGATING', 'IDENTIFIED', 'MONITORING', 'RESOLVED')
+    incidents = []
+    for i in range(count):
+        incidents.append({
+            'id': 'cl%023x' % rng.getrandbits(92),
+            'name': 'Incident %d' % i,
+            'status': 'RESOLVED',
+            'impact': 'MAJOROUTAGE',
+            'notify': True,
+            'started': '2022-05-%02dT10:%02d:00.000Z' % (i % 28 + 1, i % 60),
+            'resolved': '2022-05-%02dT12:%02d:00.000Z' % (i % 28 + 1, i % 60),
+            'createdAt': '2022-05-%02dT10:%02d:00.000Z' % (i % 28 + 1, i % 60),
+            'updatedAt': '2022-05-%02dT12:%02d:00.000Z' % (i % 28 + 1, i % 60),
+            'components': [],
+            'incidentUpdates': [{
+                'id': 'cl%023x' % rng.getrandbits(92),
+                'message': 'Update %d' % j,
+                'markdown': 'Update %d' % j,
+                'status': statuses[j % 4],
+                'notify': True,
+                'started': '2022-05-01T10:00:00.000Z',
+                'createdAt': '2022-05-01T10:00:00.000Z',
+                'updatedAt': '2022-05-01T10:00:00.000Z',
+            } for j in range(updates)],
+        })
+    return json.dumps(incidents).encode()
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--updates', type=int, default=2)
+    args = parser.parse_args()
+
+    body = payload(args.count, args.updates)
+
+    def dicts():
+        return json.loads(body)
+
+    def lazy():
+        return ModelSequence(json.loads(body), Incident)
+
+    def models():
+        incidents = ModelSequence(json.loads(body), Incident)
+        for incident in incidents:
+            # the nested updates become models too
+            for update in incident.updates:
+                pass
+        return incidents
+
+    print('%d incidents with %d updates each (%.1f MiB of JSON)\n' % (args.count, args.updates, len(body) / 2 ** 20))
+    print('%-36s %10s %10s %9s' % ('representation', 'MiB', 'per item', 'build s'))
+    baseline = None
+    for name, build in (('list of dicts', dicts),
+                        ('ModelSequence, untouched', lazy),
+                        ('ModelSequence, all models built', models)):
+        result, size, elapsed = measure(build)
+        baseline = baseline or size
+        print('%-36s %10.1f %9.0fB %9.2f  (%.0f%%)' % (name, size / 2 ** 20, size / args.count, elapsed,
+                                                      size / baseline * 100))
+        del result
+
+
+if __name__ == '__main__':
+    main()
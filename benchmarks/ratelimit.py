@@ -0,0 +1,96 @@
+"""
+Measures the throughput of concurrent ``GET`` requests sharing one rate limit bucket
+against :class:`instatus.testing.FakeInstatus`, with the current :class:`RateLimiter`
+and with a limiter that holds a lock per bucket for the whole round trip, like
+``HTTPClient.request`` used to.
+
+    python benchmarks/ratelimit.py --requests 200 --rate-limit 100 --latency 0.05
+
+All requests read components of a single page, so they use the same bucket. With
+the lock only one of them runs at a time and the throughput is about ``1 / latency``
+whatever the budget left; the limiter lets up to ``remaining`` of them run at once,
+so the rate limit of the bucket becomes the bound. No api key or network is needed.
+"""
+
+import time
+import asyncio
+import argparse
+
+from instatus.ratelimit import Bucket, RateLimiter
+from instatus.testing import FakeInstatus
+
+
+class LockedBucket(Bucket):
+    # one request per bucket at a time, released once the request is done
+    def __init__(self, key, loop):
+        super().__init__(key, loop)
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        await self.lock.acquire()
+        try:
+            await super().acquire()
+        except BaseException:
+            self.lock.release()
+            raise
+
+    def release(self):
+        super().release()
+        self.lock.release()
+
+
+class LockedRateLimiter(RateLimiter):
+    def get_bucket(self, key):
+        try:
+            return self._buckets[key]
+        except KeyError:
+            bucket = self._buckets[key] = LockedBucket(key, self.loop)
+            return bucket
+
+
+async def run(args, limiter):
+    fake = FakeInstatus(rate_limit=args.rate_limit, window=args.window, latency=args.latency)
+    async with fake:
+        page_id = fake.add_page(components=args.components)
+        components = list(fake.pages[page_id]['components'])
+        client = fake.client(coalesce_requests=False)
+        if limiter is not None:
+            client._http._ratelimiter = limiter(client._http.loop)
+
+        async def one(i):
+            started = time.perf_counter()
+            await client.get_component(page_id, components[i % len(components)])
+            latencies.append(time.perf_counter() - started)
+
+        latencies = []
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - started
+        await client.close()
+
+    latencies.sort()
+    return elapsed, latencies, fake.stats
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--components', type=int, default=50)
+    parser.add_argument('--rate-limit', type=int, default=100)
+    parser.add_argument('--window', type=float, default=1.0)
+    parser.add_argument('--latency', type=float, default=0.05, help='server latency in seconds')
+    args = parser.parse_args()
+
+    print('%d GETs on one bucket, %d per %.1fs, %.0f ms latency\n' % (args.requests, args.rate_limit, args.window,
+                                                                    args.latency * 1000))
+    print('%-22s %9s %8s %9s %9s %9s %8s' % ('limiter', 'seconds', 'rps', 'p50 ms', 'p99 ms', 'requests', '429s'))
+    for name, limiter in (('lock per bucket', LockedRateLimiter), ('token bucket', None)):
+        elapsed, latencies, stats = await run(args, limiter)
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)]
+        print('%-22s %9.2f %8.0f %9.1f %9.1f %9d %8d' % (name, elapsed, args.requests / elapsed, p50 * 1000,
+                                                         p99 * 1000, stats['requests'], stats['rate_limited']))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
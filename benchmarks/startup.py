@@ -0,0 +1,109 @@
+"""
+Measures what ``import instatus`` costs and how long the first request takes,
+each in a fresh interpreter, using ``python -X importtime``.
+
+    python benchmarks/startup.py --runs 5 --max-import-ms 50
+
+With ``--max-import-ms`` it exits with status 1 if the bare import got slower than
+that, or if it started a thread, so it can guard against regressions in CI.
+"""
+
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+
+IMPORTTIME = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)')
+
+SCENARIOS = {
+    'import instatus': 'import instatus',
+    'an exception class': 'import instatus; instatus.NotFound',
+    'StatusClient': 'import instatus; instatus.StatusClient',
+}
+
+FIRST_REQUEST = '''
+import time, asyncio, threading
+started = time.perf_counter()
+import instatus
+from instatus.http_requests import RouteTemplate
+RouteTemplate.BASE = 'http://127.0.0.1:%d/'
+client = instatus.StatusClient('key')
+from instatus.client import asyncio_run
+asyncio_run(client.get_status_pages())
+print('FIRST', (time.perf_counter() - started) * 1000)
+print('THREADS', threading.active_count())
+'''
+
+BARE_THREADS = 'import threading, instatus; print("THREADS", threading.active_count())'
+
+
+def run(code: str, *args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get('PYTHONPATH')])))
+    return subprocess.run([sys.executable, *args, '-c', code], capture_output=True, text=True, env=env, check=True)
+
+
+def _total_us(code: str) -> int:
+    total = 0
+    for line in run(code, '-X', 'importtime').stderr.splitlines():
+        match = IMPORTTIME.match(line)
+        # top level entries only, so nested imports aren't counted twice
+        if match and not match.group(2):
+            total += int(match.group(1))
+    return total
+
+
+def import_ms(code: str) -> float:
+    """Returns the time ``code`` spent importing in ms, without the imports of the interpreter startup."""
+    return max(_total_us(code) - _total_us('pass'), 0) / 1000
+
+
+def start_server(port: int) -> subprocess.Popen:
+    code = '''
+from aiohttp import web
+async def pages(request):
+    return web.json_response([])
+app = web.Application()
+app.router.add_get('/v1/pages', pages)
+web.run_app(app, host='127.0.0.1', port=%d, print=lambda *_: print('READY', flush=True))
+''' % port
+    server = subprocess.Popen([sys.executable, '-c', code], stdout=subprocess.PIPE, text=True)
+    server.stdout.readline()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--port', type=int, default=8792)
+    parser.add_argument('--max-import-ms', type=float, default=None)
+    args = parser.parse_args()
+
+    print('import time, median of %d fresh interpreters' % args.runs)
+    bare = None
+    for name, code in SCENARIOS.items():
+        median = statistics.median(import_ms(code) for _ in range(args.runs))
+        bare = median if bare is None else bare
+        print('  %-20s %8.1f ms' % (name, median))
+
+    threads = int(run(BARE_THREADS).stdout.split()[-1])
+    print('  threads after import: %d' % threads)
+
+    server = start_server(args.port)
+    try:
+        results = [run(FIRST_REQUEST % args.port).stdout.split() for _ in range(args.runs)]
+    finally:
+        server.terminate()
+    first = statistics.median(float(output[output.index('FIRST') + 1]) for output in results)
+    print('  import + first request: %.1f ms' % first)
+
+    if args.max_import_ms is not None and (bare > args.max_import_ms or threads > 1):
+        print('regression: import took %.1f ms (limit %.1f ms) and started %d thread(s)'
+              % (bare, args.max_import_ms, threads - 1))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
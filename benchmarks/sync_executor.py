@@ -0,0 +1,114 @@
+"""
+Measures the overhead of blocking calls and how their throughput grows with the
+amount of calling threads, for the single module level loop of ``instatus.client``
+and for a :class:`instatus.LoopExecutor` with one (the default) and several loops.
+More loops only help with several CPUs to run them on.
+
+Runs against a local server, so no api key or network is needed::
+
+    python benchmarks/sync_executor.py --calls 2000 --threads 1 2 4 8 16 --loops 4
+"""
+
+import time
+import asyncio
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+from instatus.client import asyncio_run
+from instatus.executor import LoopExecutor, SyncStatusClient
+from instatus.http_requests import RouteTemplate
+
+PORT = 8791
+# a list of a realistic size, so the decoding shows up
+PAYLOAD = [{'id': 'c%d' % i, 'name': 'Component %d' % i, 'status': 'OPERATIONAL', 'description': 'x' * 64}
+           for i in range(200)]
+
+
+def start_server():
+    ready = threading.Event()
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        async def components(request):
+            return web.json_response(PAYLOAD, headers={'X-Ratelimit-Remaining': '1000000',
+                                                       'X-Ratelimit-Limit': '1000000',
+                                                       'X-Ratelimit-Reset-After': '60'})
+
+        app = web.Application()
+        app.router.add_get('/v1/{page_id}/maintenances', components)
+        runner = web.AppRunner(app, access_log=None)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, '127.0.0.1', PORT).start())
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+
+
+def measure(call, calls: int, threads: int) -> float:
+    """Returns the calls per second of ``calls`` calls spread over ``threads`` threads."""
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda _: call(), range(threads)))  # warm up
+        started = time.perf_counter()
+        list(pool.map(lambda _: call(), range(calls)))
+        return calls / (time.perf_counter() - started)
+
+
+async def noop():
+    pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--loops', type=int, default=4)
+    parser.add_argument('--batch', type=int, default=50)
+    args = parser.parse_args()
+
+    start_server()
+    RouteTemplate.BASE = 'http://127.0.0.1:%d/' % PORT
+
+    executor = LoopExecutor(args.loops, policy='round_robin')
+    single = LoopExecutor()
+
+    print('overhead of one blocking call of an empty coroutine')
+    for name, call in (('asyncio_run', lambda: asyncio_run(noop())),
+                       ('LoopExecutor()', lambda: single.submit(noop())),
+                       ('LoopExecutor(%d)' % args.loops, lambda: executor.submit(noop()))):
+        started = time.perf_counter()
+        for _ in range(args.calls):
+            call()
+        print('  %-22s %7.1f us/call' % (name, (time.perf_counter() - started) / args.calls * 1e6))
+
+    print('\nget_all_maintenances calls per second (decoding %d items each)' % len(PAYLOAD))
+    clients = {
+        '1 loop': SyncStatusClient('key', executor=single, coalesce_requests=False),
+        '%d loops' % args.loops: SyncStatusClient('key', executor=executor, coalesce_requests=False),
+    }
+    print('  %-8s' % 'threads' + ''.join('%14s' % name for name in clients))
+    for threads in args.threads:
+        row = [measure(lambda: client.get_all_maintenances('p'), args.calls, threads) for client in clients.values()]
+        print('  %-8d' % threads + ''.join('%14.0f' % value for value in row))
+
+    client = clients['%d loops' % args.loops]
+    started = time.perf_counter()
+    for _ in range(args.calls // args.batch):
+        client.submit_many('get_all_maintenances', ['p'] * args.batch)
+    elapsed = time.perf_counter() - started
+    print('\nsubmit_many in batches of %d: %.0f calls per second' % (args.batch, args.calls // args.batch * args.batch / elapsed))
+
+    for client in clients.values():
+        client.close()
+    executor.shutdown()
+    single.shutdown()
+
+
+if __name__ == '__main__':
+    main()
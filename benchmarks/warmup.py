@@ -0,0 +1,91 @@
+"""
+Measures the latency of the first request of a new client, cold and after
+:meth:`StatusClient.warmup` pre-opened the connections, each with a fresh pool.
+
+    python benchmarks/warmup.py --runs 20 --dns-ms 20
+    python benchmarks/warmup.py --runs 5 --prod-name <status page subdomain>
+
+By default the requests go to :class:`instatus.testing.FakeInstatus` on the loopback
+interface, where a cold request only pays for the TCP connection and the session;
+``--dns-ms`` adds that much to every host lookup to stand in for DNS. There is no TLS
+on the fake, so the handshake is not part of these numbers. ``--prod-name`` times
+``summary.json`` of a real status page instead, which includes DNS and TLS and needs
+network access but no api key.
+"""
+
+import time
+import socket
+import asyncio
+import argparse
+import statistics
+
+import aiohttp
+
+from instatus import StatusClient
+from instatus.testing import FakeInstatus
+
+
+class SlowResolver(aiohttp.ThreadedResolver):
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        await asyncio.sleep(self.delay)
+        return await super().resolve(host, port, family)
+
+
+async def first_request(args, fake, warm):
+    if fake is None:
+        client = StatusClient('benchmark')
+        request = lambda: client.fetch_summary(args.prod_name)
+        prod_names = [args.prod_name]
+    else:
+        connector = aiohttp.TCPConnector(resolver=SlowResolver(args.dns_ms / 1000))
+        client = fake.client(transport=fake.transport(connector=connector))
+        request = lambda: client.get_component(args.page_id, args.component_id)
+        prod_names = ()
+
+    try:
+        if warm:
+            await client.warmup(1, prod_names=prod_names)
+        started = time.perf_counter()
+        await request()
+        return time.perf_counter() - started
+    finally:
+        await client.close()
+        if fake is not None:
+            await connector.close()
+
+
+async def measure(args, fake):
+    print('%-8s %9s %9s %9s' % ('', 'p50 ms', 'min ms', 'max ms'))
+    for name, warm in (('cold', False), ('warm', True)):
+        timings = [await first_request(args, fake, warm) for _ in range(args.runs)]
+        print('%-8s %9.2f %9.2f %9.2f' % (name, statistics.median(timings) * 1000, min(timings) * 1000,
+                                         max(timings) * 1000))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--dns-ms', type=float, default=0.0, help='added to each host lookup on the fake')
+    parser.add_argument('--prod-name', help='time the summary of this real status page instead of the fake')
+    args = parser.parse_args()
+
+    if args.prod_name is not None:
+        print('first request to https://%s.instatus.com/summary.json\n' % args.prod_name)
+        await measure(args, None)
+        return
+
+    # localhost rather than 127.0.0.1, so the host is looked up through the resolver;
+    # the runs follow each other quickly, they must not be slowed down by a 429
+    async with FakeInstatus(host='localhost', rate_limit=10 ** 6) as fake:
+        args.page_id = fake.add_page(components=1)
+        args.component_id = next(iter(fake.pages[args.page_id]['components']))
+        print('first request to FakeInstatus, %.0f ms per lookup\n' % args.dns_ms)
+        await measure(args, fake)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -23,13 +23,82 @@ __path__ = __import__('pkgutil').extend_path(__path__, __name__)
 
 
 import logging
-from typing import NamedTuple
-from typing_extensions import Literal
-
-from . import utils
-from .client import *
-from .models import *
-from .errors import *
+import importlib
+from typing import NamedTuple, TYPE_CHECKING
+
+try:
+    from typing import Literal
+except ImportError:  # Python 3.7
+    from typing_extensions import Literal
+
+if TYPE_CHECKING:
+    from . import utils
+    from .client import *
+    from .models import *
+    from .enums import Status, ComponentStatus, IncidentStatus, MaintenanceStatus
+    from .errors import *
+    from .file import *
+    from .download import *
+    from .pool import *
+    from .cache import *
+    from .state import *
+    from .watcher import *
+    from .analytics import *
+    from .ingest import *
+    from .retry import *
+    from .circuit import *
+    from .deadline import *
+    from .metrics import *
+    from .executor import *
+    from .transport import *
+
+# Nothing but this file runs on ``import instatus``; the submodules (and aiohttp,
+# asyncio and the background loop with them) are imported on the first access of a name.
+_LAZY_NAMES = {
+    'client': ('StatusClient',),
+    'models': ('ModelSequence', 'Component', 'Incident', 'IncidentUpdate', 'Maintenance', 'MaintenanceUpdate', 'Metric',
+               'StatusPager', 'Subscriber', 'TeamMember', 'UserProfile'),
+    'errors': ('InstatusException', 'ClientException', 'HTTPException', 'Forbidden', 'NotFound',
+               'InstatusServerError', 'CircuitOpen', 'RequestTimeout', 'flatten_error_dict'),
+    'file': ('File',),
+    'download': ('DiskCache', 'Download'),
+    'pool': ('ConnectionPool',),
+    'cache': ('ResponseCache',),
+    'state': ('CachePolicy', 'StateCache'),
+    'watcher': ('FieldChange', 'Watcher'),
+    'analytics': ('IncidentHistory', 'IMPACT_CODES'),
+    'ingest': ('DatapointWriter',),
+    'retry': ('RetryPolicy', 'RetryBudget'),
+    'circuit': ('CircuitBreaker', 'CircuitBreakers'),
+    'enums': ('Status', 'ComponentStatus', 'IncidentStatus', 'MaintenanceStatus'),
+    'deadline': ('Deadline',),
+    'metrics': ('Hooks', 'RequestInfo', 'RequestMetrics'),
+    'executor': ('LoopExecutor', 'SyncStatusClient', 'default_executor'),
+    'transport': ('Transport', 'AiohttpTransport', 'MemoryTransport', 'MemoryRequest', 'MemoryResponse'),
+}
+_LAZY = {name: module for module, names in _LAZY_NAMES.items() for name in names}
+_SUBMODULES = frozenset({
+    'analytics', 'bulk', 'cache', 'circuit', 'client', 'codec', 'deadline', 'download', 'enums', 'errors', 'executor', 'file', 'gateway',
+    'http_requests', 'ingest', 'metrics', 'models', 'pagination', 'pool', 'ratelimit', 'retry', 'singleflight', 'state', 'streaming', 'testing', 'transport', 'utils', 'watcher',
+})
+
+__all__ = tuple(_LAZY) + ('utils', 'version_info')
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is not None:
+        value = getattr(importlib.import_module('.' + module, __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module('.' + name, __name__)
+    else:
+        raise AttributeError('module {0!r} has no attribute {1!r}'.format(__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY) | _SUBMODULES)
 
 
 class VersionInfo(NamedTuple):
@@ -44,7 +113,7 @@ version_info: VersionInfo = VersionInfo(major=0, minor=0, micro=1, releaselevel=
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
-del logging, NamedTuple, Literal, VersionInfo
+del logging, NamedTuple, Literal, VersionInfo, TYPE_CHECKING
 
 
 
@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import time
+import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .enums import ComponentStatus
+from .utils import parse_time
+
+__all__ = ('IncidentHistory', 'IMPACT_CODES')
+
+#: The code an impact is stored as; a higher code is a worse impact.
+IMPACT_CODES: Dict[ComponentStatus, int] = {
+    ComponentStatus.OPERATIONAL: 0,
+    ComponentStatus.UNDERMAINTENANCE: 1,
+    ComponentStatus.DEGRADEDPERFORMANCE: 2,
+    ComponentStatus.PARTIALOUTAGE: 3,
+    ComponentStatus.MAJOROUTAGE: 4,
+}
+_IMPACTS = {status.value: code for status, code in IMPACT_CODES.items()}
+
+#: The values of :attr:`IncidentHistory.kind`.
+INCIDENT = 0
+MAINTENANCE = 1
+
+#: A datetime (naive ones are taken as UTC), an ISO 8601 string or epoch milliseconds.
+TimeLike = Union[datetime.datetime, str, int]
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError('numpy is needed for instatus.analytics, install it with "pip install instatus.py[analytics]"')
+
+
+def _to_ms(value: TimeLike) -> int:
+    if isinstance(value, str):
+        value = parse_time(value)
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return int(round(value.timestamp() * 1000))
+    if isinstance(value, np.datetime64):
+        return int(value.astype('datetime64[ms]').astype(np.int64))
+    return int(value)
+
+
+def _parse_ms(timestamps: List[Optional[str]]) -> 'np.ndarray':
+    # epoch milliseconds of the API's ISO 8601 timestamps, -1 for a missing one;
+    # numpy parses them in one go once the 'Z' (UTC) is cut off
+    values = [timestamp[:-1] if timestamp and timestamp[-1] == 'Z' else (timestamp or 'NaT') for timestamp in timestamps]
+    try:
+        parsed = np.array(values, dtype='datetime64[ms]')
+    except ValueError:
+        # another UTC offset than Z
+        parsed = np.array([parse_time(timestamp).astimezone(datetime.timezone.utc).replace(tzinfo=None)
+                           if timestamp else 'NaT' for timestamp in timestamps], dtype='datetime64[ms]')
+    result = parsed.astype(np.int64)
+    result[np.isnat(parsed)] = -1
+    return result
+
+
+def _payloads(items: Iterable[Any]) -> Iterable[Dict[str, Any]]:
+    # the raw payloads of a list response, without building models that weren't built yet
+    to_list = getattr(items, 'to_list', None)
+    if to_list is not None:
+        return to_list()
+    return (item if isinstance(item, dict) else item.to_dict() for item in items)
+
+
+class IncidentHistory:
+    """The incidents and maintenances of a status page as columns of NumPy arrays,
+    one row per affected component, for uptime and reliability figures.
+
+    Downtime is computed with vectorized interval operations: every component gets its
+    own segment of one shared time line, so the overlapping intervals of all components
+    are merged in a single pass over the rows, without a Python loop per component.
+    The merged outages are cached per filter, and any number of windows is answered
+    from them with binary searches. ::
+
+        history = await client.get_history(page_id)
+        edges = IncidentHistory.month_edges('2022-01', '2023-01')
+        uptime = history.uptime_windows(edges)  # one row per component, one column per month
+
+    Requires NumPy (``pip install instatus.py[analytics]``).
+
+    Attributes
+    -----------
+    components: Tuple[:class:`str`, ...]
+        The component ids; the values of :attr:`component` index this.
+    start: :class:`numpy.ndarray`
+        The start of each row, in epoch milliseconds (``int64``).
+    end: :class:`numpy.ndarray`
+        The end of each row, in epoch milliseconds. Unresolved incidents end at ``now``.
+    component: :class:`numpy.ndarray`
+        The index of the affected component of each row (``int32``).
+    impact: :class:`numpy.ndarray`
+        The :data:`IMPACT_CODES` of each row (``int8``).
+    kind: :class:`numpy.ndarray`
+        ``0`` for the rows of incidents, ``1`` for those of maintenances (``int8``).
+    """
+
+    __slots__ = ('components', 'start', 'end', 'component', 'impact', 'kind', '_origin', '_span', '_merged')
+
+    def __init__(self, start, end, component, impact, kind=None, *, components: Sequence[str]):
+        _require_numpy()
+        start = np.asarray(start, dtype=np.int64)
+        end = np.asarray(end, dtype=np.int64)
+        component = np.asarray(component, dtype=np.int32)
+        impact = np.asarray(impact, dtype=np.int8)
+        kind = np.zeros(len(start), dtype=np.int8) if kind is None else np.asarray(kind, dtype=np.int8)
+
+        keep = end > start
+        if not keep.all():
+            start, end, component, impact, kind = start[keep], end[keep], component[keep], impact[keep], kind[keep]
+        self._origin = int(start.min()) if len(start) else 0
+        # the segment of the time line per component; longer than any row can reach
+        self._span = (int(end.max()) - self._origin + 1) if len(end) else 1
+
+        # sorted by the start on the shared time line, i.e. by component, then start;
+        # one int64 key sorts a lot faster than np.lexsort
+        order = np.argsort(component.astype(np.int64) * self._span + (start - self._origin))
+        self.start = start[order]
+        self.end = end[order]
+        self.component = component[order]
+        self.impact = impact[order]
+        self.kind = kind[order]
+        self.components = tuple(components)
+        self._merged: Dict[Tuple[int, bool], Tuple[Any, ...]] = {}
+
+    def __repr__(self):
+        return '<IncidentHistory rows={0} components={1}>'.format(len(self), len(self.components))
+
+    def __len__(self):
+        return len(self.start)
+
+    @classmethod
+    def from_payloads(cls,
+                      incidents: Iterable[Any] = (),
+                      maintenances: Iterable[Any] = (),
+                      *,
+                      components: Optional[Sequence[str]] = None,
+                      now: Optional[TimeLike] = None) -> 'IncidentHistory':
+        """Builds the history from what :meth:`StatusClient.getall_incidents` and
+        :meth:`StatusClient.get_all_maintenances` returned, models or raw payloads.
+
+        Parameters
+        -----------
+        components: Optional[Sequence[:class:`str`]]
+            The component ids in the order of the result rows. Components that aren't
+            listed are appended in the order they appear in. Incidents that don't
+            affect any component are left out.
+        now: Optional[Union[:class:`datetime.datetime`, :class:`str`, :class:`int`]]
+            The end of the unresolved incidents and unfinished maintenances; defaults to now.
+
+        The impact of a row is the ``impact`` of the incident. Without one it is the
+        ``status`` the affected component is listed with, and if that is missing too,
+        the incident counts as operational (``0``) and a maintenance as under maintenance,
+        so neither counts as downtime under the default ``min_impact``.
+        """
+        _require_numpy()
+        now_ms = _to_ms(now) if now is not None else int(time.time() * 1000)
+        index: Dict[str, int] = {component_id: i for i, component_id in enumerate(components or ())}
+        starts: List[Optional[str]] = []
+        ends: List[Optional[str]] = []
+        rows: List[int] = []
+        impacts: List[int] = []
+        kinds: List[int] = []
+
+        for kind, items, start_key, end_key in ((INCIDENT, incidents, 'started', 'resolved'),
+                                                (MAINTENANCE, maintenances, 'start', 'end')):
+            default_impact = IMPACT_CODES[ComponentStatus.UNDERMAINTENANCE] if kind == MAINTENANCE else 0
+            for item in _payloads(items):
+                affected = item.get('components') or ()
+                if not affected:
+                    continue
+                impact = _IMPACTS.get(item.get('impact'))
+                start = item.get(start_key)
+                end = item.get(end_key)
+                for component in affected:
+                    if isinstance(component, dict):
+                        component_id = component.get('id')
+                        # without an impact, the status the component was put in tells it
+                        row_impact = impact
+                        if row_impact is None:
+                            row_impact = _IMPACTS.get(component.get('status'), default_impact)
+                    else:
+                        component_id = component
+                        row_impact = impact if impact is not None else default_impact
+                    row = index.get(component_id)
+                    if row is None:
+                        row = index[component_id] = len(index)
+                    starts.append(start)
+                    ends.append(end)
+                    rows.append(row)
+                    impacts.append(row_impact)
+                    kinds.append(kind)
+
+        start = _parse_ms(starts)
+        end = _parse_ms(ends)
+        end[end < 0] = now_ms
+        # rows without a start can't be placed
+        end[start < 0] = -1
+        return cls(start, end, rows, impacts, kinds, components=sorted(index, key=index.__getitem__))
+
+    @staticmethod
+    def month_edges(start: Union[str, datetime.date], end: Union[str, datetime.date]) -> 'np.ndarray':
+        """Returns the epoch milliseconds of the first day of every month from ``start`` up to
+        and including ``end``, e.g. ``month_edges('2022-01', '2023-01')`` for the months of 2022.
+        """
+        _require_numpy()
+        months = np.arange(np.datetime64(start, 'M'), np.datetime64(end, 'M') + 1)
+        return months.astype('datetime64[ms]').astype(np.int64)
+
+    def _merge(self, min_impact: int, include_maintenance: bool) -> Tuple[Any, ...]:
+        # the outages of every component merged into disjoint intervals on the shared
+        # time line, with the running total of their lengths
+        key = (min_impact, include_maintenance)
+        merged = self._merged.get(key)
+        if merged is not None:
+            return merged
+
+        mask = self.impact >= min_impact
+        if not include_maintenance:
+            mask &= self.kind == INCIDENT
+        offset = self.component[mask].astype(np.int64) * self._span - self._origin
+        start = self.start[mask] + offset
+        end = self.end[mask] + offset
+
+        if len(start):
+            reach = np.maximum.accumulate(end)
+            first = np.empty(len(start), dtype=bool)
+            first[0] = True
+            # an interval starts a new outage if it begins after everything before it ended
+            np.greater(start[1:], reach[:-1], out=first[1:])
+            starts = start[first]
+            last = np.append(np.flatnonzero(first)[1:] - 1, len(start) - 1)
+            ends = reach[last]
+        else:
+            starts = ends = np.empty(0, dtype=np.int64)
+        lengths = ends - starts
+        totals = np.concatenate(([0], np.cumsum(lengths)))
+        merged = self._merged[key] = (starts, lengths, totals)
+        return merged
+
+    def _queries(self, edges: 'np.ndarray') -> 'np.ndarray':
+        # the edges on the segment of every component, shape (components, edges); outside
+        # of the rows the downtime doesn't change, so the edges are clipped to the segment
+        edges = np.clip(edges, self._origin, self._origin + self._span - 1)
+        offsets = np.arange(len(self.components), dtype=np.int64) * self._span - self._origin
+        return edges[np.newaxis, :] + offsets[:, np.newaxis]
+
+    def _downtime_at(self, queries, merged) -> 'np.ndarray':
+        # the total downtime on the time line up to each query
+        starts, lengths, totals = merged
+        if not len(starts):
+            return np.zeros(queries.shape, dtype=np.int64)
+        index = np.searchsorted(starts, queries, side='right') - 1
+        clipped = np.maximum(index, 0)
+        partial = np.clip(queries - starts[clipped], 0, lengths[clipped])
+        return np.where(index >= 0, totals[clipped] + partial, 0)
+
+    def downtime_windows(self,
+                         edges: Sequence[TimeLike],
+                         *,
+                         min_impact: int = IMPACT_CODES[ComponentStatus.PARTIALOUTAGE],
+                         include_maintenance: bool = False) -> 'np.ndarray':
+        """Returns the downtime in seconds of every component in each window between two
+        consecutive ``edges``, with shape ``(components, len(edges) - 1)``.
+
+        Overlapping incidents of a component count once.
+
+        Parameters
+        -----------
+        edges: Sequence[Union[:class:`datetime.datetime`, :class:`str`, :class:`int`]]
+            The ascending window boundaries; integers are epoch milliseconds,
+            like the values of :meth:`month_edges`.
+        min_impact: :class:`int`
+            The lowest :data:`IMPACT_CODES` counting as downtime; partial outages by default.
+        include_maintenance: :class:`bool`
+            Whether maintenances count as downtime.
+        """
+        merged = self._merge(min_impact, include_maintenance)
+        return np.diff(self._downtime_at(self._queries(self._edges(edges)), merged), axis=1) / 1000
+
+    def uptime_windows(self, edges: Sequence[TimeLike], **kwargs) -> 'np.ndarray':
+        """Like :meth:`downtime_windows`, but returns the uptime percentage of every window."""
+        edges = self._edges(edges)
+        durations = np.diff(edges) / 1000
+        return 100 * (1 - self.downtime_windows(edges, **kwargs) / durations)
+
+    def downtime(self, start: TimeLike, end: TimeLike, **kwargs) -> 'np.ndarray':
+        """Returns the downtime in seconds of every component between ``start`` and ``end``."""
+        return self.downtime_windows(self._edges((start, end)), **kwargs)[:, 0]
+
+    def uptime(self, start: TimeLike, end: TimeLike, **kwargs) -> 'np.ndarray':
+        """Returns the uptime percentage of every component between ``start`` and ``end``."""
+        return self.uptime_windows(self._edges((start, end)), **kwargs)[:, 0]
+
+    def reliability(self,
+                    start: TimeLike,
+                    end: TimeLike,
+                    *,
+                    min_impact: int = IMPACT_CODES[ComponentStatus.PARTIALOUTAGE],
+                    include_maintenance: bool = False) -> Dict[str, 'np.ndarray']:
+        """Returns per component the ``downtime`` (seconds), ``uptime`` (percent), ``outages``
+        (merged outages starting in the window), ``mttr`` (downtime per outage, seconds) and
+        ``mtbf`` (uptime per outage, seconds) between ``start`` and ``end``.
+
+        ``mttr`` and ``mtbf`` are NaN for the components without an outage.
+        """
+        edges = self._edges((start, end))
+        merged = self._merge(min_impact, include_maintenance)
+        queries = self._queries(edges)
+        downtime = np.diff(self._downtime_at(queries, merged), axis=1)[:, 0] / 1000
+        starts = merged[0]
+        outages = np.diff(np.searchsorted(starts, queries, side='left'), axis=1)[:, 0]
+        duration = (edges[1] - edges[0]) / 1000
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mttr = np.where(outages > 0, downtime / outages, np.nan)
+            mtbf = np.where(outages > 0, (duration - downtime) / outages, np.nan)
+        return {
+            'downtime': downtime,
+            'uptime': 100 * (1 - downtime / duration),
+            'outages': outages,
+            'mttr': mttr,
+            'mtbf': mtbf,
+        }
+
+    @staticmethod
+    def _edges(edges: Sequence[TimeLike]) -> 'np.ndarray':
+        if isinstance(edges, np.ndarray) and edges.dtype.kind == 'i':
+            return edges.astype(np.int64, copy=False)
+        return np.array([_to_ms(edge) for edge in edges], dtype=np.int64)
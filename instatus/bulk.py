@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+__all__ = ('BulkResult', 'run_bulk')
+
+ProgressCallback = Callable[[int, int, Hashable, Any], Any]
+
+
+class BulkResult(dict):
+    """The outcome of a bulk operation, mapping every key to its result or the exception it raised."""
+
+    @property
+    def succeeded(self) -> Dict[Hashable, Any]:
+        """Dict[Hashable, Any]: The results of the items that succeeded."""
+        return {key: value for key, value in self.items() if not isinstance(value, BaseException)}
+
+    @property
+    def failed(self) -> Dict[Hashable, BaseException]:
+        """Dict[Hashable, :class:`BaseException`]: The exceptions of the items that failed."""
+        return {key: value for key, value in self.items() if isinstance(value, BaseException)}
+
+    @property
+    def ok(self) -> bool:
+        """:class:`bool`: Whether every item succeeded."""
+        return not any(isinstance(value, BaseException) for value in self.values())
+
+
+async def run_bulk(calls: Iterable[Tuple[Hashable, Callable[[], Awaitable[Any]]]],
+                   *,
+                   concurrency: int = 10,
+                   on_progress: Optional[ProgressCallback] = None) -> BulkResult:
+    """Runs ``calls`` with at most ``concurrency`` of them at once.
+
+    A failing call doesn't stop the others; its exception is stored in the result instead.
+
+    Parameters
+    -----------
+    calls: Iterable[Tuple[Hashable, Callable[[], Awaitable]]]
+        Pairs of a key and a function returning the awaitable to run for it.
+    concurrency: :class:`int`
+        The maximum amount of calls running at once. The requests are paced by
+        the rate limiter on top of that.
+    on_progress: Optional[Callable[[:class:`int`, :class:`int`, Hashable, Any], Any]]
+        Called with ``(done, total, key, result_or_exception)`` after each call.
+        May be a coroutine function. Exceptions it raises are logged and ignored.
+    """
+    calls = list(calls)
+    total = len(calls)
+    result = BulkResult()
+    pending = iter(calls)
+    done = 0
+
+    async def worker():
+        nonlocal done
+        for key, factory in pending:
+            try:
+                value = await factory()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                log.debug('Bulk operation failed for %r: %s', key, exc)
+                value = exc
+            result[key] = value
+            done += 1
+            if on_progress is not None:
+                # a broken callback must not abort the rest of the batch
+                try:
+                    ret = on_progress(done, total, key, value)
+                    if inspect.isawaitable(ret):
+                        await ret
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    log.exception('Ignoring exception in the progress callback %r', on_progress)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(max(min(concurrency, total), 1))]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+    return result
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import time
+import itertools
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .http_requests import Route
+
+__all__ = ('ResponseCache',)
+
+
+def _copy(data):
+    # a deep copy of decoded JSON, a lot faster than copy.deepcopy
+    if isinstance(data, dict):
+        return {key: _copy(value) if isinstance(value, (dict, list)) else value for key, value in data.items()}
+    if isinstance(data, list):
+        return [_copy(value) if isinstance(value, (dict, list)) else value for value in data]
+    return data
+
+
+class CacheEntry:
+    __slots__ = ('data', 'expires', 'etag', 'last_modified', 'major')
+
+    def __init__(self, data, expires, etag, last_modified, major):
+        self.data = data
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+        self.major = major
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.expires > time.monotonic()
+
+    @property
+    def can_revalidate(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+    def validators(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """An LRU cache for the responses of ``GET`` routes.
+
+    Fresh entries are returned without a request. Stale entries are revalidated with
+    ``If-None-Match``/``If-Modified-Since`` when the server sent an ``ETag`` or
+    ``Last-Modified`` header for them. Any ``PUT``, ``POST`` or ``DELETE`` on a page
+    drops all entries of that page.
+
+    Every call gets its own copy of the cached data, so modifying it doesn't change
+    what later calls get.
+
+    Parameters
+    -----------
+    max_size: :class:`int`
+        The maximum amount of entries; the least recently used ones are dropped first.
+    ttl: :class:`float`
+        For how many seconds an entry is fresh.
+    route_ttls: Optional[Dict[:class:`str`, :class:`float`]]
+        The ttl per route template, e.g. ``{'v1/{page_id}/components': 30}``.
+        A ttl of ``0`` revalidates on every call.
+
+    Attributes
+    -----------
+    hits: :class:`int`
+        Calls answered from a fresh entry.
+    misses: :class:`int`
+        Calls that had to be sent without validators.
+    revalidations: :class:`int`
+        Stale entries the server confirmed with a ``304``.
+    invalidations: :class:`int`
+        Entries dropped because their page was modified.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 5.0, route_ttls: Optional[Dict[str, float]] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.route_ttls = dict(route_ttls or {})
+        self._entries: 'OrderedDict[Tuple, CacheEntry]' = OrderedDict()
+        # the keys of the entries of each page, so a modification only visits those
+        self._majors: Dict[Any, Dict[Tuple, None]] = {}
+        # set on every modification of a page, so responses that were in flight during it
+        # don't get stored; the counters of the least recently modified pages are dropped
+        # beyond max_size, and with the last entry of their page, raising the floor every
+        # page without a counter is at
+        self._generations: 'OrderedDict[Any, int]' = OrderedDict()
+        self._floor = 0
+        self._counter = itertools.count(1)
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.invalidations = 0
+
+    def __repr__(self):
+        return '<ResponseCache size={0} max_size={1.max_size} hits={1.hits} misses={1.misses}>'.format(len(self), self)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(route: 'Route', params=None) -> Tuple:
+        if params:
+            return route.url, tuple(sorted(params.items()))
+        return route.url, None
+
+    @staticmethod
+    def _major(route: 'Route'):
+        major = route.template.major
+        return route.parameters.get(major) if major else None
+
+    def generation(self, route: 'Route') -> int:
+        return self._generations.get(self._major(route), self._floor)
+
+    def get(self, key: Tuple) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    @staticmethod
+    def load(entry: CacheEntry):
+        """Returns a copy of the data of an entry."""
+        return _copy(entry.data)
+
+    def _drop_generation(self, major):
+        self._floor = max(self._floor, self._generations.pop(major))
+
+    def _remove(self, key: Tuple, entry: CacheEntry):
+        # takes an entry out of the index of its page
+        keys = self._majors[entry.major]
+        del keys[key]
+        if not keys:
+            del self._majors[entry.major]
+            if entry.major in self._generations:
+                self._drop_generation(entry.major)
+
+    def set(self, key: Tuple, route: 'Route', data, headers, generation: int):
+        if 'no-store' in headers.get('Cache-Control', ''):
+            return
+        major = self._major(route)
+        if self._generations.get(major, self._floor) != generation:
+            # the page got modified while the request was running
+            return
+
+        ttl = self.route_ttls.get(route.template.path, self.ttl)
+        entry = CacheEntry(_copy(data), time.monotonic() + ttl, headers.get('ETag'), headers.get('Last-Modified'),
+                           major)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._remove(key, old)
+        self._entries[key] = entry
+        self._majors.setdefault(major, {})[key] = None
+        while len(self._entries) > self.max_size:
+            self._remove(*self._entries.popitem(last=False))
+
+    def refresh(self, entry: CacheEntry, route: 'Route', headers):
+        """Marks an entry as fresh again after the server answered with ``304``."""
+        entry.expires = time.monotonic() + self.route_ttls.get(route.template.path, self.ttl)
+        entry.etag = headers.get('ETag', entry.etag)
+        entry.last_modified = headers.get('Last-Modified', entry.last_modified)
+        self.revalidations += 1
+
+    def invalidate(self, route: 'Route'):
+        """Drops every entry of the page ``route`` modifies, and the account wide lists like ``v1/pages``."""
+        major = self._major(route)
+        generation = next(self._counter)
+        for affected in {major, None}:
+            self._generations[affected] = generation
+            self._generations.move_to_end(affected)
+            keys = self._majors.pop(affected, ())
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+        while len(self._generations) > self.max_size:
+            self._drop_generation(next(iter(self._generations)))
+
+    def clear(self):
+        self._entries.clear()
+        self._majors.clear()
+        # responses in flight now don't get stored either
+        self._generations.clear()
+        self._floor = next(self._counter)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the counters and the current size of the cache."""
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+            'invalidations': self.invalidations,
+        }
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import time
+import logging
+from collections import deque
+from typing import Dict, TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from .enums import CircuitState
+from .errors import CircuitOpen
+
+if TYPE_CHECKING:
+    from .http_requests import Route
+
+log = logging.getLogger(__name__)
+
+__all__ = ('CircuitBreaker', 'CircuitBreakers')
+
+
+class CircuitBreaker:
+    """Stops sending requests to a host or route that keeps failing.
+
+    The outcomes of the last ``window_size`` calls are kept. Once at least ``min_calls``
+    of them are known and the share of failures reaches ``failure_threshold`` the circuit
+    opens, and every call fails with :exc:`CircuitOpen` right away. After ``open_timeout``
+    seconds the circuit is half-open and lets ``half_open_max_calls`` trial calls through;
+    if they succeed it closes again, otherwise it opens for another ``open_timeout``.
+
+    A call failed if it raised a connection error or timed out, or if the server answered
+    with a 5xx status. Any other response counts as a success.
+    """
+
+    __slots__ = ('key', 'failure_threshold', 'min_calls', 'open_timeout', 'half_open_max_calls',
+                 'state', '_outcomes', '_failures', '_opened_at', '_trials')
+
+    def __init__(self,
+                 key: str,
+                 *,
+                 failure_threshold: float = 0.5,
+                 min_calls: int = 10,
+                 window_size: int = 50,
+                 open_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.key = key
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.open_timeout = open_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CircuitState.CLOSED
+        self._outcomes = deque(maxlen=window_size)
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+
+    def __repr__(self):
+        return '<CircuitBreaker key={0.key!r} state={0.state} failure_rate={0.failure_rate:.2f}>'.format(self)
+
+    @property
+    def failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._failures / len(self._outcomes)
+
+    def check(self):
+        """Raises :exc:`CircuitOpen` while the circuit is open, without taking a trial call."""
+        if self.state is CircuitState.OPEN:
+            retry_after = self._opened_at + self.open_timeout - time.monotonic()
+            if retry_after > 0:
+                raise CircuitOpen(self.key, retry_after)
+
+    def before_call(self):
+        """Raises :exc:`CircuitOpen` if the call may not be sent now."""
+        if self.state is CircuitState.OPEN:
+            self.check()
+            self.state = CircuitState.HALF_OPEN
+            self._trials = 0
+            log.info('The circuit for %s is half-open now.', self.key)
+
+        if self.state is CircuitState.HALF_OPEN:
+            if self._trials >= self.half_open_max_calls:
+                raise CircuitOpen(self.key, 0.0)
+            self._trials += 1
+
+    def release(self):
+        """Gives back the trial of a call that ended without an outcome, e.g. because it got cancelled."""
+        if self.state is CircuitState.HALF_OPEN and self._trials:
+            self._trials -= 1
+
+    def record(self, success: bool):
+        """Records the outcome of a call started after :meth:`before_call`."""
+        if self.state is CircuitState.HALF_OPEN:
+            if success:
+                self._close()
+            else:
+                self._open()
+            return
+
+        outcomes = self._outcomes
+        if len(outcomes) == outcomes.maxlen and not outcomes[0]:
+            self._failures -= 1
+        outcomes.append(success)
+        if not success:
+            self._failures += 1
+            if len(outcomes) >= self.min_calls and self.failure_rate >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        log.warning('The circuit for %s is open for %.2f seconds (failure rate: %.2f).',
+                    self.key, self.open_timeout, self.failure_rate)
+
+    def _close(self):
+        self.state = CircuitState.CLOSED
+        self._outcomes.clear()
+        self._failures = 0
+        log.info('The circuit for %s is closed again.', self.key)
+
+
+class CircuitBreakers:
+    """Holds one :class:`CircuitBreaker` per host, or per route template.
+
+    Parameters
+    -----------
+    per: :class:`str`
+        Either ``'host'`` or ``'template'``.
+    **options
+        Passed to every :class:`CircuitBreaker`.
+    """
+
+    def __init__(self, per: str = 'host', **options):
+        if per not in ('host', 'template'):
+            raise ValueError("per must be either 'host' or 'template'")
+        self.per = per
+        self.options = options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def __repr__(self):
+        return '<CircuitBreakers per={0.per!r} breakers={1}>'.format(self, len(self._breakers))
+
+    def __iter__(self):
+        return iter(self._breakers.values())
+
+    def get(self, route: 'Route') -> CircuitBreaker:
+        if self.per == 'host':
+            key = urlsplit(route.url).hostname or route.url
+        else:
+            key = route.template.path
+        try:
+            return self._breakers[key]
+        except KeyError:
+            breaker = self._breakers[key] = CircuitBreaker(key, **self.options)
+            return breaker
@@ -26,15 +26,33 @@ DEALINGS IN THE SOFTWARE.
 
 import sys
 import logging
+import functools
 import asyncio
 import threading
 from concurrent.futures import TimeoutError
 from typing import Optional, Union, List, Tuple, Any, Dict, Awaitable, TypeVar, TYPE_CHECKING
 
 from .http_requests import HTTPClient
+from .pool import ConnectionPool
+from .transport import Transport
+from .codec import JSONCodec
+from .pagination import Paginator
+from .cache import ResponseCache
+from .bulk import BulkResult, run_bulk, ProgressCallback
+from .retry import RetryPolicy, RetryBudget
+from .circuit import CircuitBreakers
+from .metrics import Hook
+from .download import DiskCache, Download
+from .state import StateCache
+from .watcher import Watcher
+from .ingest import DatapointWriter
+from .models import (ModelSequence, StatusPager, Component, Incident, IncidentUpdate, Maintenance, MaintenanceUpdate,
+                     TeamMember, Subscriber, Metric)
+from .utils import MISSING, new_event_loop
 
 if TYPE_CHECKING:
     import aiohttp
+    from .analytics import IncidentHistory
 
 log = logging.getLogger(__name__)
 
@@ -48,14 +66,27 @@ def _start_background_loop(loop):
     loop.run_forever()
 
 
-_LOOP = asyncio.new_event_loop()
-_LOOP_THREAD = threading.Thread(
-    target=_start_background_loop, args=(_LOOP,), daemon=True
-)
-_LOOP_THREAD.start()
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_THREAD: Optional[threading.Thread] = None
+_LOOP_LOCK = threading.Lock()
 
 
-def asyncio_run(coro: Awaitable[T], timeout=30, ignore_no_result=True) -> T:
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Returns the loop running on the background thread, starting both on first use."""
+    global _LOOP, _LOOP_THREAD
+    if _LOOP is None:
+        with _LOOP_LOCK:
+            if _LOOP is None:
+                loop = new_event_loop()
+                _LOOP_THREAD = threading.Thread(
+                    target=_start_background_loop, args=(loop,), daemon=True
+                )
+                _LOOP_THREAD.start()
+                _LOOP = loop
+    return _LOOP
+
+
+def asyncio_run(coro: Awaitable[T], timeout=30, ignore_no_result=False) -> T:
     """
     Runs the coroutine in an event loop running on a background thread,
     and blocks the current thread until it returns a result.
@@ -65,13 +96,15 @@ def asyncio_run(coro: Awaitable[T], timeout=30, ignore_no_result=True) -> T:
     ----------
 
     :param coro: A coroutine, typically an async method
-    :param timeout: How many seconds we should wait for a result before raising an error
-    :param ignore_no_result: Whether to ignore if the result timeouts
+    :param timeout: How many seconds we should wait for a result before raising an error;
+        the coroutine gets cancelled then
+    :param ignore_no_result: Whether to return ``None`` instead of raising if the result timeouts
     """
-    future = asyncio.run_coroutine_threadsafe(coro, _LOOP)
+    future = asyncio.run_coroutine_threadsafe(coro, _get_loop())
     try:
         result = future.result(timeout=timeout)
     except TimeoutError:
+        future.cancel()
         if ignore_no_result:
             return None
         raise
@@ -82,7 +115,7 @@ def asyncio_gather(*futures, return_exceptions=False):
     """
     A version of asyncio.gather that runs on the internal event loop
     """
-    return asyncio.gather(*futures, loop=_LOOP, return_exceptions=return_exceptions)
+    return asyncio.gather(*futures, loop=_get_loop(), return_exceptions=return_exceptions)
 
 
 def _cancel_tasks(loop):
@@ -129,11 +162,22 @@ class StatusClient:
     def __init__(self,
                  api_key: str,
                  *,
-                 loop: Optional[asyncio.AbstractEventLoop] = _LOOP,
+                 loop: Optional[asyncio.AbstractEventLoop] = None,
                  proxy: Optional[str] = None,
                  proxy_auth: Optional[str] = None,
                  connector: Optional[Any] = None,
                  cookie_file: Optional["aiohttp.CookieJar"] = None,
+                 pool: Optional[ConnectionPool] = None,
+                 codec: Optional[JSONCodec] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 coalesce_requests: bool = True,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 retry_budget: Optional[RetryBudget] = MISSING,
+                 circuit_breakers: Optional[CircuitBreakers] = None,
+                 gateway: Optional[str] = None,
+                 transport: Optional[Transport] = None,
+                 download_cache: Optional[DiskCache] = None,
+                 state_cache: Optional[StateCache] = None,
                  http_kwargs: Optional[Dict[str, Any]] = {}):
         self.api_key = api_key
         self._http = HTTPClient(
@@ -141,80 +185,421 @@ class StatusClient:
             connector,
             proxy=proxy,
             proxy_auth=proxy_auth,
-            loop=loop,
+            loop=loop or _get_loop(),
             cookie_file=cookie_file,
+            pool=pool,
+            codec=codec,
+            cache=response_cache,
+            coalesce_requests=coalesce_requests,
+            retry_policy=retry_policy,
+            retry_budget=retry_budget,
+            circuit_breakers=circuit_breakers,
+            gateway=gateway,
+            transport=transport,
+            download_cache=download_cache,
             http_kwargs=http_kwargs
         )
         self.loop = self._http.loop
+        self.state_cache: Optional[StateCache] = state_cache
+        self._writers: List[DatapointWriter] = []
+        self._datapoints: Optional[DatapointWriter] = None
 
     def __del__(self):
-        if not self.loop.is_closed():
+        if not self.loop.is_closed() and self.loop.is_running():
             if not self._http.is_closed:
-                asyncio_run(self.close())
+                # the client may live on any loop, and blocking here could deadlock it
+                asyncio.run_coroutine_threadsafe(self.close(), self.loop)
 
     async def close(self):
         if not self.loop.is_closed():
+            # the buffered data points are sent first
+            for writer in self._writers:
+                await writer.close()
             if not self._http.is_closed:
                 await self._http.close()
 
     def run(self, coro: T, timeout=None):
         asyncio_run(coro, timeout=timeout)
-        _LOOP.create_task(self.close())
-
-    async def fetch_summary(self, prod_name: str):
-        return await self._http.get_summary(prod_name)
-
-    async def get_status_pages(self):
-        data = await self._http.get_status_pages()
-        return data
-
-    async def create_status_page(self, data):
-        return await self._http.create_status_page(data)
-
-    async def update_status_page(self, page_id: str, data):
-        return await self._http.update_status_page(page_id, data)
-
-    async def delete_status_page(self, page_id: str):
-        return await self._http.delete_status_page(page_id)
-
-    async def get_component(self, page_id: str):
-        return await self._http.delete_status_page(page_id)
+        asyncio.run_coroutine_threadsafe(self.close(), self.loop)
 
-    async def update_component(self, page_id: str, component_id: str, data):
-        return await self._http.update_component(page_id, component_id, data)
+    def add_hook(self, event: str, callback: Hook):
+        """Registers ``callback`` for a request lifecycle event, see :class:`instatus.metrics.Hooks`."""
+        self._http.add_hook(event, callback)
 
-    async def delete_component(self, page_id: str, component_id: str):
-        return await self._http.delete_component(page_id, component_id)
+    def remove_hook(self, event: str, callback: Hook):
+        self._http.remove_hook(event, callback)
+
+    def hook(self, callback: Hook) -> Hook:
+        """A decorator registering a hook for the event it is named after. ::
 
-    async def get_incident(self, page_id: str, incident_id: str):
-        return await self._http.get_incident(page_id, incident_id)
+            @client.hook
+            def on_ratelimited(info, retry_after, is_global):
+                ...
+        """
+        self._http.add_hook(callback.__name__, callback)
+        return callback
 
-    async def getall_incidents(self, page_id: str):
-        return await self._http.get_all_incidents(page_id)
+    async def warmup(self, connections: int = 2, *, prod_names: List[str] = ()):
+        """Pre-opens connections to the API and the summary hosts of ``prod_names``."""
+        await self._http.warmup(connections, prod_names=prod_names)
 
-    async def add_incident(self, page_id: str, data):
-        return await self._http.add_incident(page_id, data)
+    def download(self, url: str, *, cache: Optional[DiskCache] = MISSING, chunk_size: int = 65536) -> Download:
+        """Streams an asset like a logo or favicon; iterate over the returned :class:`Download`."""
+        return self._http.download(url, cache=cache, chunk_size=chunk_size)
 
-    async def update_incident(self, page_id: str, incident_id: str, data):
-        return await self._http.update_incident(page_id, incident_id, data)
+    async def download_to(self, url: str, path: str, *, cache: Optional[DiskCache] = MISSING) -> int:
+        """Downloads an asset to ``path``, resuming an interrupted earlier call, and returns its size."""
+        return await self._http.download(url, cache=cache).to_file(path)
 
-    async def delete_incident(self, page_id: str, incident_id: str):
-        return await self._http.delete_incident(page_id, incident_id)
-
-    async def get_incident_update(self, page_id: str, incident_id: str, incident_update_id: str):
-        return await self._http.get_incident_update(page_id, incident_id, incident_update_id)
-
-    async def add_incident_update(self, page_id: str, incident_id: str, data):
-        return await self._http.add_incident_update(page_id, incident_id, data)
-
-    async def edit_incident_update(self, page_id: str, incident_id: str, incident_update_id: str, data):
-        return await self._http.edit_incident_update(page_id, incident_id, incident_update_id, data)
-
-    async def delete_incident_update(self, page_id: str, incident_id: str, incident_update_id: str):
-        return await self._http.delete_incident_update(page_id, incident_id, incident_update_id)
+    def watch(self,
+              page_id: str,
+              *,
+              interval: float = 30.0,
+              watch: Tuple[str, ...] = ('component', 'incident'),
+              queue_size: int = 1000,
+              initial_events: bool = False) -> Watcher:
+        """Returns a :class:`Watcher` dispatching an event for every change on a status page;
+        register its listeners, then ``await watcher.start()``.
+        """
+        return Watcher(self, page_id, interval=interval, watch=watch, queue_size=queue_size,
+                       initial_events=initial_events)
+
+    async def fetch_summary(self, prod_name: str, *, timeout: Optional[float] = MISSING):
+        return await self._http.get_summary(prod_name, timeout=timeout)
+
+    def _factory(self, model, page_id: Optional[str] = None, **kwargs):
+        # builds the model of a payload, through the state cache if there is one
+        if self.state_cache is not None:
+            return functools.partial(self.state_cache.store, model, state=self, page_id=page_id, **kwargs)
+        return functools.partial(model, state=self, page_id=page_id, **kwargs)
+
+    def _model(self, model, data, page_id: Optional[str] = None, **kwargs):
+        if self.state_cache is not None:
+            return self.state_cache.store(model, data, state=self, page_id=page_id, **kwargs)
+        return model(data, state=self, page_id=page_id, **kwargs)
+
+    def _models(self, model, data, page_id: Optional[str] = None, **kwargs) -> ModelSequence:
+        factory = self._factory(model, page_id, **kwargs)
+        if self.state_cache is not None:
+            # the cached objects have to be updated now, not once an element is accessed
+            data = [factory(item) for item in data]
+        return ModelSequence(data, factory)
+
+    def _forget(self, model, page_id: Optional[str], object_id: str):
+        if self.state_cache is not None:
+            self.state_cache.remove(model, page_id, object_id)
+
+    # Cached state, read without a request; always None or empty without a state_cache
+
+    def get_cached_status_page(self, page_id: str) -> Optional[StatusPager]:
+        return self.state_cache.get(StatusPager, None, page_id) if self.state_cache is not None else None
+
+    def get_cached_component(self, page_id: str, component_id: str) -> Optional[Component]:
+        return self.state_cache.get(Component, page_id, component_id) if self.state_cache is not None else None
+
+    def get_cached_components(self, page_id: str) -> List[Component]:
+        return self.state_cache.all(Component, page_id) if self.state_cache is not None else []
+
+    def get_cached_incident(self, page_id: str, incident_id: str) -> Optional[Incident]:
+        return self.state_cache.get(Incident, page_id, incident_id) if self.state_cache is not None else None
+
+    def get_cached_incidents(self, page_id: str) -> List[Incident]:
+        return self.state_cache.all(Incident, page_id) if self.state_cache is not None else []
+
+    def get_cached_maintenance(self, page_id: str, maintenance_id: str) -> Optional[Maintenance]:
+        return self.state_cache.get(Maintenance, page_id, maintenance_id) if self.state_cache is not None else None
+
+    def get_cached_maintenances(self, page_id: str) -> List[Maintenance]:
+        return self.state_cache.all(Maintenance, page_id) if self.state_cache is not None else []
+
+    # Status pages
+
+    async def get_status_pages(self, *, timeout: Optional[float] = MISSING) -> ModelSequence:
+        data = await self._http.get_status_pages(timeout=timeout)
+        return self._models(StatusPager, data)
+
+    async def create_status_page(self, data, *, timeout: Optional[float] = MISSING) -> StatusPager:
+        return self._model(StatusPager, await self._http.create_status_page(data, timeout=timeout))
+
+    async def update_status_page(self, page_id: str, data, *, timeout: Optional[float] = MISSING) -> StatusPager:
+        return self._model(StatusPager, await self._http.update_status_page(page_id, data, timeout=timeout))
+
+    async def delete_status_page(self, page_id: str, *, timeout: Optional[float] = MISSING):
+        result = await self._http.delete_status_page(page_id, timeout=timeout)
+        if self.state_cache is not None:
+            self.state_cache.remove_page(page_id)
+        return result
+
+    # Components
+
+    async def get_component(self, page_id: str, component_id: str, *, timeout: Optional[float] = MISSING) -> Component:
+        return self._model(Component, await self._http.get_component(page_id, component_id, timeout=timeout), page_id)
+
+    async def get_all_components(self, page_id: str, *, timeout: Optional[float] = MISSING) -> ModelSequence:
+        return self._models(Component, await self._http.get_all_components(page_id, timeout=timeout), page_id)
+
+    async def iter_components(self, page_id: str, *, timeout: Optional[float] = MISSING):
+        """Yields the components of a page one by one while the response is still being read."""
+        async for item in self._http.iter_components(page_id, timeout=timeout):
+            yield self._model(Component, item, page_id)
+
+    def paginate_components(self, page_id: str, *, per_page: int = 50, prefetch: int = 2, limit: Optional[int] = None) -> Paginator:
+        """
+        Returns an async iterator over all components of a page, requesting them page by page.
+        The next ``prefetch`` pages are requested while the current one is consumed.
+        """
+        return self._http.paginate_components(page_id, per_page=per_page, prefetch=prefetch, limit=limit,
+                                              model=self._factory(Component, page_id))
+
+    async def create_component(self, page_id: str, data, *, timeout: Optional[float] = MISSING) -> Component:
+        return self._model(Component, await self._http.create_component(page_id, data, timeout=timeout), page_id)
+
+    async def update_component(self, page_id: str, component_id: str, data, *, timeout: Optional[float] = MISSING) -> Component:
+        return self._model(Component, await self._http.update_component(page_id, component_id, data, timeout=timeout), page_id)
+
+    async def delete_component(self, page_id: str, component_id: str, *, timeout: Optional[float] = MISSING):
+        result = await self._http.delete_component(page_id, component_id, timeout=timeout)
+        self._forget(Component, page_id, component_id)
+        return result
+
+    async def bulk_update_components(self,
+                                     page_id: str,
+                                     updates: Dict[str, Dict[str, Any]],
+                                     *,
+                                     concurrency: int = 10,
+                                     on_progress: Optional[ProgressCallback] = None,
+                                     timeout: Optional[float] = MISSING) -> BulkResult:
+        """
+        Updates many components at once, with at most ``concurrency`` requests running at a time.
+        Returns a :class:`BulkResult` mapping each component id to the updated component
+        or the exception the update raised.
+        """
+        return await run_bulk(
+            ((component_id, functools.partial(self.update_component, page_id, component_id, data, timeout=timeout))
+             for component_id, data in updates.items()),
+            concurrency=concurrency,
+            on_progress=on_progress
+        )
 
-    async def get_maintenance(self, page_id: str, incident_id: str):
-        return await self._http.get_maintenance(page_id, incident_id)
+    # Incidents
+
+    async def get_incident(self, page_id: str, incident_id: str, *, timeout: Optional[float] = MISSING) -> Incident:
+        return self._model(Incident, await self._http.get_incident(page_id, incident_id, timeout=timeout), page_id)
+
+    async def getall_incidents(self, page_id: str, *, timeout: Optional[float] = MISSING) -> ModelSequence:
+        return self._models(Incident, await self._http.get_all_incidents(page_id, timeout=timeout), page_id)
+
+    async def iter_incidents(self, page_id: str, *, timeout: Optional[float] = MISSING):
+        """Yields the incidents of a page one by one while the response is still being read."""
+        async for item in self._http.iter_incidents(page_id, timeout=timeout):
+            yield self._model(Incident, item, page_id)
+
+    def paginate_incidents(self, page_id: str, *, per_page: int = 50, prefetch: int = 2, limit: Optional[int] = None) -> Paginator:
+        """
+        Returns an async iterator over all incidents of a page, requesting them page by page.
+        The next ``prefetch`` pages are requested while the current one is consumed.
+        """
+        return self._http.paginate_incidents(page_id, per_page=per_page, prefetch=prefetch, limit=limit,
+                                             model=self._factory(Incident, page_id))
+
+    async def add_incident(self, page_id: str, data, *, timeout: Optional[float] = MISSING) -> Incident:
+        return self._model(Incident, await self._http.add_incident(page_id, data, timeout=timeout), page_id)
+
+    async def update_incident(self, page_id: str, incident_id: str, data, *, timeout: Optional[float] = MISSING) -> Incident:
+        return self._model(Incident, await self._http.update_incident(page_id, incident_id, data, timeout=timeout), page_id)
+
+    async def delete_incident(self, page_id: str, incident_id: str, *, timeout: Optional[float] = MISSING):
+        result = await self._http.delete_incident(page_id, incident_id, timeout=timeout)
+        self._forget(Incident, page_id, incident_id)
+        return result
+
+    async def get_incident_update(self, page_id: str, incident_id: str, incident_update_id: str, *, timeout: Optional[float] = MISSING) -> IncidentUpdate:
+        data = await self._http.get_incident_update(page_id, incident_id, incident_update_id, timeout=timeout)
+        return self._model(IncidentUpdate, data, page_id, incident_id=incident_id)
+
+    async def add_incident_update(self, page_id: str, incident_id: str, data, *, timeout: Optional[float] = MISSING) -> IncidentUpdate:
+        data = await self._http.add_incident_update(page_id, incident_id, data, timeout=timeout)
+        return self._model(IncidentUpdate, data, page_id, incident_id=incident_id)
+
+    async def bulk_add_incident_updates(self,
+                                        page_id: str,
+                                        updates: Dict[str, Dict[str, Any]],
+                                        *,
+                                        concurrency: int = 10,
+                                        on_progress: Optional[ProgressCallback] = None,
+                                        timeout: Optional[float] = MISSING) -> BulkResult:
+        """
+        Adds an update to many incidents at once, with at most ``concurrency`` requests running at a time.
+        Returns a :class:`BulkResult` mapping each incident id to the new incident update
+        or the exception adding it raised.
+        """
+        return await run_bulk(
+            ((incident_id, functools.partial(self.add_incident_update, page_id, incident_id, data, timeout=timeout))
+             for incident_id, data in updates.items()),
+            concurrency=concurrency,
+            on_progress=on_progress
+        )
 
-    async def get_all_maintenances(self, page_id: str):
-        return await self._http.get_all_maintenances(page_id)
\ No newline at end of file
+    async def edit_incident_update(self, page_id: str, incident_id: str, incident_update_id: str, data, *, timeout: Optional[float] = MISSING) -> IncidentUpdate:
+        data = await self._http.edit_incident_update(page_id, incident_id, incident_update_id, data, timeout=timeout)
+        return self._model(IncidentUpdate, data, page_id, incident_id=incident_id)
+
+    async def delete_incident_update(self, page_id: str, incident_id: str, incident_update_id: str, *, timeout: Optional[float] = MISSING):
+        result = await self._http.delete_incident_update(page_id, incident_id, incident_update_id, timeout=timeout)
+        self._forget(IncidentUpdate, page_id, incident_update_id)
+        return result
+
+    # Maintenances
+
+    async def get_maintenance(self, page_id: str, maintenance_id: str, *, timeout: Optional[float] = MISSING) -> Maintenance:
+        return self._model(Maintenance, await self._http.get_maintenance(page_id, maintenance_id, timeout=timeout), page_id)
+
+    async def get_all_maintenances(self, page_id: str, *, timeout: Optional[float] = MISSING) -> ModelSequence:
+        return self._models(Maintenance, await self._http.get_all_maintenances(page_id, timeout=timeout), page_id)
+
+    async def iter_maintenances(self, page_id: str, *, timeout: Optional[float] = MISSING):
+        """Yields the maintenances of a page one by one while the response is still being read."""
+        async for item in self._http.iter_maintenances(page_id, timeout=timeout):
+            yield self._model(Maintenance, item, page_id)
+
+    def paginate_maintenances(self, page_id: str, *, per_page: int = 50, prefetch: int = 2, limit: Optional[int] = None) -> Paginator:
+        """
+        Returns an async iterator over all maintenances of a page, requesting them page by page.
+        The next ``prefetch`` pages are requested while the current one is consumed.
+        """
+        return self._http.paginate_maintenances(page_id, per_page=per_page, prefetch=prefetch, limit=limit,
+                                                model=self._factory(Maintenance, page_id))
+
+    async def add_maintenance(self, page_id: str, data, *, timeout: Optional[float] = MISSING) -> Maintenance:
+        return self._model(Maintenance, await self._http.add_maintenance(page_id, data, timeout=timeout), page_id)
+
+    async def update_maintenance(self, page_id: str, maintenance_id: str, data, *, timeout: Optional[float] = MISSING) -> Maintenance:
+        data = await self._http.update_maintenance(page_id, maintenance_id, data, timeout=timeout)
+        return self._model(Maintenance, data, page_id)
+
+    async def delete_maintenance(self, page_id: str, maintenance_id: str, *, timeout: Optional[float] = MISSING):
+        result = await self._http.delete_maintenance(page_id, maintenance_id, timeout=timeout)
+        self._forget(Maintenance, page_id, maintenance_id)
+        return result
+
+    async def get_maintenance_update(self, page_id: str, maintenance_id: str, maintenance_update_id: str, *, timeout: Optional[float] = MISSING) -> MaintenanceUpdate:
+        data = await self._http.get_maintenance_update(page_id, maintenance_id, maintenance_update_id, timeout=timeout)
+        return self._model(MaintenanceUpdate, data, page_id, maintenance_id=maintenance_id)
+
+    async def add_maintenance_update(self, page_id: str, maintenance_id: str, data, *, timeout: Optional[float] = MISSING) -> MaintenanceUpdate:
+        data = await self._http.add_maintenance_update(page_id, maintenance_id, data, timeout=timeout)
+        return self._model(MaintenanceUpdate, data, page_id, maintenance_id=maintenance_id)
+
+    async def edit_maintenance_update(self, page_id: str, maintenance_id: str, maintenance_update_id: str, data, *, timeout: Optional[float] = MISSING) -> MaintenanceUpdate:
+        data = await self._http.edit_maintenance_update(page_id, maintenance_id, maintenance_update_id, data, timeout=timeout)
+        return self._model(MaintenanceUpdate, data, page_id, maintenance_id=maintenance_id)
+
+    async def delete_maintenance_update(self, page_id: str, maintenance_id: str, maintenance_update_id: str, *, timeout: Optional[float] = MISSING):
+        result = await self._http.delete_maintenance_update(page_id, maintenance_id, maintenance_update_id, timeout=timeout)
+        self._forget(MaintenanceUpdate, page_id, maintenance_update_id)
+        return result
+
+    # Analytics
+
+    async def get_history(self, page_id: str, *, now=None, timeout: Optional[float] = MISSING) -> 'IncidentHistory':
+        """Fetches the incidents and maintenances of a page as an :class:`IncidentHistory`
+        for uptime, MTTR and MTBF figures, with a row per component of the page. Requires NumPy.
+        """
+        # imported here, numpy takes longer to import than the rest of the package
+        from .analytics import IncidentHistory
+
+        components, incidents, maintenances = await asyncio.gather(
+            self._http.get_all_components(page_id, timeout=timeout),
+            self._http.get_all_incidents(page_id, timeout=timeout),
+            self._http.get_all_maintenances(page_id, timeout=timeout)
+        )
+        return IncidentHistory.from_payloads(incidents, maintenances, components=[c['id'] for c in components], now=now)
+
+    # Metrics
+
+    async def get_metrics(self, page_id: str, *, timeout: Optional[float] = MISSING) -> ModelSequence:
+        return self._models(Metric, await self._http.get_metrics(page_id, timeout=timeout), page_id)
+
+    async def create_metric(self, page_id: str, data, *, timeout: Optional[float] = MISSING) -> Metric:
+        return self._model(Metric, await self._http.add_metric(page_id, data, timeout=timeout), page_id)
+
+    async def update_metric(self, page_id: str, metric_id: str, data, *, timeout: Optional[float] = MISSING) -> Metric:
+        return self._model(Metric, await self._http.update_metric(page_id, metric_id, data, timeout=timeout), page_id)
+
+    async def delete_metric(self, page_id: str, metric_id: str, *, timeout: Optional[float] = MISSING):
+        result = await self._http.delete_metric(page_id, metric_id, timeout=timeout)
+        self._forget(Metric, page_id, metric_id)
+        return result
+
+    async def delete_datapoint(self, page_id: str, metric_id: str, timestamp: int, *, timeout: Optional[float] = MISSING):
+        return await self._http.delete_datapoint(page_id, metric_id, timestamp, timeout=timeout)
+
+    def datapoint_writer(self, **options) -> DatapointWriter:
+        """Returns a new :class:`DatapointWriter` sending metric data points in batches;
+        it is closed, sending what it still holds, when the client is closed.
+        """
+        writer = DatapointWriter(self, **options)
+        self._writers.append(writer)
+        return writer
+
+    @property
+    def datapoints(self) -> DatapointWriter:
+        """:class:`DatapointWriter`: The writer with the default options, which :meth:`Metric.add_datapoint` uses."""
+        if self._datapoints is None:
+            self._datapoints = self.datapoint_writer()
+        return self._datapoints
+
+    # Team
+
+    async def get_teammates(self, page_id: str, *, timeout: Optional[float] = MISSING) -> ModelSequence:
+        return self._models(TeamMember, await self._http.get_teammates(page_id, timeout=timeout), page_id)
+
+    async def iter_teammates(self, page_id: str, *, timeout: Optional[float] = MISSING):
+        """Yields the teammates of a page one by one while the response is still being read."""
+        async for item in self._http.iter_teammates(page_id, timeout=timeout):
+            yield self._model(TeamMember, item, page_id)
+
+    async def add_teammate(self, page_id: str, data, *, timeout: Optional[float] = MISSING) -> TeamMember:
+        return self._model(TeamMember, await self._http.add_teammate(page_id, data, timeout=timeout), page_id)
+
+    async def delete_teammate(self, page_id: str, member_id: str, *, timeout: Optional[float] = MISSING):
+        result = await self._http.delete_teammate(page_id, member_id, timeout=timeout)
+        self._forget(TeamMember, page_id, member_id)
+        return result
+
+    # Subscribers
+
+    async def get_subscribers(self, page_id: str, *, timeout: Optional[float] = MISSING) -> ModelSequence:
+        return self._models(Subscriber, await self._http.get_subscribers(page_id, timeout=timeout), page_id)
+
+    def paginate_subscribers(self, page_id: str, *, per_page: int = 50, prefetch: int = 2, limit: Optional[int] = None) -> Paginator:
+        """
+        Returns an async iterator over all subscribers of a page, requesting them page by page.
+        The next ``prefetch`` pages are requested while the current one is consumed.
+        """
+        return self._http.paginate_subscribers(page_id, per_page=per_page, prefetch=prefetch, limit=limit,
+                                               model=self._factory(Subscriber, page_id))
+
+    async def delete_subscriber(self, page_id: str, subscriber_id: str, *, timeout: Optional[float] = MISSING):
+        result = await self._http.delete_subscriber(page_id, subscriber_id, timeout=timeout)
+        self._forget(Subscriber, page_id, subscriber_id)
+        return result
+
+    async def bulk_delete_subscribers(self,
+                                      page_id: str,
+                                      subscriber_ids: List[str],
+                                      *,
+                                      concurrency: int = 10,
+                                      on_progress: Optional[ProgressCallback] = None,
+                                      timeout: Optional[float] = MISSING) -> BulkResult:
+        """
+        Deletes many subscribers at once, with at most ``concurrency`` requests running at a time.
+        Returns a :class:`BulkResult` mapping each subscriber id to the response
+        or the exception the deletion raised.
+        """
+        return await run_bulk(
+            ((subscriber_id, functools.partial(self.delete_subscriber, page_id, subscriber_id, timeout=timeout))
+             for subscriber_id in subscriber_ids),
+            concurrency=concurrency,
+            on_progress=on_progress
+        )
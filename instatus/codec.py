@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import json
+from typing import Any, Optional, Union
+
+__all__ = (
+    'JSONCodec',
+    'StdlibCodec',
+    'OrjsonCodec',
+    'UjsonCodec',
+    'default_codec',
+)
+
+
+class JSONCodec:
+    """The interface of the JSON codecs used by :class:`HTTPClient`.
+
+    :meth:`dumps` returns the request body as :class:`bytes` and :meth:`loads`
+    takes the raw response body, so no intermediate :class:`str` is created.
+    """
+
+    name = 'abstract'
+
+    def __repr__(self):
+        return '<%s name=%r>' % (self.__class__.__name__, self.name)
+
+    def dumps(self, obj: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        raise NotImplementedError
+
+
+class StdlibCodec(JSONCodec):
+    """A codec using the :mod:`json` module of the standard library."""
+
+    name = 'json'
+
+    def dumps(self, obj: Any) -> bytes:
+        # with ensure_ascii the str stays one byte per character and the C encoder takes
+        # its fastest path, so this is quicker and smaller than writing the UTF-8 as is
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=True).encode('ascii')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """A codec using `orjson <https://github.com/ijl/orjson>`_."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self.dumps = orjson.dumps
+        self.loads = orjson.loads
+
+
+class UjsonCodec(JSONCodec):
+    """A codec using `ujson <https://github.com/ultrajson/ultrajson>`_."""
+
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+        self.loads = ujson.loads
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode('utf-8')
+
+
+_DEFAULT_CODEC: Optional[JSONCodec] = None
+
+
+def default_codec() -> JSONCodec:
+    """Returns the fastest installed codec; orjson, then ujson, then the standard library."""
+    global _DEFAULT_CODEC
+    if _DEFAULT_CODEC is None:
+        for cls in (OrjsonCodec, UjsonCodec):
+            try:
+                _DEFAULT_CODEC = cls()
+            except ImportError:
+                continue
+            break
+        else:
+            _DEFAULT_CODEC = StdlibCodec()
+    return _DEFAULT_CODEC
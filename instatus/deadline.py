@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+import aiohttp
+
+__all__ = ('Deadline',)
+
+
+class Deadline:
+    """The point in time by which a call has to be finished.
+
+    The deadline of the running call is available through :func:`current_deadline`,
+    so every step of it (rate limit waits, retries and the socket timeouts of each
+    attempt) works with the time that is actually left.
+    """
+
+    __slots__ = ('timeout', 'when', '__weakref__')
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.when = time.monotonic() + timeout
+
+    def __repr__(self):
+        return '<Deadline timeout={0.timeout} remaining={1:.3f}>'.format(self, self.remaining())
+
+    def remaining(self) -> float:
+        return max(self.when - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.when <= time.monotonic()
+
+    def copy(self) -> 'Deadline':
+        deadline = Deadline(self.timeout)
+        deadline.when = self.when
+        return deadline
+
+    def extend(self, other: Optional['Deadline']):
+        """Moves the deadline to ``other`` if that is later; ``None`` removes it."""
+        self.when = float('inf') if other is None else max(self.when, other.when)
+
+    def client_timeout(self) -> aiohttp.ClientTimeout:
+        """Returns the socket timeouts for an attempt started now."""
+        remaining = self.remaining()
+        if remaining == float('inf'):
+            return aiohttp.ClientTimeout()
+        return aiohttp.ClientTimeout(total=remaining, sock_connect=remaining, sock_read=remaining)
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar('instatus_deadline', default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Returns the :class:`Deadline` of the running call, if it has one."""
+    return _current_deadline.get()
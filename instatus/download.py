@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import tempfile
+from typing import AsyncIterator, BinaryIO, Dict, NamedTuple, Optional, TYPE_CHECKING
+
+import aiohttp
+
+from .errors import HTTPException, NotFound, Forbidden, InstatusServerError
+from .retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from .http_requests import HTTPClient
+
+log = logging.getLogger(__name__)
+
+__all__ = ('DiskCache', 'CacheEntry', 'Download')
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class CacheEntry(NamedTuple):
+    """What :class:`DiskCache` knows about a downloaded url."""
+    url: str
+    digest: str
+    size: int
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_type: Optional[str]
+    stored_at: float
+
+
+class DiskCache:
+    """A content-addressed cache of downloaded assets on disk.
+
+    The bodies are stored once per sha256 of their content under ``objects/``, so the
+    same logo served under several urls takes the space of one. Next to them an index
+    file per url records the digest and the ``ETag``/``Last-Modified`` validators. A
+    cached url is revalidated with a conditional request, and a ``304`` is answered
+    from disk, so an unchanged asset is never transferred again.
+
+    All writes go through a temporary file and :func:`os.replace`, so several
+    processes can share one directory.
+
+    Parameters
+    -----------
+    directory: :class:`str`
+        Where to keep the cache; created if missing.
+    max_size: Optional[:class:`int`]
+        The bytes the stored bodies may take; the least recently used urls are dropped
+        beyond that.
+    fresh_for: :class:`float`
+        The seconds a stored asset is used without revalidating it.
+    """
+
+    def __init__(self, directory: str, *, max_size: Optional[int] = None, fresh_for: float = 0.0):
+        self.directory = os.path.abspath(directory)
+        self.max_size = max_size
+        self.fresh_for = fresh_for
+        self._objects = os.path.join(self.directory, 'objects')
+        self._index = os.path.join(self.directory, 'index')
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._index, exist_ok=True)
+        # the bytes of the stored bodies, counted once by a full scan and then kept up to date
+        self._size: Optional[int] = None
+
+    def __repr__(self):
+        return '<DiskCache directory={0.directory!r} max_size={0.max_size}>'.format(self)
+
+    def _index_path(self, url: str) -> str:
+        return os.path.join(self._index, _digest(url) + '.json')
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self._objects, digest[:2], digest[2:])
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Returns the entry of ``url`` if its body is stored."""
+        path = self._index_path(url)
+        try:
+            with open(path, 'rb') as fp:
+                entry = CacheEntry(**json.loads(fp.read()))
+        except (OSError, ValueError, TypeError):
+            return None
+        if entry.url != url or not os.path.exists(self.object_path(entry.digest)):
+            return None
+        return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.stored_at < self.fresh_for
+
+    def touch(self, entry: CacheEntry) -> CacheEntry:
+        """Marks ``entry`` as revalidated and recently used."""
+        entry = entry._replace(stored_at=time.time())
+        self._write_index(entry)
+        return entry
+
+    def _write_index(self, entry: CacheEntry):
+        fd, temp = tempfile.mkstemp(dir=self._index, suffix='.tmp')
+        with os.fdopen(fd, 'w') as fp:
+            json.dump(entry._asdict(), fp)
+        os.replace(temp, self._index_path(entry.url))
+
+    def open_writer(self, url: str, headers) -> '_CacheWriter':
+        return _CacheWriter(self, url, headers)
+
+    def _stored(self, size: int):
+        # called for a body that wasn't stored before; the directory is only scanned
+        # again once the running total goes over max_size
+        if self.max_size is None:
+            return
+        if self._size is None:
+            self.prune()
+        else:
+            self._size += size
+            if self._size > self.max_size:
+                self.prune()
+
+    def prune(self):
+        """Drops the least recently used urls until the bodies fit into :attr:`max_size`."""
+        if self.max_size is None:
+            return
+        entries = []
+        for name in os.listdir(self._index):
+            path = os.path.join(self._index, name)
+            try:
+                with open(path, 'rb') as fp:
+                    entries.append((os.path.getmtime(path), path, json.loads(fp.read())))
+            except (OSError, ValueError):
+                continue
+        entries.sort(key=lambda item: item[0])
+        sizes = {entry['digest']: entry['size'] for _, _, entry in entries}
+        total = sum(sizes.values())
+        while entries and total > self.max_size:
+            _, path, entry = entries.pop(0)
+            os.remove(path)
+            if not any(other['digest'] == entry['digest'] for _, _, other in entries):
+                total -= entry['size']
+                try:
+                    os.remove(self.object_path(entry['digest']))
+                except FileNotFoundError:
+                    pass
+        self._size = total
+
+
+class _CacheWriter:
+    # copies a body into the cache while it is downloaded
+    __slots__ = ('cache', 'url', 'headers', 'fp', 'temp', 'hash', 'size')
+
+    def __init__(self, cache: DiskCache, url: str, headers):
+        self.cache = cache
+        self.url = url
+        self.headers = headers
+        fd, self.temp = tempfile.mkstemp(dir=cache._objects, suffix='.part')
+        self.fp: BinaryIO = os.fdopen(fd, 'wb')
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk: bytes):
+        self.fp.write(chunk)
+        self.hash.update(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> CacheEntry:
+        self.fp.close()
+        digest = self.hash.hexdigest()
+        path = self.cache.object_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # the same content may have been stored for another url already
+        stored = os.path.exists(path)
+        os.replace(self.temp, path)
+        entry = CacheEntry(self.url, digest, self.size, self.headers.get('ETag'), self.headers.get('Last-Modified'),
+                           self.headers.get('Content-Type'), time.time())
+        self.cache._write_index(entry)
+        if not stored:
+            self.cache._stored(self.size)
+        return entry
+
+    def abort(self):
+        self.fp.close()
+        try:
+            os.remove(self.temp)
+        except FileNotFoundError:
+            pass
+
+
+class Download:
+    """A streaming download of an asset, like a logo or favicon from the CDN.
+
+    Iterating over it yields the body in chunks as they arrive, so the memory used
+    doesn't depend on the size of the asset. ::
+
+        async for chunk in http.download(url):
+            ...
+
+        await http.download(url).to_file('logo.png')
+
+    A transfer that breaks off is resumed with a ``Range`` request from the byte it
+    stopped at, guarded by ``If-Range`` so a changed asset is not stitched together.
+    With a :class:`DiskCache` the body is stored while it streams, and later downloads
+    of the same url revalidate it with ``If-None-Match``/``If-Modified-Since`` and
+    stream it from disk on a ``304``.
+
+    Attributes
+    -----------
+    url: :class:`str`
+        The url of the asset.
+    etag: Optional[:class:`str`]
+        The ``ETag`` of the asset, once the response arrived.
+    size: Optional[:class:`int`]
+        The size of the whole asset, if the server told it.
+    received: :class:`int`
+        The bytes yielded so far.
+    from_cache: :class:`bool`
+        Whether the body came from the :class:`DiskCache`.
+    """
+
+    def __init__(self,
+                 http: 'HTTPClient',
+                 url: str,
+                 *,
+                 cache: Optional[DiskCache] = None,
+                 chunk_size: int = 65536,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 offset: int = 0,
+                 etag: Optional[str] = None):
+        self.http = http
+        self.url = url
+        self.cache = cache
+        self.chunk_size = chunk_size
+        self.retry_policy = retry_policy or http.retry_policy
+        self.offset = offset
+        self.etag = etag
+        self.size: Optional[int] = None
+        self.received = 0
+        self.from_cache = False
+
+    def __repr__(self):
+        return '<Download url={0.url!r} received={0.received} size={0.size}>'.format(self)
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._iter()
+
+    async def read(self) -> bytes:
+        """Returns the whole body at once."""
+        return b''.join([chunk async for chunk in self])
+
+    async def to_file(self, path: str) -> int:
+        """Streams the body to ``path`` and returns its size.
+
+        It is written to ``path + '.part'`` first. If that is left over from an
+        interrupted call, the download continues where it ended, as long as the
+        ``ETag`` of the asset is still the same.
+        """
+        part = path + '.part'
+        marker = part + '.etag'
+        if self.offset == 0 and self.etag is None and os.path.exists(part) and os.path.exists(marker):
+            with open(marker) as fp:
+                self.etag = fp.read() or None
+            if self.etag is not None:
+                self.offset = os.path.getsize(part)
+
+        fp = open(part, 'ab' if self.offset else 'wb')
+        try:
+            async for chunk in self:
+                if self.received == len(chunk) and self.etag is not None and not os.path.exists(marker):
+                    with open(marker, 'w') as etag_fp:
+                        etag_fp.write(self.etag)
+                # buffered writes into the page cache, which is cheaper than a thread hop
+                fp.write(chunk)
+        finally:
+            fp.close()
+        os.replace(part, path)
+        try:
+            os.remove(marker)
+        except FileNotFoundError:
+            pass
+        return self.offset + self.received
+
+    async def _from_disk(self, entry: CacheEntry) -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        with open(self.cache.object_path(entry.digest), 'rb') as fp:
+            while True:
+                chunk = await loop.run_in_executor(None, fp.read, self.chunk_size)
+                if not chunk:
+                    return
+                self.received += len(chunk)
+                yield chunk
+
+    def _headers(self, entry: Optional[CacheEntry]) -> Dict[str, str]:
+        headers = {'User-Agent': self.http.user_agent}
+        position = self.offset + self.received
+        if position:
+            headers['Range'] = 'bytes=%d-' % position
+            if self.etag is not None:
+                headers['If-Range'] = self.etag
+        elif entry is not None:
+            if entry.etag is not None:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified is not None:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    async def _iter(self) -> AsyncIterator[bytes]:
+        http = self.http
+        policy = self.retry_policy
+        cache = self.cache if self.offset == 0 else None
+        entry = cache.lookup(self.url) if cache is not None else None
+        if entry is not None and cache.is_fresh(entry):
+            self.from_cache = True
+            self.etag = entry.etag
+            async for chunk in self._from_disk(entry):
+                yield chunk
+            return
+
+        writer: Optional[_CacheWriter] = None
+        try:
+            for tries in range(policy.max_tries):
+                url, headers = http._target(self.url, self._headers(entry))
+                try:
+                    async with http.transport.request('GET', url, headers=headers, **http._proxy_kwargs) as r:
+                        position = self.offset + self.received
+                        if r.status == 304 and entry is not None:
+                            self.from_cache = True
+                            self.etag = entry.etag
+                            cache.touch(entry)
+                            async for chunk in self._from_disk(entry):
+                                yield chunk
+                            return
+
+                        if r.status == 206:
+                            skip = 0
+                        elif r.status == 200:
+                            if position and self.etag is not None and r.headers.get('ETag') != self.etag:
+                                # If-Range didn't match, the asset changed since the first bytes
+                                raise HTTPException(r, 'the asset changed during the download')
+                            # the server ignored the range, so what we have is sent again;
+                            # the offset still counts the bytes that are already on disk
+                            skip = position
+                        elif policy.should_retry_status(r.status) and http._can_retry(policy, tries):
+                            delay = policy.delay(tries, r)
+                            log.warning('GET %s has returned %s. Retrying in %.2f seconds.', self.url, r.status, delay)
+                            await asyncio.sleep(delay)
+                            continue
+                        elif r.status == 404:
+                            raise NotFound(r, 'asset not found')
+                        elif r.status == 403:
+                            raise Forbidden(r, 'cannot retrieve asset')
+                        elif r.status >= 500:
+                            raise InstatusServerError(r, 'failed to get asset')
+                        else:
+                            raise HTTPException(r, 'failed to get asset')
+
+                        if r.status == 206:
+                            total = r.headers.get('Content-Range', '').rpartition('/')[2]
+                            self.size = int(total) if total.isdigit() else self.size
+                        else:
+                            # the header rather than content_length, which isn't part of the Transport interface
+                            length = r.headers.get('Content-Length', '')
+                            self.size = int(length) if length.isdigit() else self.size
+                        if not position:
+                            self.etag = r.headers.get('ETag')
+                            if cache is not None and (self.etag or r.headers.get('Last-Modified')):
+                                writer = cache.open_writer(self.url, r.headers)
+
+                        async for chunk in r.content.iter_chunked(self.chunk_size):
+                            if skip:
+                                if len(chunk) <= skip:
+                                    skip -= len(chunk)
+                                    continue
+                                chunk, skip = chunk[skip:], 0
+                            self.received += len(chunk)
+                            if writer is not None:
+                                writer.write(chunk)
+                            yield chunk
+
+                        if writer is not None:
+                            writer.commit()
+                            writer = None
+                        return
+
+                except (OSError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                    # a body that broke off is resumed where it stopped
+                    retry = isinstance(e, aiohttp.ClientPayloadError) or policy.should_retry_exception(e)
+                    if not (retry and http._can_retry(policy, tries)):
+                        raise
+                    delay = policy.delay(tries)
+                    log.warning('GET %s has failed with %r after %d bytes. Resuming in %.2f seconds.',
+                                self.url, e, self.received, delay)
+                    await asyncio.sleep(delay)
+
+            raise HTTPException(r, 'failed to get asset')
+        finally:
+            if writer is not None:
+                writer.abort()
@@ -140,3 +140,32 @@ class Enum(metaclass=EnumMeta):
 
 class Status(Enum):
     UP = 'UP'
+    HASISSUES = 'HASISSUES'
+    UNDERMAINTENANCE = 'UNDERMAINTENANCE'
+
+
+class ComponentStatus(Enum):
+    OPERATIONAL = 'OPERATIONAL'
+    UNDERMAINTENANCE = 'UNDERMAINTENANCE'
+    DEGRADEDPERFORMANCE = 'DEGRADEDPERFORMANCE'
+    PARTIALOUTAGE = 'PARTIALOUTAGE'
+    MAJOROUTAGE = 'MAJOROUTAGE'
+
+
+class IncidentStatus(Enum):
+    INVESTIGATING = 'INVESTIGATING'
+    IDENTIFIED = 'IDENTIFIED'
+    MONITORING = 'MONITORING'
+    RESOLVED = 'RESOLVED'
+
+
+class MaintenanceStatus(Enum):
+    NOTSTARTEDYET = 'NOTSTARTEDYET'
+    INPROGRESS = 'INPROGRESS'
+    COMPLETED = 'COMPLETED'
+
+
+class CircuitState(Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
@@ -24,6 +24,15 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 DEALINGS IN THE SOFTWARE.
 """
 
+import sys
+
+if sys.version_info >= (3, 11):
+    # the same class as asyncio.TimeoutError, without importing asyncio
+    _TimeoutError = TimeoutError
+else:
+    from asyncio import TimeoutError as _TimeoutError
+
+
 class InstatusException(Exception):
 
     """Base exception class for Instatus.py
@@ -79,8 +88,11 @@ class HTTPException(InstatusException):
         self.response = response
         self.status = response.status
         if isinstance(message, dict):
+            # the error is either nested under 'error' or the body itself, e.g. a 429
             base = message.get('error')
-            self.code = base.get('code')
+            if not isinstance(base, dict):
+                base = message if base is None else {'message': str(base)}
+            self.code = base.get('code', 0)
             self.message = base.get('message')
             if self.message:
                 self.text = self.message
@@ -120,3 +132,46 @@ class InstatusServerError(HTTPException):
     """
     pass
 
+
+
+class CircuitOpen(InstatusException):
+    """Exception that's thrown when a request is not sent because the
+    circuit breaker of its host or route is open.
+
+    Subclass of :exc:`InstatusException`
+
+    Attributes
+    ------------
+    key: :class:`str`
+        The host or route template the circuit breaker belongs to.
+    retry_after: :class:`float`
+        The seconds until the circuit breaker lets a trial request through.
+    """
+
+    def __init__(self, key, retry_after):
+        self.key = key
+        self.retry_after = retry_after
+        super().__init__('The circuit for {0} is open, retry in {1:.2f} seconds'.format(key, retry_after))
+
+
+class RequestTimeout(InstatusException, _TimeoutError):
+    """Exception that's thrown when a call did not finish before its deadline.
+
+    The work of the call has been cancelled when this is raised.
+    Subclass of :exc:`InstatusException` and :exc:`asyncio.TimeoutError`
+
+    Attributes
+    ------------
+    method: :class:`str`
+        The HTTP method of the request.
+    path: :class:`str`
+        The route template of the request.
+    timeout: :class:`float`
+        The seconds the call had.
+    """
+
+    def __init__(self, method, path, timeout):
+        self.method = method
+        self.path = path
+        self.timeout = timeout
+        super().__init__('{0} {1} did not finish within {2:.2f} seconds'.format(method, path, timeout))
@@ -0,0 +1,384 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import inspect
+import logging
+import functools
+import itertools
+import threading
+import zlib
+import concurrent.futures
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, TypeVar, Union
+
+from .client import StatusClient
+from .utils import new_event_loop
+
+log = logging.getLogger(__name__)
+
+__all__ = ('LoopExecutor', 'SyncStatusClient', 'default_executor')
+
+T = TypeVar('T')
+
+#: A coroutine, or a function returning one that is called on the loop.
+Work = Union[Awaitable[T], Callable[[], Awaitable[T]]]
+
+#: The sharding policies of :class:`LoopExecutor`.
+POLICIES = ('api_key', 'round_robin')
+
+
+class _LoopThread:
+    __slots__ = ('loop', 'thread')
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, name: str):
+        self.loop = loop
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def stop(self, wait: bool = True):
+        loop = self.loop
+        if loop.is_closed():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if wait:
+            self.thread.join()
+            loop.close()
+
+
+def _discard(work: Work):
+    # work that will never run; a coroutine is closed so it doesn't warn that it was never awaited
+    if inspect.iscoroutine(work) or isinstance(work, _Batch):
+        work.close()
+
+
+class _Batch:
+    # the work of submit_many, run as one coroutine on the loop
+    __slots__ = ('items', 'return_exceptions')
+
+    def __init__(self, items: List[Work[Any]], return_exceptions: bool):
+        self.items = items
+        self.return_exceptions = return_exceptions
+
+    async def __call__(self) -> List[Any]:
+        return await asyncio.gather(*[self._run(work) for work in self.items],
+                                    return_exceptions=self.return_exceptions)
+
+    @staticmethod
+    async def _run(work: Work[Any]) -> Any:
+        return await (work() if callable(work) else work)
+
+    def close(self):
+        for work in self.items:
+            _discard(work)
+
+
+def _copy_state(future: concurrent.futures.Future, task: asyncio.Future):
+    if task.cancelled():
+        future.cancel()
+    if not future.set_running_or_notify_cancel():
+        return
+    exception = task.exception()
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(task.result())
+
+
+def _cancel_task(loop: asyncio.AbstractEventLoop, task: asyncio.Future, future: concurrent.futures.Future):
+    if future.cancelled() and not loop.is_closed():
+        loop.call_soon_threadsafe(task.cancel)
+
+
+def _schedule(work: Work, loop: asyncio.AbstractEventLoop) -> concurrent.futures.Future:
+    # like asyncio.run_coroutine_threadsafe, with one callback on the loop and no chained
+    # asyncio future; a function is only called on the loop, so its coroutine is created there
+    future = concurrent.futures.Future()
+
+    def start():
+        if future.cancelled():
+            _discard(work)
+            return
+        try:
+            task = loop.create_task(work() if callable(work) else work)
+        except BaseException as exc:
+            _discard(work)
+            if future.set_running_or_notify_cancel():
+                future.set_exception(exc)
+            return
+        task.add_done_callback(functools.partial(_copy_state, future))
+        # the caller gave up, e.g. its timeout passed
+        future.add_done_callback(functools.partial(_cancel_task, loop, task))
+
+    loop.call_soon_threadsafe(start)
+    return future
+
+
+class LoopExecutor:
+    """Runs coroutines on ``loops`` event loops, each on its own daemon thread.
+
+    Blocking callers from any thread hand their coroutines to one of the loops
+    and wait for the result. The loops are started on first use.
+
+    One loop is the default. More loops only pay off with several CPUs and calls that
+    spend a lot of time decoding; each hop between the threads costs the same, so on a
+    single CPU they are slower than one loop.
+
+    Parameters
+    -----------
+    loops: :class:`int`
+        The amount of loops.
+    policy: :class:`str`
+        How work is spread over the loops. ``'api_key'`` always picks the same loop
+        for the same key, so one api key shares one rate limit state. ``'round_robin'``
+        picks the next loop on every call.
+    loop_factory: Callable[[], :class:`asyncio.AbstractEventLoop`]
+        Creates the loops; uses uvloop if it is installed by default.
+    name: :class:`str`
+        The prefix of the thread names.
+    """
+
+    def __init__(self,
+                 loops: int = 1,
+                 *,
+                 policy: str = 'api_key',
+                 loop_factory: Callable[[], asyncio.AbstractEventLoop] = new_event_loop,
+                 name: str = 'instatus-loop'):
+        if policy not in POLICIES:
+            raise ValueError('policy must be one of %s, not %r' % (', '.join(POLICIES), policy))
+        self.size = max(loops, 1)
+        self.policy = policy
+        self.loop_factory = loop_factory
+        self.name = name
+        self._threads: List[_LoopThread] = []
+        self._loops: List[asyncio.AbstractEventLoop] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '<LoopExecutor size={0.size} policy={0.policy!r} running={1}>'.format(self, bool(self._threads))
+
+    @property
+    def loops(self) -> List[asyncio.AbstractEventLoop]:
+        """List[:class:`asyncio.AbstractEventLoop`]: The loops, starting them if needed."""
+        return list(self._started())
+
+    def _started(self) -> List[asyncio.AbstractEventLoop]:
+        loops = self._loops
+        if not loops:
+            with self._lock:
+                if not self._threads:
+                    self._threads = [
+                        _LoopThread(self.loop_factory(), '%s-%d' % (self.name, i)) for i in range(self.size)
+                    ]
+                    self._loops = [thread.loop for thread in self._threads]
+                loops = self._loops
+        return loops
+
+    def loop_for(self, key: Optional[str] = None) -> asyncio.AbstractEventLoop:
+        """Returns the loop the sharding policy picks for ``key``."""
+        loops = self._started()
+        if len(loops) == 1:
+            return loops[0]
+        if self.policy == 'api_key' and key is not None:
+            # stable across processes, unlike hash()
+            return loops[zlib.crc32(key.encode()) % len(loops)]
+        return loops[next(self._counter) % len(loops)]
+
+    def submit(self,
+               coro: Work[T],
+               *,
+               loop: Optional[asyncio.AbstractEventLoop] = None,
+               key: Optional[str] = None,
+               timeout: Optional[float] = None) -> T:
+        """Runs ``coro`` on ``loop`` (or the one picked for ``key``) and blocks until it's done.
+
+        ``coro`` may also be a function returning the coroutine, which is then called on
+        the loop. Returns its result or raises its exception. If ``timeout`` passes first
+        the coroutine is cancelled and :exc:`TimeoutError` is raised.
+        """
+        try:
+            if loop is None:
+                loop = self.loop_for(key)
+            future = _schedule(coro, loop)
+        except BaseException:
+            # e.g. the loop is closed
+            _discard(coro)
+            raise
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # timed out, or the calling thread got interrupted
+            future.cancel()
+            raise
+
+    def submit_many(self,
+                    coros: Iterable[Work[Any]],
+                    *,
+                    loop: Optional[asyncio.AbstractEventLoop] = None,
+                    key: Optional[str] = None,
+                    timeout: Optional[float] = None,
+                    return_exceptions: bool = False) -> List[Any]:
+        """Runs all ``coros`` concurrently on one loop with a single hop between the threads.
+
+        Each item is a coroutine or a function returning one; the functions are called
+        on the loop, so nothing is left unawaited if the submission fails. Returns the
+        results in order. With ``return_exceptions`` the exceptions are returned in place
+        of the results instead of the first one being raised.
+        """
+        coros = list(coros)
+        if not coros:
+            return []
+        return self.submit(_Batch(coros, return_exceptions), loop=loop, key=key, timeout=timeout)
+
+    def shutdown(self, wait: bool = True):
+        """Stops the loops. Work still running on them is dropped."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+            self._loops = []
+        for thread in threads:
+            thread.stop(wait)
+
+
+_DEFAULT_EXECUTOR: Optional[LoopExecutor] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_executor() -> LoopExecutor:
+    """Returns the :class:`LoopExecutor` shared by every :class:`SyncStatusClient` that isn't given one."""
+    global _DEFAULT_EXECUTOR
+    if _DEFAULT_EXECUTOR is None:
+        with _DEFAULT_LOCK:
+            if _DEFAULT_EXECUTOR is None:
+                _DEFAULT_EXECUTOR = LoopExecutor()
+    return _DEFAULT_EXECUTOR
+
+
+class SyncStatusClient:
+    """A blocking :class:`StatusClient` that is safe to use from any amount of threads.
+
+    Every coroutine method of :class:`StatusClient` is available as a plain method
+    returning its result, or raising its exception. Nothing is silently dropped; the
+    ``timeout`` of each call works like it does on :class:`StatusClient`.
+
+    With the ``'api_key'`` policy of the executor the client lives on a single loop.
+    With ``'round_robin'`` there is one :class:`StatusClient` per loop and the calls
+    are spread over them; each of those paces its own rate limit, so use it together
+    with a gateway (``gateway=``) when the budget matters.
+
+    Parameters
+    -----------
+    api_key: :class:`str`
+        The api key.
+    executor: Optional[:class:`LoopExecutor`]
+        The executor to run the calls on; the :func:`default_executor` if omitted.
+    \\*\\*options
+        Passed to :class:`StatusClient`.
+    """
+
+    def __init__(self, api_key: str, *, executor: Optional[LoopExecutor] = None, **options):
+        self.api_key = api_key
+        self.executor = executor or default_executor()
+        if self.executor.policy == 'api_key':
+            loops = [self.executor.loop_for(api_key)]
+        else:
+            loops = self.executor.loops
+        self._clients = [self.executor.submit(self._create(api_key, options), loop=loop) for loop in loops]
+        self._counter = itertools.count()
+
+    def __repr__(self):
+        return '<SyncStatusClient loops={0} executor={1.executor!r}>'.format(len(self._clients), self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    async def _create(api_key: str, options) -> StatusClient:
+        # created on the loop it will run on, so everything in it binds to that loop
+        return StatusClient(api_key, loop=asyncio.get_running_loop(), **options)
+
+    @property
+    def aio(self) -> StatusClient:
+        """:class:`StatusClient`: The async client the next call runs on."""
+        clients = self._clients
+        if len(clients) == 1:
+            return clients[0]
+        return clients[next(self._counter) % len(clients)]
+
+    def call(self, method: str, *args, **kwargs) -> Any:
+        """Calls the coroutine method ``method`` of :class:`StatusClient` and blocks for its result."""
+        client = self.aio
+        # the coroutine is created on the loop it runs on
+        return self.executor.submit(functools.partial(getattr(client, method), *args, **kwargs), loop=client.loop)
+
+    def submit_many(self,
+                    method: str,
+                    arguments: Iterable[Any],
+                    *,
+                    return_exceptions: bool = False,
+                    **kwargs) -> List[Any]:
+        """Calls ``method`` once per item of ``arguments``, all in a single hop to the loop.
+
+        Each item is a tuple of the positional arguments of one call; ``kwargs`` are
+        passed to every call. Returns the results in order. For example::
+
+            components = client.submit_many('get_component', [(page_id, c) for c in component_ids])
+        """
+        client = self.aio
+        function = getattr(client, method)
+        calls = [functools.partial(function, *(args if isinstance(args, tuple) else (args,)), **kwargs)
+                 for args in arguments]
+        return self.executor.submit_many(calls, loop=client.loop, return_exceptions=return_exceptions)
+
+    def close(self):
+        """Closes the connections of the client. The executor keeps running."""
+        clients, self._clients = self._clients, []
+        for client in clients:
+            if not client.loop.is_closed():
+                self.executor.submit(client.close(), loop=client.loop)
+
+
+def _make_sync(name: str, function: Callable) -> Callable:
+    @functools.wraps(function)
+    def method(self, *args, **kwargs):
+        return self.call(name, *args, **kwargs)
+    method.__qualname__ = 'SyncStatusClient.%s' % name
+    method.__doc__ = function.__doc__ or 'Blocking version of :meth:`StatusClient.%s`.' % name
+    return method
+
+
+# the coroutine methods of the async client; async iterators and paginators have no blocking form
+for _name, _function in inspect.getmembers(StatusClient, inspect.iscoroutinefunction):
+    if not _name.startswith('_') and _name != 'close':
+        setattr(SyncStatusClient, _name, _make_sync(_name, _function))
+
+del _name, _function
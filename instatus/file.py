@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import io
+import os
+import mmap
+import asyncio
+import mimetypes
+import threading
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Union
+
+from aiohttp import payload
+
+__all__ = ('File',)
+
+_HAS_PREAD = hasattr(os, 'pread')
+
+
+class File:
+    """A file to upload, read in chunks while the request is sent.
+
+    The content is never loaded as a whole: a path or file object is read with
+    positioned reads (no shared file position, so a retry just starts over at the
+    beginning) and a memory map or buffer is sent as zero-copy slices. Its length is
+    determined once, so multipart bodies get a ``Content-Length`` instead of being
+    sent chunked. ::
+
+        logo = File('logo.png')
+        await http.request(route, form=[logo.form_field('logo')], files=[logo])
+
+    A :class:`File` can also be passed as ``data`` or as the value of an
+    :class:`aiohttp.FormData` field directly.
+
+    Parameters
+    -----------
+    fp: Union[:class:`str`, :class:`os.PathLike`, :class:`io.IOBase`, :class:`mmap.mmap`, :class:`bytes`]
+        A path, a binary file object opened for reading (uploaded from its current
+        position on), a memory map, or any other object supporting the buffer protocol.
+    filename: Optional[:class:`str`]
+        The filename to upload with; defaults to the name of the file.
+    content_type: Optional[:class:`str`]
+        The content type; guessed from ``filename`` if not given.
+    use_mmap: :class:`bool`
+        Whether to memory map a path instead of reading it. This avoids the thread pool,
+        but page faults block the loop, so it is best for files in the page cache.
+    chunk_size: :class:`int`
+        The bytes read and written at a time.
+
+    Attributes
+    -----------
+    size: :class:`int`
+        The bytes that will be uploaded.
+    """
+
+    __slots__ = ('fp', 'filename', 'content_type', 'size', 'chunk_size', '_start', '_view', '_mmap',
+                 '_owner', '_lock')
+
+    def __init__(self,
+                 fp: Union[str, 'os.PathLike[str]', BinaryIO, mmap.mmap, bytes, memoryview],
+                 filename: Optional[str] = None,
+                 *,
+                 content_type: Optional[str] = None,
+                 use_mmap: bool = False,
+                 chunk_size: int = 262144):
+        self.chunk_size = chunk_size
+        self._view: Optional[memoryview] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._start = 0
+        self._owner = False
+        self._lock: Optional[threading.Lock] = None
+
+        if isinstance(fp, (str, os.PathLike)):
+            path = os.fspath(fp)
+            if filename is None:
+                filename = os.path.basename(path)
+            self.fp = open(path, 'rb')
+            self._owner = True
+        else:
+            self.fp = fp
+
+        if isinstance(self.fp, io.BytesIO):
+            # the buffer of the BytesIO, without a copy
+            self._start = self.fp.tell()
+            self._view = self.fp.getbuffer()[self._start:]
+        elif isinstance(self.fp, io.IOBase):
+            if filename is None:
+                name = getattr(self.fp, 'name', None)
+                filename = os.path.basename(name) if isinstance(name, str) else None
+            self._start = self.fp.tell()
+            if use_mmap and self._fileno() is not None and os.fstat(self._fileno()).st_size:
+                self._mmap = mmap.mmap(self._fileno(), 0, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._mmap)[self._start:]
+            elif self._fileno() is None or not _HAS_PREAD:
+                # reads have to seek, so concurrent uploads of this file take turns
+                self._lock = threading.Lock()
+        else:
+            self._view = memoryview(self.fp).cast('B')
+
+        if self._view is not None:
+            self.size = self._view.nbytes
+        elif self._fileno() is not None:
+            self.size = os.fstat(self._fileno()).st_size - self._start
+        else:
+            self.size = self.fp.seek(0, io.SEEK_END) - self._start
+            self.fp.seek(self._start)
+
+        self.filename = filename or 'untitled'
+        self.content_type = content_type or mimetypes.guess_type(self.filename)[0] or 'application/octet-stream'
+
+    def __repr__(self):
+        return '<File filename={0.filename!r} size={0.size} content_type={0.content_type!r}>'.format(self)
+
+    def __enter__(self) -> 'File':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _fileno(self) -> Optional[int]:
+        try:
+            return self.fp.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+
+    def reset(self, *, seek: Union[int, bool] = True):
+        """Rewinds :attr:`fp` to where the upload starts, for code reading it directly.
+
+        The chunks :meth:`iter_chunks` reads don't depend on the position of :attr:`fp`,
+        so a retry doesn't need this.
+        """
+        if seek and self._view is None:
+            self.fp.seek(self._start)
+
+    def close(self):
+        """Releases the memory map and closes the file if it was opened from a path."""
+        if self._view is not None:
+            try:
+                self._view.release()
+            except BufferError:
+                # a slice is still referenced by a pending write
+                pass
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+        if self._owner:
+            self.fp.close()
+
+    def form_field(self, name: str) -> Dict[str, Any]:
+        """Returns the keyword arguments of :meth:`aiohttp.FormData.add_field` uploading this file as ``name``."""
+        return {'name': name, 'value': self, 'filename': self.filename, 'content_type': self.content_type}
+
+    def read_chunk(self, offset: int, size: int) -> Union[bytes, memoryview]:
+        """Returns up to ``size`` bytes from ``offset`` bytes into the upload."""
+        if self._view is not None:
+            return self._view[offset:offset + size]
+        if self._lock is None:
+            return os.pread(self._fileno(), size, self._start + offset)
+        with self._lock:
+            self.fp.seek(self._start + offset)
+            return self.fp.read(size)
+
+    def iter_chunks(self) -> Iterator[Union[bytes, memoryview]]:
+        """Yields the upload in chunks of :attr:`chunk_size`; each call starts at the beginning again."""
+        for offset in range(0, self.size, self.chunk_size):
+            yield self.read_chunk(offset, self.chunk_size)
+
+
+class FilePayload(payload.Payload):
+    # the payload aiohttp creates for a File, see the registration below
+    _autoclose = True  # the File is closed by its owner, not after the request
+
+    def __init__(self, value: File, *args, **kwargs):
+        kwargs.setdefault('content_type', value.content_type)
+        kwargs.setdefault('filename', value.filename)
+        super().__init__(value, *args, **kwargs)
+        self._size = value.size
+
+    async def write(self, writer) -> None:
+        await self.write_with_length(writer, None)
+
+    async def write_with_length(self, writer, content_length: Optional[int]) -> None:
+        file: File = self._value
+        remaining = file.size if content_length is None else min(content_length, file.size)
+        loop = asyncio.get_running_loop()
+        offset = 0
+        while remaining > 0:
+            size = min(file.chunk_size, remaining)
+            if file._view is not None:
+                chunk = file.read_chunk(offset, size)
+            else:
+                chunk = await loop.run_in_executor(None, file.read_chunk, offset, size)
+            if not chunk:
+                break
+            # waits for the socket to drain, so at most a few chunks are held in memory
+            await writer.write(chunk)
+            offset += len(chunk)
+            remaining -= len(chunk)
+
+    def decode(self, encoding: str = 'utf-8', errors: str = 'strict') -> str:
+        return b''.join(bytes(chunk) for chunk in self._value.iter_chunks()).decode(encoding, errors)
+
+    async def close(self) -> None:
+        pass
+
+    def _close(self) -> None:
+        pass
+
+
+payload.PAYLOAD_REGISTRY.register(FilePayload, File)
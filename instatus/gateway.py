@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+import sys
+import json
+import signal
+import asyncio
+import hashlib
+import logging
+import argparse
+import functools
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+from aiohttp import web
+from multidict import CIMultiDict
+
+from .pool import ConnectionPool
+from .transport import Transport, AiohttpTransport
+from .ratelimit import RateLimiter
+from .http_requests import GATEWAY_URL_HEADER as URL_HEADER, GATEWAY_BUCKET_HEADER as BUCKET_HEADER
+
+log = logging.getLogger(__name__)
+
+__all__ = ('Gateway', 'DEFAULT_SOCKET')
+
+#: Where the gateway listens if no path is given, can be overridden with ``INSTATUS_GATEWAY_SOCKET``.
+DEFAULT_SOCKET = os.environ.get('INSTATUS_GATEWAY_SOCKET', '/tmp/instatus-gateway.sock')
+
+# headers that only apply to a single connection and are not forwarded;
+# the body is decompressed by the upstream session, so its encoding and length change too
+_HOP_BY_HOP = frozenset({
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization', 'te', 'trailer',
+    'transfer-encoding', 'upgrade', 'host', 'content-length', 'content-encoding',
+    URL_HEADER.lower(), BUCKET_HEADER.lower(),
+})
+
+
+def _forwarded_headers(headers) -> CIMultiDict:
+    return CIMultiDict((key, value) for key, value in headers.items() if key.lower() not in _HOP_BY_HOP)
+
+
+def _is_allowed(url: str) -> bool:
+    # only the api and the status pages; the gateway sends the api key along,
+    # it must not pass it on to any other host a local process names
+    try:
+        split = urlsplit(url)
+        host = split.hostname
+        split.port
+    except ValueError:
+        return False
+    if split.scheme != 'https' or host is None or split.username is not None or split.password is not None:
+        return False
+    return host == 'api.instatus.com' or host.endswith('.instatus.com')
+
+
+@functools.lru_cache(maxsize=128)
+def _fingerprint(authorization: Optional[str]) -> str:
+    # the api keys are never kept or logged in clear
+    if authorization is None:
+        return 'anonymous'
+    return hashlib.sha256(authorization.encode()).hexdigest()[:12]
+
+
+class Gateway:
+    """A local daemon that sends the requests of every process on a host.
+
+    It owns the connection pool and the rate limit state, so any number of worker processes
+    using ``HTTPClient(gateway=path)`` share one pool and one correctly paced budget per api
+    key instead of each overrunning it on its own. Start it with ``python -m instatus.gateway``.
+
+    Only ``https`` requests to ``api.instatus.com`` and the ``*.instatus.com`` status pages
+    are forwarded, anything else gets a ``400``, so the gateway can't be used to send the
+    api keys of the clients to other hosts.
+
+    Parameters
+    -----------
+    path: :class:`str`
+        The path of the Unix domain socket to listen on.
+    pool: Optional[:class:`ConnectionPool`]
+        The pool to send the requests with; a default one is created if omitted.
+    mode: :class:`int`
+        The permissions of the socket file.
+    unsync_clock: :class:`bool`
+        Whether to compute the rate limit resets from ``X-Ratelimit-Reset-After``
+        instead of the clock of this host.
+    proxy: Optional[:class:`str`]
+        The proxy to send the requests through.
+    proxy_auth: Optional[:class:`aiohttp.BasicAuth`]
+        The authentication for the proxy.
+    transport: Optional[:class:`Transport`]
+        The transport to send the requests with; an :class:`AiohttpTransport` using ``pool`` if omitted.
+    """
+
+    def __init__(self,
+                 path: str = DEFAULT_SOCKET,
+                 *,
+                 pool: Optional[ConnectionPool] = None,
+                 mode: int = 0o660,
+                 unsync_clock: bool = True,
+                 proxy: Optional[str] = None,
+                 proxy_auth: Optional[aiohttp.BasicAuth] = None,
+                 transport: Optional[Transport] = None):
+        self.path = path
+        self.mode = mode
+        self.transport = transport or AiohttpTransport(pool=pool)
+        self.use_clock = not unsync_clock
+        self.proxy = proxy
+        self.proxy_auth = proxy_auth
+        # one rate limit state per api key, the server counts them separately
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._runner: Optional[web.AppRunner] = None
+
+    def __repr__(self):
+        return '<Gateway path={0.path!r} keys={1}>'.format(self, len(self._limiters))
+
+    def _get_limiter(self, authorization: Optional[str]) -> RateLimiter:
+        key = _fingerprint(authorization)
+        try:
+            return self._limiters[key]
+        except KeyError:
+            limiter = self._limiters[key] = RateLimiter(asyncio.get_running_loop())
+            return limiter
+
+    async def start(self):
+        """Starts listening on :attr:`path`."""
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', self._handle)
+        try:
+            # aiohttp>=3.9 no longer cancels handlers of clients that went away by default
+            runner = web.AppRunner(app, handler_cancellation=True, access_log=None)
+        except TypeError:
+            runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.UnixSite(runner, self.path).start()
+        os.chmod(self.path, self.mode)
+        self._runner = runner
+        log.info('Gateway listening on %s', self.path)
+
+    async def close(self):
+        """Stops listening and closes the connections."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        await self.transport.close()
+
+    async def serve_forever(self):
+        """Starts the gateway and runs it until it gets cancelled, ``SIGINT`` or ``SIGTERM``."""
+        await self.start()
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+        try:
+            await stop.wait()
+        finally:
+            await self.close()
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        url = request.headers.get(URL_HEADER)
+        if url is None:
+            return web.Response(status=400, text='Missing the %s header.' % URL_HEADER)
+        if not _is_allowed(url):
+            return web.Response(status=400, text='Only https urls of instatus.com are forwarded.')
+
+        bucket_key = request.headers.get(BUCKET_HEADER)
+        limiter = self._get_limiter(request.headers.get('Authorization'))
+        headers = _forwarded_headers(request.headers)
+        body = await request.read() if request.body_exists else None
+
+        bucket = await limiter.acquire(bucket_key) if bucket_key is not None else None
+        try:
+            async with self.transport.request(request.method, url, headers=headers, data=body,
+                                             allow_redirects=False, proxy=self.proxy,
+                                             proxy_auth=self.proxy_auth) as r:
+                if bucket is not None:
+                    bucket.update(r, use_clock=self.use_clock)
+
+                if r.status == 429 and bucket is not None:
+                    data = await r.read()
+                    self._on_rate_limited(limiter, bucket, r, data)
+                    return web.Response(status=r.status, reason=r.reason, body=data,
+                                        headers=_forwarded_headers(r.headers))
+
+                response = web.StreamResponse(status=r.status, reason=r.reason,
+                                              headers=_forwarded_headers(r.headers))
+                await response.prepare(request)
+                async for chunk in r.content.iter_chunked(65536):
+                    await response.write(chunk)
+                await response.write_eof()
+                return response
+        except (OSError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            log.warning('%s %s has failed with %r.', request.method, url, e)
+            # the clients retry this like any other bad gateway
+            return web.Response(status=502, text='The gateway could not reach %s: %s' % (url, e))
+        finally:
+            if bucket is not None:
+                bucket.release()
+
+    @staticmethod
+    def _on_rate_limited(limiter: RateLimiter, bucket, r, data: bytes):
+        # park everyone else using the bucket before the clients even see the 429
+        try:
+            payload = json.loads(data)
+            retry_after = payload['retry_after'] / 1000.0
+        except (ValueError, KeyError, TypeError):
+            return
+        bucket.exhaust(retry_after)
+        if payload.get('global', False):
+            log.warning('Global rate limit has been hit. Pausing for %.2f seconds.', retry_after)
+            limiter.set_global(retry_after)
+        else:
+            log.warning('Bucket %s has been rate limited for %.2f seconds.', bucket.key, retry_after)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m instatus.gateway',
+        description='Shares one connection pool and rate limit budget between all processes on this host.'
+    )
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help='the Unix socket to listen on (default: %(default)s)')
+    parser.add_argument('--mode', default='660', help='the permissions of the socket, in octal (default: %(default)s)')
+    parser.add_argument('--limit', type=int, default=100, help='the total amount of connections (default: %(default)s)')
+    parser.add_argument('--limit-per-host', type=int, default=30,
+                        help='the amount of connections per host (default: %(default)s)')
+    parser.add_argument('--proxy', default=None, help='a proxy to send the requests through')
+    parser.add_argument('--log-level', default='INFO', help='(default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper(), format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    async def run():
+        pool = ConnectionPool(limit=args.limit, limit_per_host=args.limit_per_host)
+        gateway = Gateway(args.socket, pool=pool, mode=int(args.mode, 8), proxy=args.proxy)
+        try:
+            await gateway.serve_forever()
+        finally:
+            await pool.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
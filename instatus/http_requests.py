@@ -25,72 +25,162 @@ DEALINGS IN THE SOFTWARE.
 """
 
 import sys
-import json
 import logging
 import asyncio
-import aiohttp
+import reprlib
 import weakref
+import aiohttp
+from time import perf_counter
+from typing import Any, Optional
 from urllib.parse import quote as _uriquote
 
-from .errors import HTTPException, NotFound, Forbidden, InstatusServerError
-
-from . import utils, __version__
+from .errors import HTTPException, NotFound, Forbidden, InstatusServerError, RequestTimeout
+
+from . import __version__
+from .utils import MISSING, new_event_loop
+from .ratelimit import RateLimiter
+from .pool import ConnectionPool
+from .transport import Transport, AiohttpTransport
+from .codec import JSONCodec, default_codec
+from .streaming import iter_json_array
+from .pagination import Paginator
+from .cache import ResponseCache
+from .singleflight import SingleFlight
+from .retry import RetryPolicy, RetryBudget
+from .circuit import CircuitBreakers
+from .deadline import Deadline, current_deadline, _current_deadline
+from .metrics import Hooks, RequestInfo, Hook
+from .file import File
+from .download import DiskCache, Download
 
 
 log = logging.getLogger(__name__)
 
+# requests sent through a gateway go to its socket; the real url and the bucket travel in headers
+GATEWAY_URL = 'http://instatus-gateway/'
+GATEWAY_URL_HEADER = 'X-Instatus-Url'
+GATEWAY_BUCKET_HEADER = 'X-Instatus-Bucket'
 
-async def json_or_text(response):
-    encoding = 'utf-8'
-    content_type = None
-    try:
-        content_type, encoding = response.headers['content-type'].split('; charset=')
-    except KeyError:
-        # Thanks Cloudflare
-        pass
+_body_repr = reprlib.Repr()
+_body_repr.maxlevel = 3
+_body_repr.maxdict = _body_repr.maxlist = 8
+_body_repr.maxstring = _body_repr.maxother = 120
 
-    text = await response.text(encoding=encoding)
-    if content_type == 'application/json':
-        return json.loads(text)
 
-    return text
+class _LogBody:
+    # formats a request or response body for the debug log only when the record is
+    # emitted, and only its beginning, so large bodies don't get formatted in full
+    __slots__ = ('body',)
 
+    LIMIT = 512
 
-class Route:
-    BASE = 'https://api.instatus.com/'
+    def __init__(self, body: Any):
+        self.body = body
 
-    def __init__(self, method, path: str = None, full_url: str = None, **parameters):
-        self.path = path
-        self.method = method
-        if full_url:
-            url = self.path = full_url
-        else:
-            url = (self.BASE + self.path)
-        if parameters:
-            self.url = url.format(**{k: _uriquote(v) if isinstance(v, str) else v for k, v in parameters.items()})
+    def __str__(self):
+        body = self.body
+        if isinstance(body, (bytes, bytearray)):
+            text = bytes(body[:self.LIMIT]).decode('utf-8', 'replace')
+            more = len(body) - self.LIMIT
         else:
-            self.url = url
+            text = body if isinstance(body, str) else _body_repr.repr(body)
+            more = len(text) - self.LIMIT
+            text = text[:self.LIMIT]
+        if more > 0:
+            text += '... (%d more)' % more
+        return text
 
-    @property
-    def bucket(self):
-        # the bucket is just method + path w/ major parameters
-        return '{0.path}'.format(self)
 
+async def json_or_text(response, codec: JSONCodec = None):
+    # the body is decoded straight from the bytes, without creating a str first
+    body = await response.read()
+    content_type = response.headers.get('content-type', '')
+    charset = response.charset
+    if content_type.startswith('application/json'):
+        if charset and charset.lower() not in ('utf-8', 'utf8'):
+            body = body.decode(charset)
+        return (codec or default_codec()).loads(body)
+
+    return body.decode(charset or 'utf-8', 'replace')
+
+
+class RouteTemplate:
+    """A registered route template like ``v1/{page_id}/incidents/{incident_id}``.
+
+    The URL formatter is compiled once per template and the bucket key only depends
+    on the template and its major parameter, so all ids of a page share one bucket.
+    Use :meth:`get` to obtain the interned instance of a template.
+    """
 
-class MaybeUnlock:
-    def __init__(self, lock):
-        self.lock = lock
-        self._unlock = True
+    __slots__ = ('path', 'url', 'major', 'timeout', '_format', '_buckets')
 
-    def __enter__(self):
-        return self
+    BASE = 'https://api.instatus.com/'
+    #: The parameters the server counts its rate limits per, in order of precedence.
+    MAJOR_PARAMETERS = ('page_id', 'prod_name')
+    #: The seconds a call gets by default, if its template is not in :attr:`TIMEOUTS`.
+    DEFAULT_TIMEOUT = 30.0
+    #: The default timeout per template; the lists of a page can get large.
+    TIMEOUTS = {
+        'https://{prod_name}.instatus.com/summary.json': 10.0,
+        'v1/{page_id}/components': 60.0,
+        'v1/{page_id}/incidents': 60.0,
+        'v1/{page_id}/maintenances': 60.0,
+        'v1/{page_id}/subscribers': 60.0,
+    }
+
+    _registry = {}
+
+    def __init__(self, path: str, *, full_url: bool = False):
+        self.path = path
+        self.url = path if full_url else self.BASE + path
+        self._format = self.url.format
+        self.major = next((p for p in self.MAJOR_PARAMETERS if '{%s}' % p in path), None)
+        self.timeout = self.TIMEOUTS.get(path, self.DEFAULT_TIMEOUT)
+        self._buckets = {}
+
+    def __repr__(self):
+        return '<RouteTemplate path={0.path!r} major={0.major!r}>'.format(self)
+
+    @classmethod
+    def get(cls, path: str, *, full_url: bool = False) -> 'RouteTemplate':
+        try:
+            return cls._registry[path]
+        except KeyError:
+            template = cls._registry[path] = cls(path, full_url=full_url)
+            return template
+
+    def format(self, parameters) -> str:
+        if not parameters:
+            return self.url
+        return self._format(**{k: _uriquote(v) if isinstance(v, str) else v for k, v in parameters.items()})
+
+    def bucket(self, parameters) -> str:
+        # the bucket is just the template w/ major parameters
+        if self.major is None:
+            return self.path
+        major = parameters[self.major]
+        try:
+            return self._buckets[major]
+        except KeyError:
+            bucket = self._buckets[major] = sys.intern('%s:%s' % (self.path, major))
+            return bucket
 
-    def defer(self):
-        self._unlock = False
 
-    def __exit__(self, _type, value, traceback):
-        if self._unlock:
-            self.lock.release()
+class Route:
+    __slots__ = ('method', 'template', 'path', 'url', 'bucket', 'parameters')
+
+    BASE = RouteTemplate.BASE
+
+    def __init__(self, method, path: str = None, full_url: str = None, **parameters):
+        self.method = method
+        if full_url:
+            self.template = RouteTemplate.get(full_url, full_url=True)
+        else:
+            self.template = RouteTemplate.get(path)
+        self.path = self.template.path
+        self.parameters = parameters
+        self.url = self.template.format(parameters)
+        self.bucket = self.template.bucket(parameters)
 
 
 class HTTPClient:
@@ -108,376 +198,835 @@ class HTTPClient:
                  loop=None,
                  unsync_clock=True,
                  cookie_file=None,
+                 pool: ConnectionPool = None,
+                 codec: JSONCodec = None,
+                 cache: ResponseCache = None,
+                 coalesce_requests: bool = True,
+                 retry_policy: RetryPolicy = None,
+                 retry_budget: Optional[RetryBudget] = MISSING,
+                 circuit_breakers: Optional[CircuitBreakers] = None,
+                 gateway: Optional[str] = None,
+                 transport: Optional[Transport] = None,
+                 download_cache: Optional[DiskCache] = None,
                  http_kwargs: dict = {}):
         if not loop:
             try:
                 loop = asyncio.get_running_loop()
             except RuntimeError:
-                loop = asyncio.new_event_loop()
+                loop = new_event_loop()
         self.loop = loop
-        self.connector = connector
-        self.__session = aiohttp.ClientSession(loop=loop, cookies=cookie_file or aiohttp.CookieJar(), **http_kwargs)
-        self._locks = weakref.WeakValueDictionary()
-        self._global_over = asyncio.Event()
-        self._global_over.set()
+        self.codec = codec or default_codec()
+        self.cache = cache
+        self._single_flight = SingleFlight() if coalesce_requests else None
+        # the deadline each shared request works towards, while it runs
+        self._shared_deadlines = weakref.WeakValueDictionary()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_budget = RetryBudget() if retry_budget is MISSING else retry_budget
+        self.circuit_breakers = circuit_breakers
+        self.download_cache = download_cache
+        # the path of the socket of a gateway (python -m instatus.gateway) to send the requests through
+        self.gateway = gateway
+        if transport is None:
+            transport = AiohttpTransport(connector, pool=pool, cookie_jar=cookie_file,
+                                         unix_socket=gateway, **http_kwargs)
+        self.transport = transport
+        self._ratelimiter = RateLimiter(loop)
+        # stays None while no hooks are registered, so requests don't measure anything
+        self.hooks: Optional[Hooks] = None
         self.api_key = api_key
         self.cookie_file = cookie_file
         self.http_kwargs = http_kwargs
         self.proxy = proxy
         self.proxy_auth = proxy_auth
+        # with a gateway the proxy is up to the gateway
+        self._proxy_kwargs = {}
+        if gateway is None:
+            if proxy is not None:
+                self._proxy_kwargs['proxy'] = proxy
+            if proxy_auth is not None:
+                self._proxy_kwargs['proxy_auth'] = proxy_auth
         self.use_clock = not unsync_clock
 
         user_agent = 'APIWrapper (https://github.com/mccoderpy/instatus.py {0}) Python/{1[0]}.{1[1]} aiohttp/{2}'
         self.user_agent = user_agent.format(__version__, sys.version_info, aiohttp.__version__)
 
-    def recreate(self):
-        if self.__session.closed:
-            self.__session = aiohttp.ClientSession(**self.http_kwargs)
-
-    async def request(self, route: Route, *, files=None, form=None, **kwargs):
-        bucket = route.bucket
-        method = route.method
-        url = route.url
-
-        lock = self._locks.get(bucket)
-        if lock is None:
-            lock = asyncio.Lock()
-            if bucket is not None:
-                self._locks[bucket] = lock
-
-        # header creation
+        # the default headers are built once and shared by all requests
         headers = {
             'User-Agent': self.user_agent,
             'X-Ratelimit-Precision': 'millisecond',
+            'Content-Type': 'application/json',
         }
+        if api_key is not None:
+            headers['Authorization'] = 'Bearer ' + api_key
+        self._headers = headers
+
+    def _target(self, url: str, headers: dict, bucket: Optional[str] = None):
+        """Returns the url and headers to send a request for ``url`` with, through the gateway if there is one."""
+        if self.gateway is None:
+            return url, headers
+        headers = dict(headers)
+        headers[GATEWAY_URL_HEADER] = url
+        if bucket is not None:
+            headers[GATEWAY_BUCKET_HEADER] = bucket
+        return GATEWAY_URL, headers
+
+    def recreate(self):
+        self.transport.recreate()
+
+    def add_hook(self, event: str, callback: Hook):
+        """Registers ``callback`` for one of the request lifecycle events of :class:`Hooks`."""
+        hooks = self.hooks if self.hooks is not None else Hooks()
+        hooks.add(event, callback)
+        self.hooks = hooks
+
+    def remove_hook(self, event: str, callback: Hook):
+        if self.hooks is not None:
+            self.hooks.remove(event, callback)
+            if not self.hooks:
+                self.hooks = None
+
+    async def _acquire_measured(self, key: str, info: RequestInfo):
+        # like RateLimiter.acquire, but records the time spent in each wait
+        limiter = self._ratelimiter
+        started = perf_counter()
+        if limiter.is_global_limited:
+            await limiter.wait_global()
+        acquiring = perf_counter()
+        bucket = await limiter.acquire(key)
+        info.sent = perf_counter()
+        info.global_wait = acquiring - started
+        info.bucket_wait = info.sent - acquiring
+        return bucket
+
+    async def warmup(self, connections: int = 2, *, prod_names=()):
+        """
+        Pre-opens ``connections`` keep-alive connections to the API host and to the
+        summary host of each name in ``prod_names``, so the first requests don't have
+        to wait for DNS and the TLS handshake.
+        """
+        urls = [RouteTemplate.BASE]
+        urls.extend('https://%s.instatus.com/' % _uriquote(name) for name in prod_names)
+
+        async def open_connection(url):
+            try:
+                target, headers = self._target(url, {'User-Agent': self.user_agent})
+                async with self.transport.request('HEAD', target, headers=headers, **self._proxy_kwargs) as r:
+                    await r.release()
+            except (aiohttp.ClientError, OSError) as exc:
+                log.debug('Could not pre-open a connection to %s: %s', url, exc)
+
+        await asyncio.gather(*[open_connection(url) for url in urls for _ in range(connections)])
+
+    async def request(self, route: Route, *, timeout: Optional[float] = MISSING, **kwargs):
+        """
+        Sends a request to ``route`` and returns the decoded response.
+
+        ``timeout`` is the deadline in seconds for the whole call, including the waits
+        for the rate limit, the retries and every socket operation. It defaults to the
+        timeout of the route template; ``None`` disables it. When it passes the call is
+        cancelled and :exc:`RequestTimeout` is raised.
+        """
+        if timeout is MISSING:
+            timeout = route.template.timeout
+        outer = current_deadline()
+        if outer is not None and (timeout is None or outer.remaining() < timeout):
+            timeout = outer.remaining()
+        if timeout is None:
+            return await self._send(route, **kwargs)
+
+        token = _current_deadline.set(Deadline(timeout))
+        try:
+            return await asyncio.wait_for(self._send(route, **kwargs), timeout)
+        except asyncio.TimeoutError:
+            raise RequestTimeout(route.method, route.path, timeout) from None
+        finally:
+            _current_deadline.reset(token)
+
+    async def _send(self, route: Route, *, files=None, form=None, retry_policy: RetryPolicy = None, **kwargs):
+        method = route.method
+        policy = retry_policy or self.retry_policy
 
-        if self.api_key is not None:
-            headers['Authorization'] = 'Bearer ' + self.api_key
         # some checking if it's a JSON request
         if 'json' in kwargs:
-            kwargs['data'] = utils.to_json(kwargs.pop('json'))
+            kwargs['data'] = self.codec.dumps(kwargs.pop('json'))
 
         if 'content_type' in kwargs:
+            headers = self._headers.copy()
             headers['Content-Type'] = kwargs.pop('content_type')
+        elif form is not None or isinstance(kwargs.get('data'), File):
+            # aiohttp sets the multipart boundary or the content type of the file
+            headers = {key: value for key, value in self._headers.items() if key != 'Content-Type'}
         else:
-            headers['Content-Type'] = 'application/json'
+            headers = self._headers
         kwargs['headers'] = headers
 
         # Proxy support
-        if self.proxy is not None:
-            kwargs['proxy'] = self.proxy
-        if self.proxy_auth is not None:
-            kwargs['proxy_auth'] = self.proxy_auth
-
-        if not self._global_over.is_set():
-            # wait until the global lock is complete
-            await self._global_over.wait()
-
-        await lock.acquire()
-        with MaybeUnlock(lock) as maybe_lock:
-            for tries in range(5):
-                if files:
-                    for f in files:
-                        f.reset(seek=tries)
-
-                if form:
-                    form_data = aiohttp.FormData(quote_fields=False)
-                    for params in form:
-                        form_data.add_field(**params)
-                    kwargs['data'] = form_data
-
-                try:
-                    async with self.__session.request(method, url, **kwargs) as r:
-                        log.debug('%s %s with %s has returned %s', method, url, kwargs.get('data'), r.status)
-
-                        # even errors have text involved in them so this is safe to call
-                        data = await json_or_text(r)
-
-                        # check if we have rate limit header information
-                        remaining = r.headers.get('X-Ratelimit-Remaining')
-                        if remaining == '0' and r.status != 429:
-                            # we've depleted our current bucket
-                            delta = utils._parse_ratelimit_header(r, use_clock=self.use_clock)
-                            log.debug('A rate limit bucket has been exhausted (bucket: %s, retry: %s).', bucket, delta)
-                            maybe_lock.defer()
-                            self.loop.call_later(delta, lock.release)
-
-                        # the request was successful so just return the text/json
-                        if 300 > r.status >= 200:
-                            log.debug('%s %s has received %s', method, url, data)
-                            return data
-
-                        # we are being rate limited
-                        if r.status == 429:
-                            if not r.headers.get('Via'):
-                                # Banned by Cloudflare more than likely.
-                                raise HTTPException(r, data)
-
-                            fmt = 'We are being rate limited. Retrying in %.2f seconds. Handled under the bucket "%s"'
-
-                            # sleep a bit
-                            retry_after = data['retry_after'] / 1000.0
-                            log.warning(fmt, retry_after, bucket)
-
-                            # check if it's a global rate limit
-                            is_global = data.get('global', False)
-                            if is_global:
-                                log.warning('Global rate limit has been hit. Retrying in %.2f seconds.', retry_after)
-                                self._global_over.clear()
-
-                            await asyncio.sleep(retry_after)
-                            log.debug('Done sleeping for the rate limit. Retrying...')
-
-                            # release the global lock now that the
-                            # global rate limit has passed
-                            if is_global:
-                                self._global_over.set()
-                                log.debug('Global rate limit is now over.')
-
-                            continue
-
-                        # we've received a 500 or 502, unconditional retry
-                        if r.status in {500, 502}:
-                            await asyncio.sleep(1 + tries * 2)
-                            continue
-
-                        # the usual error cases
-                        if r.status == 403:
-                            raise Forbidden(r, data)
-                        elif r.status == 404:
-                            raise NotFound(r, data)
-                        elif r.status == 503:
-                            raise InstatusServerError(r, data)
-                        else:
-                            raise HTTPException(r, data)
+        if self._proxy_kwargs:
+            kwargs.update(self._proxy_kwargs)
+
+        cache = self.cache
+        if cache is None:
+            if method == 'GET' and self._single_flight is not None:
+                return await self._coalesce(route, kwargs, policy)
+            return await self._request(route, kwargs, policy, files, form)
+
+        if method != 'GET':
+            # requests that were in flight while this runs won't get cached
+            cache.invalidate(route)
+            try:
+                return await self._request(route, kwargs, policy, files, form)
+            finally:
+                cache.invalidate(route)
+
+        cache_key = cache.key(route, kwargs.get('params'))
+        entry = cache.get(cache_key)
+        if entry is not None and entry.is_fresh:
+            cache.hits += 1
+            return cache.load(entry)
+        if entry is not None and entry.can_revalidate:
+            kwargs['headers'] = dict(headers, **entry.validators())
+        else:
+            entry = None
+            cache.misses += 1
+        cached = (cache_key, cache.generation(route), entry)
+        if self._single_flight is not None:
+            return await self._coalesce(route, kwargs, policy, cached)
+        return await self._request(route, kwargs, policy, files, form, cached=cached)
+
+    def _coalesce(self, route, kwargs, policy, cached=None):
+        # identical GETs running at the same time share one request
+        params = kwargs.get('params')
+        key = (
+            route.method,
+            route.url,
+            tuple(sorted(params.items())) if params else None,
+            kwargs['headers'].get('Authorization')
+        )
+        caller = current_deadline()
+        shared = self._shared_deadlines.get(key)
+        if shared is not None:
+            shared.extend(caller)
+        return self._single_flight.do(key, lambda: self._start_shared(key, route, kwargs, policy, cached, caller))
+
+    def _start_shared(self, key, route, kwargs, policy, cached, caller):
+        # the deadline of the caller that started the request must not cut it short for the
+        # others: it works towards the latest deadline of its callers, each of which waits
+        # for it under its own timeout (the request is cancelled once all of them gave up)
+        deadline = None
+        if caller is None:
+            self._shared_deadlines.pop(key, None)
+        else:
+            deadline = self._shared_deadlines[key] = caller.copy()
+        return self._shared_request(route, kwargs, policy, cached, deadline)
+
+    async def _shared_request(self, route, kwargs, policy, cached, deadline):
+        # the task runs in a copy of the context of the caller that started it
+        _current_deadline.set(deadline)
+        return await self._request(route, kwargs, policy, cached=cached)
+
+    def _can_retry(self, policy: RetryPolicy, tries: int) -> bool:
+        # retries only happen while the client wide budget allows them
+        if not policy.can_retry(tries):
+            return False
+        return self.retry_budget is None or self.retry_budget.try_retry()
+
+    async def _request(self, route, kwargs, policy, files=None, form=None, cached=None):
+        bucket_key = route.bucket
+        method = route.method
+        url, kwargs['headers'] = self._target(route.url, kwargs['headers'], bucket_key)
 
-                # This is handling exceptions from the request
-                except OSError as e:
-                    # Connection reset by peer
-                    if tries < 4 and e.errno in (54, 10054):
-                        continue
-                    raise
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
+
+        breaker = self.circuit_breakers.get(route) if self.circuit_breakers is not None else None
+        hooks = self.hooks
+        info = None
+
+        for tries in range(policy.max_tries):
+            if breaker is not None:
+                # fail fast instead of waiting for the rate limit
+                breaker.check()
 
-            # We've run out of retries, raise.
-            if r.status >= 500:
-                raise InstatusServerError(r, data)
+            if files:
+                for f in files:
+                    f.reset(seek=tries)
 
+            if form:
+                form_data = aiohttp.FormData(quote_fields=False)
+                for params in form:
+                    form_data.add_field(**params)
+                kwargs['data'] = form_data
+
+            deadline = current_deadline()
+            if deadline is not None:
+                kwargs['timeout'] = deadline.client_timeout()
+
+            if hooks is None:
+                # waits for the global rate limit and until the bucket has budget left
+                bucket = await self._ratelimiter.acquire(bucket_key)
+            else:
+                info = RequestInfo(method, route.path, bucket_key, url, tries)
+                bucket = await self._acquire_measured(bucket_key, info)
+                hooks.emit('on_request_start', info)
+            recorded = True
+            try:
+                if breaker is not None:
+                    breaker.before_call()
+                    recorded = False
+
+                async with self.transport.request(method, url, **kwargs) as r:
+                    if info is not None:
+                        info._received(r.status)
+                    if log.isEnabledFor(logging.DEBUG):
+                        log.debug('%s %s with %s has returned %s', method, url, _LogBody(kwargs.get('data')), r.status)
+
+                    # even errors have text involved in them so this is safe to call
+                    data = await json_or_text(r, self.codec)
+                    if info is not None:
+                        info._decoded()
+
+                    # update the budget of the bucket from the rate limit headers
+                    bucket.update(r, use_clock=self.use_clock)
+
+                    if breaker is not None:
+                        breaker.record(r.status < 500)
+                        recorded = True
+
+                    # the request was successful so just return the text/json
+                    if 300 > r.status >= 200:
+                        if log.isEnabledFor(logging.DEBUG):
+                            log.debug('%s %s has received %s', method, url, _LogBody(data))
+                        if cached is not None:
+                            self.cache.set(cached[0], route, data, r.headers, cached[1])
+                        return data
+
+                    # the cached response is still up to date
+                    if r.status == 304 and cached is not None and cached[2] is not None:
+                        entry = cached[2]
+                        self.cache.refresh(entry, route, r.headers)
+                        return self.cache.load(entry)
+
+                    # retries or raises depending on the status
+                    delay = self._handle_failure(r, data, bucket, tries, policy, info)
+
+            # This is handling exceptions from the request
+            except (OSError, aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if info is not None:
+                    info.error = e
+                if not recorded:
+                    breaker.record(False)
+                    recorded = True
+                if not (policy.should_retry_exception(e) and self._can_retry(policy, tries)):
+                    raise
+                delay = policy.delay(tries)
+                log.warning('%s %s has failed with %r. Retrying in %.2f seconds.', method, url, e, delay)
+            except BaseException as e:
+                if info is not None:
+                    info.error = e
+                raise
+            finally:
+                bucket.release()
+                if not recorded:
+                    # the attempt ended without an outcome
+                    breaker.release()
+                if info is not None:
+                    info.ended = perf_counter()
+                    hooks.emit('on_request_end', info)
+
+            if info is not None:
+                hooks.emit('on_retry', info, delay)
+            await self._sleep(delay, deadline)
+
+        # We've run out of retries, raise.
+        if r.status >= 500:
+            raise InstatusServerError(r, data)
+
+        raise HTTPException(r, data)
+
+    @staticmethod
+    async def _sleep(delay: float, deadline: Optional[Deadline]):
+        if deadline is not None and delay >= deadline.remaining():
+            # the next attempt can't finish in time anyway
+            raise asyncio.TimeoutError
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _handle_failure(self, r, data, bucket, tries, policy, info: Optional[RequestInfo] = None) -> float:
+        """Handles a response with an error status; returns the seconds to wait before retrying."""
+
+        # we are being rate limited
+        if r.status == 429:
+            if not r.headers.get('Via') or not policy.can_retry(tries):
+                # Banned by Cloudflare more than likely.
+                raise HTTPException(r, data)
+
+            fmt = 'We are being rate limited. Retrying in %.2f seconds. Handled under the bucket "%s"'
+
+            retry_after = data['retry_after'] / 1000.0
+            log.warning(fmt, retry_after, bucket.key)
+            is_global = data.get('global', False)
+            if info is not None:
+                self.hooks.emit('on_ratelimited', info, retry_after, is_global)
+
+            # the next attempt gets parked until the bucket
+            # (or everything if it's a global rate limit) resets
+            bucket.exhaust(retry_after)
+            if is_global:
+                log.warning('Global rate limit has been hit. Retrying in %.2f seconds.', retry_after)
+                self._ratelimiter.set_global(retry_after)
+            # the bucket parks the next attempt
+            return 0.0
+
+        if policy.should_retry_status(r.status) and self._can_retry(policy, tries):
+            delay = policy.delay(tries, r)
+            log.warning('%s %s has returned %s. Retrying in %.2f seconds.', r.method, r.url, r.status, delay)
+            return delay
+
+        # the usual error cases
+        if r.status == 403:
+            raise Forbidden(r, data)
+        elif r.status == 404:
+            raise NotFound(r, data)
+        elif r.status >= 500:
+            raise InstatusServerError(r, data)
+        else:
             raise HTTPException(r, data)
 
-    async def get_from_cdn(self, url):
-        async with self.__session.get(url) as resp:
-            if resp.status == 200:
-                return await resp.read()
-            elif resp.status == 404:
-                raise NotFound(resp, 'asset not found')
-            elif resp.status == 403:
-                raise Forbidden(resp, 'cannot retrieve asset')
+    async def stream(self, route: Route, *, timeout: Optional[float] = MISSING, **options):
+        """
+        Like :meth:`request` for ``GET`` routes returning a JSON array, but yields
+        each element as soon as it has been read from the response.
+        Failed attempts are retried as long as nothing has been yielded yet.
+
+        ``timeout`` covers everything up to the last element being read.
+        """
+        if timeout is MISSING:
+            timeout = route.template.timeout
+        deadline = Deadline(timeout) if timeout is not None else None
+        try:
+            async for item in self._stream(route, deadline, **options):
+                yield item
+        except asyncio.TimeoutError:
+            raise RequestTimeout(route.method, route.path, timeout) from None
+
+    async def _stream(self, route: Route, deadline: Optional[Deadline], *, chunk_size: int = 65536,
+                      retry_policy: RetryPolicy = None):
+        url, headers = self._target(route.url, self._headers, route.bucket)
+        kwargs = {'headers': headers}
+        kwargs.update(self._proxy_kwargs)
+
+        policy = retry_policy or self.retry_policy
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
+
+        breaker = self.circuit_breakers.get(route) if self.circuit_breakers is not None else None
+        hooks = self.hooks
+        info = None
+
+        yielded = False
+        for tries in range(policy.max_tries):
+            if breaker is not None:
+                breaker.check()
+
+            if hooks is None:
+                acquire = self._ratelimiter.acquire(route.bucket)
+            else:
+                info = RequestInfo(route.method, route.path, route.bucket, url, tries)
+                acquire = self._acquire_measured(route.bucket, info)
+            if deadline is not None:
+                bucket = await asyncio.wait_for(acquire, deadline.remaining())
+                kwargs['timeout'] = deadline.client_timeout()
             else:
-                raise HTTPException(resp, 'failed to get asset')
+                bucket = await acquire
+            if info is not None:
+                hooks.emit('on_request_start', info)
+            recorded = True
+            try:
+                if breaker is not None:
+                    breaker.before_call()
+                    recorded = False
+
+                async with self.transport.request(route.method, url, **kwargs) as r:
+                    if info is not None:
+                        info._received(r.status)
+                    log.debug('%s %s has returned %s', route.method, route.url, r.status)
+                    bucket.update(r, use_clock=self.use_clock)
+
+                    if breaker is not None:
+                        breaker.record(r.status < 500)
+                        recorded = True
+
+                    if 300 > r.status >= 200:
+                        if r.headers.get('content-type', '').startswith('application/json'):
+                            async for item in iter_json_array(r.content, self.codec, chunk_size):
+                                yielded = True
+                                yield item
+                        else:
+                            yield await json_or_text(r, self.codec)
+                        if info is not None:
+                            # includes the time the consumer spent between the items
+                            info._decoded()
+                        return
+
+                    data = await json_or_text(r, self.codec)
+                    if info is not None:
+                        info._decoded()
+                    delay = self._handle_failure(r, data, bucket, tries, policy, info)
+
+            except (OSError, aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if info is not None:
+                    info.error = e
+                if not recorded:
+                    breaker.record(False)
+                    recorded = True
+                # what was yielded already can't be taken back
+                if yielded or not (policy.should_retry_exception(e) and self._can_retry(policy, tries)):
+                    raise
+                delay = policy.delay(tries)
+                log.warning('%s %s has failed with %r. Retrying in %.2f seconds.', route.method, route.url, e, delay)
+            except BaseException as e:
+                # an abandoned stream is not a failure
+                if info is not None and not isinstance(e, GeneratorExit):
+                    info.error = e
+                raise
+            finally:
+                bucket.release()
+                if not recorded:
+                    breaker.release()
+                if info is not None:
+                    info.ended = perf_counter()
+                    hooks.emit('on_request_end', info)
+
+            if info is not None:
+                hooks.emit('on_retry', info, delay)
+            await self._sleep(delay, deadline)
+
+        # We've run out of retries, raise.
+        if r.status >= 500:
+            raise InstatusServerError(r, data)
+
+        raise HTTPException(r, data)
+
+    def download(self, url: str, *, cache: Optional[DiskCache] = MISSING, chunk_size: int = 65536,
+                 retry_policy: RetryPolicy = None) -> Download:
+        """
+        Streams an asset, like a logo from the CDN, see :class:`Download`.
+        ``cache`` defaults to the :attr:`download_cache` of the client.
+        """
+        return Download(self, url, cache=self.download_cache if cache is MISSING else cache,
+                        chunk_size=chunk_size, retry_policy=retry_policy)
+
+    async def get_from_cdn(self, url):
+        return await self.download(url).read()
 
     # state management
 
     @property
     def is_closed(self):
-        return self.__session.closed
+        return self.transport.closed
 
     async def close(self):
-        if self.__session:
-            await self.__session.close()
+        await self.transport.close()
 
-    def get_summary(self, prod_name):
-        return self.request(Route('GET', full_url=f'https://{prod_name}.instatus.com/summary.json'))
+    def get_summary(self, prod_name, *, timeout=MISSING):
+        return self.request(Route('GET', full_url='https://{prod_name}.instatus.com/summary.json', prod_name=prod_name), timeout=timeout)
 
     # Status pager requests
 
-    def get_status_pages(self):
+    def get_status_pages(self, *, timeout=MISSING):
         """
         Get a Status page from the instatus api
         """
-        return self.request(Route('GET', f"v1/pages"))
+        return self.request(Route('GET', 'v1/pages'), timeout=timeout)
 
-    def create_status_page(self, data):
+    def create_status_page(self, data, *, timeout=MISSING):
         """
         Create a Status page from the instatus api
         """
-        return self.request(Route('POST', f"v1/pages"), json=data)
+        return self.request(Route('POST', 'v1/pages'), json=data, timeout=timeout)
 
-    def update_status_page(self, page_id, data):
+    def update_status_page(self, page_id, data, *, timeout=MISSING):
         """
         Update a Status page from the instatus api
         """
-        return self.request(Route('PUT', f"v1/{page_id}"), json=data)
+        return self.request(Route('PUT', 'v1/{page_id}', page_id=page_id), json=data, timeout=timeout)
 
-    def delete_status_page(self, page_id):
+    def delete_status_page(self, page_id, *, timeout=MISSING):
         """
         Delete a Status page from the instatus api
         """
-        return self.request(Route('DELETE', f"v1/{page_id}"))
+        return self.request(Route('DELETE', 'v1/{page_id}', page_id=page_id), timeout=timeout)
 
     # Components requests
 
-    def get_component(self, page_id, component_id):
+    def get_component(self, page_id, component_id, *, timeout=MISSING):
         """
         Get a component from the instatus api
         """
-        return self.request(Route('GET', f"v1/{page_id}/components/{component_id}"))
+        return self.request(Route('GET', 'v1/{page_id}/components/{component_id}', page_id=page_id, component_id=component_id), timeout=timeout)
 
-    def get_all_components(self, page_id):
+    def get_all_components(self, page_id, *, timeout=MISSING):
         """
         Get a component from the instatus api
         """
-        return self.request(Route('GET', f"v1/{page_id}/components"))
+        return self.request(Route('GET', 'v1/{page_id}/components', page_id=page_id), timeout=timeout)
 
-    def create_component(self, page_id, data):
+    def iter_components(self, page_id, *, timeout=MISSING):
+        """
+        Iterate over all components from the instatus api while they are read
+        """
+        return self.stream(Route('GET', 'v1/{page_id}/components', page_id=page_id), timeout=timeout)
+
+    def paginate_components(self, page_id, **options):
+        """
+        Walk through the components from the instatus api page by page
+        """
+        return Paginator(self, Route('GET', 'v1/{page_id}/components', page_id=page_id), **options)
+
+    def create_component(self, page_id, data, *, timeout=MISSING):
         """
         Create a component from the instatus api
         """
-        return self.request(Route('POST', f"v1/{page_id}/components"), json=data)
+        return self.request(Route('POST', 'v1/{page_id}/components', page_id=page_id), json=data, timeout=timeout)
 
-    def update_component(self, page_id, component_id, data):
+    def update_component(self, page_id, component_id, data, *, timeout=MISSING):
         """
         Update a component from the instatus api
         """
-        return self.request(Route('PUT', f"v1/{page_id}/components/{component_id}"), json=data)
+        return self.request(Route('PUT', 'v1/{page_id}/components/{component_id}', page_id=page_id, component_id=component_id), json=data, timeout=timeout)
 
-    def delete_component(self, page_id, component_id):
+    def delete_component(self, page_id, component_id, *, timeout=MISSING):
         """
         Delete a component from the instatus api
         """
-        return self.request(Route('DELETE', f"v1/{page_id}/components/{component_id}"))
+        return self.request(Route('DELETE', 'v1/{page_id}/components/{component_id}', page_id=page_id, component_id=component_id), timeout=timeout)
 
     # Incident requests
 
-    def get_incident(self, page_id, incident_id):
+    def get_incident(self, page_id, incident_id, *, timeout=MISSING):
         """
         Get an incident from the instatus api
         """
-        return self.request(Route('GET', f"v1/{page_id}/incidents/{incident_id}"))
+        return self.request(Route('GET', 'v1/{page_id}/incidents/{incident_id}', page_id=page_id, incident_id=incident_id), timeout=timeout)
 
-    def get_all_incidents(self, page_id):
+    def get_all_incidents(self, page_id, *, timeout=MISSING):
         """
         Get all incidents from the instatus api
         """
-        return self.request(Route('GET', f"v1/{page_id}/incidents"))
+        return self.request(Route('GET', 'v1/{page_id}/incidents', page_id=page_id), timeout=timeout)
+
+    def iter_incidents(self, page_id, *, timeout=MISSING):
+        """
+        Iterate over all incidents from the instatus api while they are read
+        """
+        return self.stream(Route('GET', 'v1/{page_id}/incidents', page_id=page_id), timeout=timeout)
+
+    def paginate_incidents(self, page_id, **options):
+        """
+        Walk through the incidents from the instatus api page by page
+        """
+        return Paginator(self, Route('GET', 'v1/{page_id}/incidents', page_id=page_id), **options)
 
-    def add_incident(self, page_id, data):
+    def add_incident(self, page_id, data, *, timeout=MISSING):
         """
         Add incident from the instatus api
         """
-        return self.request(Route('POST', f"v1/{page_id}/incidents"), json=data)
+        return self.request(Route('POST', 'v1/{page_id}/incidents', page_id=page_id), json=data, timeout=timeout)
 
-    def update_incident(self, page_id, incident_id, data):
+    def update_incident(self, page_id, incident_id, data, *, timeout=MISSING):
         """
         Update incident from the instatus api
         """
-        return self.request(Route('PUT', f"v1/{page_id}/incidents/{incident_id}"), json=data)
+        return self.request(Route('PUT', 'v1/{page_id}/incidents/{incident_id}', page_id=page_id, incident_id=incident_id), json=data, timeout=timeout)
 
-    def delete_incident(self, page_id, incident_id):
+    def delete_incident(self, page_id, incident_id, *, timeout=MISSING):
         """
         Delete incident from the instatus api
         """
-        return self.request(Route('DELETE', f"v1/{page_id}/incidents/{incident_id}"))
+        return self.request(Route('DELETE', 'v1/{page_id}/incidents/{incident_id}', page_id=page_id, incident_id=incident_id), timeout=timeout)
 
     # Incident update requests
 
-    def get_incident_update(self, page_id, incident_id, incident_update_id):
+    def get_incident_update(self, page_id, incident_id, incident_update_id, *, timeout=MISSING):
         """
         Get an incident update from the instatus api
         """
-        return self.request(Route('GET', f"v1/{page_id}/incidents/{incident_id}/incident-updates/{incident_update_id}"))
+        return self.request(Route('GET', 'v1/{page_id}/incidents/{incident_id}/incident-updates/{incident_update_id}', page_id=page_id, incident_id=incident_id, incident_update_id=incident_update_id), timeout=timeout)
 
-    def add_incident_update(self, page_id, incident_id, data):
+    def add_incident_update(self, page_id, incident_id, data, *, timeout=MISSING):
         """
         Add an incident update from the instatus api
         """
-        return self.request(Route('POST', f"v1/{page_id}/incidents/{incident_id}/incident-updates"), json=data)
+        return self.request(Route('POST', 'v1/{page_id}/incidents/{incident_id}/incident-updates', page_id=page_id, incident_id=incident_id), json=data, timeout=timeout)
 
-    def edit_incident_update(self, page_id, incident_id, incident_update_id, data):
+    def edit_incident_update(self, page_id, incident_id, incident_update_id, data, *, timeout=MISSING):
         """
         Update a incident update from the instatus api
         """
-        return self.request(Route('PUT', f"v1/{page_id}/incidents/{incident_id}/incident-updates/{incident_update_id}"), json=data)
+        return self.request(Route('PUT', 'v1/{page_id}/incidents/{incident_id}/incident-updates/{incident_update_id}', page_id=page_id, incident_id=incident_id, incident_update_id=incident_update_id), json=data, timeout=timeout)
 
-    def delete_incident_update(self, page_id, incident_id, incident_update_id):
+    def delete_incident_update(self, page_id, incident_id, incident_update_id, *, timeout=MISSING):
         """
         Delete an incident update from the instatus api
         """
-        return self.request(Route('DELETE', f"v1/{page_id}/incidents/{incident_id}/incident-updates/{incident_update_id}"))
+        return self.request(Route('DELETE', 'v1/{page_id}/incidents/{incident_id}/incident-updates/{incident_update_id}', page_id=page_id, incident_id=incident_id, incident_update_id=incident_update_id), timeout=timeout)
 
     # Maintenances
 
-    def get_maintenance(self, page_id, maintenance_id):
+    def get_maintenance(self, page_id, maintenance_id, *, timeout=MISSING):
         """
         Get a maintenance from the instatus api
         """
-        return self.request(Route('GET', f"v1/{page_id}/maintenances/{maintenance_id}"))
+        return self.request(Route('GET', 'v1/{page_id}/maintenances/{maintenance_id}', page_id=page_id, maintenance_id=maintenance_id), timeout=timeout)
 
-    def get_all_maintenances(self, page_id):
+    def get_all_maintenances(self, page_id, *, timeout=MISSING):
         """
         Get all maintenances from the instatus api
         """
-        return self.request(Route('GET', f"v1/{page_id}/maintenances"))
+        return self.request(Route('GET', 'v1/{page_id}/maintenances', page_id=page_id), timeout=timeout)
 
-    def add_maintenance(self, page_id, data):
+    def iter_maintenances(self, page_id, *, timeout=MISSING):
+        """
+        Iterate over all maintenances from the instatus api while they are read
+        """
+        return self.stream(Route('GET', 'v1/{page_id}/maintenances', page_id=page_id), timeout=timeout)
+
+    def paginate_maintenances(self, page_id, **options):
+        """
+        Walk through the maintenances from the instatus api page by page
+        """
+        return Paginator(self, Route('GET', 'v1/{page_id}/maintenances', page_id=page_id), **options)
+
+    def add_maintenance(self, page_id, data, *, timeout=MISSING):
         """
         Add a maintenance from the instatus api
         """
-        return self.request(Route('POST', f"v1/{page_id}/maintenances"), json=data)
+        return self.request(Route('POST', 'v1/{page_id}/maintenances', page_id=page_id), json=data, timeout=timeout)
 
-    def update_maintenance(self, page_id, maintenance_id, data):
+    def update_maintenance(self, page_id, maintenance_id, data, *, timeout=MISSING):
         """
         Update a maintenance from the instatus api
         """
-        return self.request(Route('PUT', f"v1/{page_id}/maintenances/{maintenance_id}"), json=data)
+        return self.request(Route('PUT', 'v1/{page_id}/maintenances/{maintenance_id}', page_id=page_id, maintenance_id=maintenance_id), json=data, timeout=timeout)
 
-    def delete_maintenance(self, page_id, maintenance_id):
+    def delete_maintenance(self, page_id, maintenance_id, *, timeout=MISSING):
         """
         Delete a maintenance from the instatus api
         """
-        return self.request(Route('DELETE', f"v1/{page_id}/maintenances/{maintenance_id}"))
+        return self.request(Route('DELETE', 'v1/{page_id}/maintenances/{maintenance_id}', page_id=page_id, maintenance_id=maintenance_id), timeout=timeout)
 
     # Maintenances update
 
-    def get_maintenance_update(self, page_id, maintenance_id, maintenance_update_id):
+    def get_maintenance_update(self, page_id, maintenance_id, maintenance_update_id, *, timeout=MISSING):
         """
         Get a maintenance update from the instatus api
         """
-        return self.request(Route('GET', f"v1/{page_id}/maintenances/{maintenance_id}/maintenance-updates/{maintenance_update_id}"))
+        return self.request(Route('GET', 'v1/{page_id}/maintenances/{maintenance_id}/maintenance-updates/{maintenance_update_id}', page_id=page_id, maintenance_id=maintenance_id, maintenance_update_id=maintenance_update_id), timeout=timeout)
 
-    def add_maintenance_update(self, page_id, maintenance_id, data):
+    def add_maintenance_update(self, page_id, maintenance_id, data, *, timeout=MISSING):
         """
         Create a maintenance update from the instatus api
         """
-        return self.request(Route('POST', f"v1/{page_id}/maintenances/{maintenance_id}/maintenance-updates"), json=data)
+        return self.request(Route('POST', 'v1/{page_id}/maintenances/{maintenance_id}/maintenance-updates', page_id=page_id, maintenance_id=maintenance_id), json=data, timeout=timeout)
 
-    def edit_maintenance_update(self, page_id, maintenance_id, maintenance_update_id, data):
+    def edit_maintenance_update(self, page_id, maintenance_id, maintenance_update_id, data, *, timeout=MISSING):
         """
         Update a maintenance update from the instatus api
         """
-        return self.request(Route('PUT', f"v1/{page_id}/maintenances/{maintenance_id}/maintenance-updates/{maintenance_update_id}"), json=data)
+        return self.request(Route('PUT', 'v1/{page_id}/maintenances/{maintenance_id}/maintenance-updates/{maintenance_update_id}', page_id=page_id, maintenance_id=maintenance_id, maintenance_update_id=maintenance_update_id), json=data, timeout=timeout)
 
-    def delete_maintenance_update(self, page_id, maintenance_id, maintenance_update_id):
+    def delete_maintenance_update(self, page_id, maintenance_id, maintenance_update_id, *, timeout=MISSING):
         """
         Delete a maintenance update from the instatus api
         """
-        return self.request(Route('DELETE', f"v1/{page_id}/maintenances/{maintenance_id}/maintenance-updates/{maintenance_update_id}"))
+        return self.request(Route('DELETE', 'v1/{page_id}/maintenances/{maintenance_id}/maintenance-updates/{maintenance_update_id}', page_id=page_id, maintenance_id=maintenance_id, maintenance_update_id=maintenance_update_id), timeout=timeout)
 
     # Teammate requests
 
-    def get_teammates(self, page_id):
+    def get_teammates(self, page_id, *, timeout=MISSING):
         """
         Get teammate from the instatus api
         """
-        return self.request(Route('GET', f"v1/{page_id}/team"))
+        return self.request(Route('GET', 'v1/{page_id}/team', page_id=page_id), timeout=timeout)
 
-    def add_teammate(self, page_id, data):
+    def iter_teammates(self, page_id, *, timeout=MISSING):
+        """
+        Iterate over all teammates from the instatus api while they are read
+        """
+        return self.stream(Route('GET', 'v1/{page_id}/team', page_id=page_id), timeout=timeout)
+
+    def add_teammate(self, page_id, data, *, timeout=MISSING):
         """
         Add a teammate from the instatus api
         """
-        return self.request(Route('POST', f"v1/{page_id}/team"), json=data)
+        return self.request(Route('POST', 'v1/{page_id}/team', page_id=page_id), json=data, timeout=timeout)
 
-    def delete_teammate(self, page_id, member_id):
+    def delete_teammate(self, page_id, member_id, *, timeout=MISSING):
         """
         Delete a Teammate from the instatus api
         """
-        return self.request(Route('DELETE', f"v1/{page_id}/team/{member_id}"))
+        return self.request(Route('DELETE', 'v1/{page_id}/team/{member_id}', page_id=page_id, member_id=member_id), timeout=timeout)
+
+    # Metric requests
+
+    def get_metrics(self, page_id, *, timeout=MISSING):
+        """
+        Get all metrics from the instatus api
+        """
+        return self.request(Route('GET', 'v1/{page_id}/metrics', page_id=page_id), timeout=timeout)
+
+    def add_metric(self, page_id, data, *, timeout=MISSING):
+        """
+        Add a metric from the instatus api
+        """
+        return self.request(Route('POST', 'v1/{page_id}/metrics', page_id=page_id), json=data, timeout=timeout)
+
+    def update_metric(self, page_id, metric_id, data, *, timeout=MISSING):
+        """
+        Update a metric from the instatus api
+        """
+        return self.request(Route('PUT', 'v1/{page_id}/metrics/{metric_id}', page_id=page_id, metric_id=metric_id), json=data, timeout=timeout)
+
+    def delete_metric(self, page_id, metric_id, *, timeout=MISSING):
+        """
+        Delete a metric from the instatus api
+        """
+        return self.request(Route('DELETE', 'v1/{page_id}/metrics/{metric_id}', page_id=page_id, metric_id=metric_id), timeout=timeout)
+
+    def add_datapoint(self, page_id, metric_id, data, *, timeout=MISSING):
+        """
+        Add a data point (``{'timestamp': <unix seconds>, 'value': <number>}``) to a metric from the instatus api
+        """
+        return self.request(Route('POST', 'v1/{page_id}/metrics/{metric_id}', page_id=page_id, metric_id=metric_id), json=data, timeout=timeout)
+
+    def add_datapoints(self, page_id, metric_id, datapoints, *, timeout=MISSING, retry_policy=None):
+        """
+        Add many data points to a metric with one request from the instatus api
+        """
+        return self.request(Route('POST', 'v1/{page_id}/metrics/{metric_id}', page_id=page_id, metric_id=metric_id), json={'data': datapoints}, timeout=timeout, retry_policy=retry_policy)
+
+    def delete_datapoint(self, page_id, metric_id, timestamp, *, timeout=MISSING):
+        """
+        Delete the data point at ``timestamp`` of a metric from the instatus api
+        """
+        return self.request(Route('DELETE', 'v1/{page_id}/metrics/{metric_id}/{timestamp}', page_id=page_id, metric_id=metric_id, timestamp=timestamp), timeout=timeout)
+
+    # Subscriber requests
+
+    def get_subscribers(self, page_id, *, timeout=MISSING):
+        """
+        Get subscribers from the instatus api
+        """
+        return self.request(Route('GET', 'v1/{page_id}/subscribers', page_id=page_id), timeout=timeout)
+
+    def paginate_subscribers(self, page_id, **options):
+        """
+        Walk through the subscribers from the instatus api page by page
+        """
+        return Paginator(self, Route('GET', 'v1/{page_id}/subscribers', page_id=page_id), **options)
+
+    def delete_subscriber(self, page_id, subscriber_id, *, timeout=MISSING):
+        """
+        Delete a subscriber from the instatus api
+        """
+        return self.request(Route('DELETE', 'v1/{page_id}/subscribers/{subscriber_id}', page_id=page_id, subscriber_id=subscriber_id), timeout=timeout)
@@ -0,0 +1,469 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import time
+import asyncio
+import datetime
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, Union, TYPE_CHECKING
+
+from .errors import HTTPException
+from .metrics import Histogram
+from .retry import RetryPolicy
+from .utils import MISSING
+
+if TYPE_CHECKING:
+    from .client import StatusClient
+
+log = logging.getLogger(__name__)
+
+__all__ = ('DatapointWriter',)
+
+# each attempt of a batch is sent once, the writer does the retrying
+_SINGLE_TRY = RetryPolicy(1)
+
+Timestamp = Union[datetime.datetime, float, int]
+
+
+def _timestamp(value: Optional[Timestamp]) -> Optional[float]:
+    # unix seconds; None is stamped once the point is queued
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value.timestamp()
+    return value
+
+
+class _Batch:
+    # the queued points of one metric
+    __slots__ = ('points', 'first', 'sending', 'last_sent')
+
+    def __init__(self):
+        self.points: List[Tuple[float, float]] = []
+        # the loop.time() the oldest queued point arrived at
+        self.first = 0.0
+        self.sending = False
+        self.last_sent = float('-inf')
+
+
+class DatapointWriter:
+    """Buffers metric data points and sends them in batches, one request per metric
+    and batch instead of one per point.
+
+    :meth:`write` takes points from any thread, :meth:`put` from coroutines on the
+    loop of the client. The points are queued per metric and sent once a metric has
+    ``max_batch`` of them or its oldest one waited ``max_age`` seconds. A metric has at
+    most one batch in flight, and each batch is sorted by timestamp, so the points of a
+    metric reach the api in order (a point older than what was already sent is counted
+    as ``late`` and sent anyway). :meth:`close` sends everything still queued; the client
+    closes its writers when it is closed.
+
+    At most ``max_pending`` points are held, queued or in flight. When that is reached,
+    ``overflow`` decides:
+
+    - ``'block'``: :meth:`put` waits for room, :meth:`write` blocks its thread until
+      there is room (or ``timeout`` passed). On the loop's thread, where blocking would
+      stall the sending, :meth:`write` drops the point instead.
+    - ``'drop_newest'``: the new point is dropped.
+    - ``'drop_oldest'``: the oldest queued point of the metric waiting the longest is dropped.
+
+    Dropped points are counted, see :meth:`stats`. A :meth:`write` or :meth:`put` still
+    waiting for room when the writer is closed returns ``False``.
+
+    A batch that failed with a server error, a ``429``, a timeout or a connection error
+    is sent again as ``retry_policy`` allows, while its points keep their room; only the
+    points of a batch that failed for good count as ``failed``. ::
+
+        writer = client.datapoint_writer(max_batch=500, max_age=2.0)
+        writer.write(page_id, metric_id, 12.5)  # from any thread
+        await writer.put(page_id, metric_id, 13.0, timestamp=time.time())
+
+    Parameters
+    -----------
+    client: :class:`StatusClient`
+        The client to send the batches with.
+    max_batch: :class:`int`
+        The most points sent in one request.
+    max_age: :class:`float`
+        The seconds a point waits at most before its batch is sent.
+    max_pending: :class:`int`
+        The most points held at once.
+    overflow: :class:`str`
+        What happens to new points while ``max_pending`` points are held; see above.
+    concurrency: :class:`int`
+        The most batches of different metrics sent at once.
+    timeout: Optional[:class:`float`]
+        The deadline of each attempt to send a batch, the timeout of the route by default.
+    retry_policy: Optional[:class:`~instatus.retry.RetryPolicy`]
+        Decides how often and after how long a failed batch is sent again, the policy
+        of the client by default. Retries also take from the client's retry budget.
+
+    Attributes
+    -----------
+    latency: :class:`~instatus.metrics.Histogram`
+        The seconds from the arrival of the oldest point of a batch until the api
+        accepted the batch.
+    """
+
+    OVERFLOW_POLICIES = ('block', 'drop_newest', 'drop_oldest')
+
+    def __init__(self,
+                 client: 'StatusClient',
+                 *,
+                 max_batch: int = 1000,
+                 max_age: float = 1.0,
+                 max_pending: int = 100000,
+                 overflow: str = 'block',
+                 concurrency: int = 4,
+                 timeout: Optional[float] = MISSING,
+                 retry_policy: Optional[RetryPolicy] = None):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError('overflow must be one of %s, not %r' % (', '.join(self.OVERFLOW_POLICIES), overflow))
+        self.client = client
+        self.loop: asyncio.AbstractEventLoop = client.loop
+        self.max_batch = max_batch
+        self.max_age = max_age
+        self.max_pending = max_pending
+        self.overflow = overflow
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retry_policy: RetryPolicy = retry_policy or client._http.retry_policy
+        self.latency = Histogram()
+
+        self._lock = threading.Lock()
+        # threads waiting for room
+        self._room = threading.Condition(self._lock)
+        # coroutines waiting for room
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._batches: Dict[Tuple[str, str], _Batch] = {}
+        self._pending = 0
+        self._closed = False
+        self._started = False
+        # whether starting the flusher was scheduled already
+        self._scheduled = False
+        # whether the flusher sleeps without a deadline and has to be woken for a new point
+        self._idle = True
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._sending: Set[asyncio.Task] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._created = time.monotonic()
+
+        self.received = 0
+        self.accepted = 0
+        self.dropped = 0
+        self.late = 0
+        self.flushed = 0
+        self.failed = 0
+        self.retried = 0
+        self.batches = 0
+
+    def __repr__(self):
+        return '<DatapointWriter pending={0._pending} flushed={0.flushed} dropped={0.dropped}>'.format(self)
+
+    async def __aenter__(self) -> 'DatapointWriter':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def pending(self) -> int:
+        """:class:`int`: The points queued or in flight."""
+        return self._pending
+
+    def _on_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    # Adding points; all of these run with the lock held
+
+    def _add(self, key: Tuple[str, str], point: Tuple[Optional[float], float]) -> Optional[bool]:
+        # True if the point was queued, False if it was dropped, None if it has to wait for room
+        if self._closed:
+            raise RuntimeError('The DatapointWriter is closed')
+        if self._pending >= self.max_pending:
+            if self.overflow == 'block':
+                return None
+            if self.overflow == 'drop_newest' or not self._drop_oldest():
+                self.dropped += 1
+                return False
+
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _Batch()
+        points = batch.points
+        if point[0] is None:
+            # stamped with the lock held, so the points of concurrent writers are in order
+            point = (time.time(), point[1])
+        points.append(point)
+        self._pending += 1
+        self.accepted += 1
+        if len(points) == 1:
+            batch.first = time.monotonic()
+            # the flusher has to learn of the new deadline
+            wake = self._idle
+            self._idle = False
+        else:
+            wake = len(points) == self.max_batch
+        if wake or not self._scheduled:
+            self._scheduled = True
+            self._wake()
+        return True
+
+    def _drop_oldest(self) -> bool:
+        oldest = None
+        for batch in self._batches.values():
+            if batch.points and (oldest is None or batch.first < oldest.first):
+                oldest = batch
+        if oldest is None:
+            # everything held is in flight
+            return False
+        del oldest.points[0]
+        self._pending -= 1
+        self.dropped += 1
+        return True
+
+    def _wake(self):
+        if self._on_loop():
+            self._start_or_set()
+        else:
+            self.loop.call_soon_threadsafe(self._start_or_set)
+
+    def _start_or_set(self):
+        if not self._started:
+            self._started = True
+            self._wakeup = asyncio.Event()
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._flusher = self.loop.create_task(self._run())
+        self._wakeup.set()
+
+    def write(self, page_id: str, metric_id: str, value: float, timestamp: Optional[Timestamp] = None, *,
+              timeout: Optional[float] = None) -> bool:
+        """Queues a point from any thread and returns whether it was queued or dropped.
+
+        ``timestamp`` is a datetime or unix seconds, the current time by default.
+        With the ``'block'`` policy, ``timeout`` limits how long the thread waits for room.
+        """
+        point = (_timestamp(timestamp), value)
+        key = (page_id, metric_id)
+        with self._lock:
+            self.received += 1
+            added = self._add(key, point)
+            if added is None:
+                if self._on_loop() or not self._room.wait_for(lambda: self._pending < self.max_pending or self._closed,
+                                                               timeout) or self._closed:
+                    self.dropped += 1
+                    return False
+                added = self._add(key, point)
+            return bool(added)
+
+    async def put(self, page_id: str, metric_id: str, value: float, timestamp: Optional[Timestamp] = None) -> bool:
+        """Queues a point from a coroutine on the client's loop, waiting for room with the ``'block'``
+        policy, and returns whether it was queued.
+        """
+        point = (_timestamp(timestamp), value)
+        key = (page_id, metric_id)
+        with self._lock:
+            self.received += 1
+            added = self._add(key, point)
+        while added is None:
+            with self._lock:
+                future = self.loop.create_future()
+                self._waiters.append(future)
+            await future
+            with self._lock:
+                if self._closed:
+                    self.dropped += 1
+                    return False
+                added = self._add(key, point)
+        return added
+
+    def _release(self, count: int):
+        # frees the room of sent or failed points; runs on the loop
+        with self._lock:
+            self._pending -= count
+            self._room.notify_all()
+            waiters = list(self._waiters)
+            self._waiters.clear()
+        for future in waiters:
+            if not future.done():
+                future.set_result(None)
+
+    # Sending
+
+    def _take_due(self, force: bool) -> Optional[float]:
+        # starts sending the batches that are full or old enough (or all with ``force``)
+        # and returns the seconds until the next one is due
+        now = time.monotonic()
+        next_due = None
+        with self._lock:
+            for key, batch in self._batches.items():
+                if not batch.points or batch.sending:
+                    continue
+                due = batch.first + self.max_age
+                if force or len(batch.points) >= self.max_batch or due <= now:
+                    points = batch.points[:self.max_batch]
+                    del batch.points[:self.max_batch]
+                    batch.sending = True
+                    task = self.loop.create_task(self._send(key, batch, points, batch.first))
+                    self._sending.add(task)
+                    task.add_done_callback(self._sending.discard)
+                elif next_due is None or due < next_due:
+                    next_due = due
+            if next_due is None and not self._sending:
+                self._idle = True
+        return None if next_due is None else max(next_due - now, 0.0)
+
+    async def _send(self, key: Tuple[str, str], batch: _Batch, points: List[Tuple[float, float]], first: float):
+        page_id, metric_id = key
+        try:
+            # nearly always in order already, which sorts in linear time
+            points.sort(key=lambda point: point[0])
+            if points[0][0] < batch.last_sent:
+                self.late += sum(1 for point in points if point[0] < batch.last_sent)
+            data = [{'timestamp': timestamp, 'value': value} for timestamp, value in points]
+            await self._send_with_retries(page_id, metric_id, data)
+        except asyncio.CancelledError:
+            self.failed += len(points)
+            raise
+        except Exception as exc:
+            self.failed += len(points)
+            log.warning('Sending %d data points of metric %s failed: %r', len(points), metric_id, exc)
+        else:
+            self.flushed += len(points)
+            self.batches += 1
+            batch.last_sent = max(batch.last_sent, points[-1][0])
+            self.latency.observe(time.monotonic() - first)
+        finally:
+            batch.sending = False
+            self._release(len(points))
+            self._wakeup.set()
+
+    def _retry_delay(self, exc: Exception, tries: int) -> Optional[float]:
+        # the seconds to wait before sending a failed batch again, None if it failed for good
+        policy = self.retry_policy
+        if isinstance(exc, HTTPException):
+            retry = exc.status == 429 or policy.should_retry_status(exc.status)
+        else:
+            retry = policy.should_retry_exception(exc)
+        if not retry or not self.client._http._can_retry(policy, tries):
+            return None
+        return policy.delay(tries, getattr(exc, 'response', None))
+
+    async def _send_with_retries(self, page_id: str, metric_id: str, data: List[Dict[str, float]]):
+        http = self.client._http
+        tries = 0
+        while True:
+            try:
+                # the backoff between the attempts doesn't hold a slot of the concurrency
+                async with self._semaphore:
+                    await http.add_datapoints(page_id, metric_id, data, timeout=self.timeout,
+                                              retry_policy=_SINGLE_TRY)
+                return
+            except Exception as exc:
+                delay = self._retry_delay(exc, tries)
+                if delay is None:
+                    raise
+                log.info('Sending %d data points of metric %s failed: %r. Retrying in %.2f seconds.',
+                         len(data), metric_id, exc, delay)
+            self.retried += 1
+            tries += 1
+            await asyncio.sleep(delay)
+
+    async def _run(self):
+        wakeup = self._wakeup
+        while True:
+            delay = self._take_due(False)
+            try:
+                if delay is None:
+                    await wakeup.wait()
+                else:
+                    await asyncio.wait_for(wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+
+    async def flush(self):
+        """Sends every queued point now and waits until it is sent."""
+        if not self._started:
+            return
+        while True:
+            self._take_due(True)
+            if not self._sending:
+                with self._lock:
+                    if not any(batch.points for batch in self._batches.values()):
+                        return
+                continue
+            await asyncio.wait(set(self._sending))
+
+    async def close(self):
+        """Stops taking points and sends the queued ones."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._room.notify_all()
+        await self.flush()
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        for future in self._waiters:
+            if not future.done():
+                future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the counters of the writer.
+
+        ``received``, ``accepted``, ``dropped``, ``late``, ``flushed`` and ``failed`` points,
+        the ``batches`` sent, the batches ``retried``, the points ``pending`` now, the ``ingest_rate`` and
+        ``flush_rate`` in points per second since the writer was created, and the
+        ``latency_p50``/``latency_p99`` in seconds.
+        """
+        elapsed = max(time.monotonic() - self._created, 1e-9)
+        return {
+            'received': self.received,
+            'accepted': self.accepted,
+            'dropped': self.dropped,
+            'late': self.late,
+            'flushed': self.flushed,
+            'failed': self.failed,
+            'batches': self.batches,
+            'retried': self.retried,
+            'pending': self._pending,
+            'ingest_rate': self.accepted / elapsed,
+            'flush_rate': self.flushed / elapsed,
+            'latency_p50': self.latency.quantile(0.5),
+            'latency_p99': self.latency.quantile(0.99),
+        }
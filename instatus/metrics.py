@@ -0,0 +1,481 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import logging
+from bisect import bisect_left
+from collections import Counter
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+log = logging.getLogger(__name__)
+
+__all__ = (
+    'RequestInfo',
+    'Hooks',
+    'Histogram',
+    'RequestMetrics',
+    'OpenTelemetryMetrics',
+)
+
+Hook = Callable[..., Any]
+
+
+class RequestInfo:
+    """Describes one attempt of a request; passed to the hooks of :class:`HTTPClient`.
+
+    All durations are in seconds and measured with :func:`time.perf_counter`.
+
+    Attributes
+    -----------
+    method: :class:`str`
+        The HTTP method.
+    route: :class:`str`
+        The route template, e.g. ``v1/{page_id}/components``.
+    bucket: :class:`str`
+        The rate limit bucket of the request.
+    url: :class:`str`
+        The url the request is sent to.
+    attempt: :class:`int`
+        The number of the attempt, ``0`` for the first one.
+    status: Optional[:class:`int`]
+        The status of the response, once it was received.
+    error: Optional[:class:`BaseException`]
+        The exception the attempt ended with, if any.
+    global_wait: :class:`float`
+        The time spent waiting for a global rate limit to pass.
+    bucket_wait: :class:`float`
+        The time spent waiting for the budget of the bucket.
+    network: :class:`float`
+        The time from sending the request until the headers of the response arrived.
+    decode: :class:`float`
+        The time spent reading and decoding the body.
+    """
+
+    __slots__ = ('method', 'route', 'bucket', 'url', 'attempt', 'status', 'error',
+                 'global_wait', 'bucket_wait', 'network', 'decode', 'queued', 'sent', 'ended')
+
+    def __init__(self, method: str, route: str, bucket: str, url: str, attempt: int):
+        self.method = method
+        self.route = route
+        self.bucket = bucket
+        self.url = url
+        self.attempt = attempt
+        self.status: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        self.global_wait = 0.0
+        self.bucket_wait = 0.0
+        self.network = 0.0
+        self.decode = 0.0
+        self.queued = perf_counter()
+        self.sent: Optional[float] = None
+        self.ended: Optional[float] = None
+
+    def __repr__(self):
+        return '<RequestInfo method={0.method!r} route={0.route!r} attempt={0.attempt} status={0.status}>'.format(self)
+
+    @property
+    def wait(self) -> float:
+        """:class:`float`: The time spent waiting for the rate limits."""
+        return self.global_wait + self.bucket_wait
+
+    @property
+    def duration(self) -> float:
+        """:class:`float`: The time from sending the request until the attempt ended."""
+        if self.sent is None:
+            return 0.0
+        return (self.ended or perf_counter()) - self.sent
+
+    def _received(self, status: int):
+        self.status = status
+        self.network = perf_counter() - self.sent
+
+    def _decoded(self):
+        self.decode = perf_counter() - self.sent - self.network
+
+
+class Hooks:
+    """The callbacks of the request lifecycle events of a :class:`HTTPClient`.
+
+    Use :meth:`HTTPClient.add_hook` (or :meth:`StatusClient.add_hook`) rather than
+    creating this directly; a client without hooks does not measure anything.
+    The callbacks are called synchronously on the loop of the client, so they should
+    be quick. Exceptions raised by them are logged and otherwise ignored.
+
+    - ``on_request_start(info)``: the rate limits allow the attempt and it is about to be sent.
+    - ``on_request_end(info)``: the attempt is over, successful or not.
+    - ``on_ratelimited(info, retry_after, is_global)``: the server answered with a 429.
+    - ``on_retry(info, delay)``: the attempt is retried after ``delay`` seconds.
+    """
+
+    EVENTS = ('on_request_start', 'on_request_end', 'on_ratelimited', 'on_retry')
+
+    __slots__ = EVENTS
+
+    def __init__(self):
+        for event in self.EVENTS:
+            setattr(self, event, [])
+
+    def __repr__(self):
+        return '<Hooks %s>' % ' '.join('%s=%d' % (event, len(getattr(self, event))) for event in self.EVENTS)
+
+    def __bool__(self):
+        return any(getattr(self, event) for event in self.EVENTS)
+
+    def _callbacks(self, event: str) -> List[Hook]:
+        if event not in self.EVENTS:
+            raise ValueError('unknown hook %r, expected one of %s' % (event, ', '.join(self.EVENTS)))
+        return getattr(self, event)
+
+    def add(self, event: str, callback: Hook):
+        self._callbacks(event).append(callback)
+
+    def remove(self, event: str, callback: Hook):
+        try:
+            self._callbacks(event).remove(callback)
+        except ValueError:
+            pass
+
+    def emit(self, event: str, *args):
+        for callback in getattr(self, event):
+            try:
+                callback(*args)
+            except Exception:
+                log.exception('The %s hook %r raised an exception', event, callback)
+
+
+class Histogram:
+    """A histogram with fixed bucket bounds, like the ones of Prometheus.
+
+    Attributes
+    -----------
+    bounds: Tuple[:class:`float`, ...]
+        The upper bounds of the buckets; the last, implicit bucket is ``+Inf``.
+    counts: List[:class:`int`]
+        The observations per bucket (not cumulative).
+    sum: :class:`float`
+        The sum of all observations.
+    count: :class:`int`
+        The amount of observations.
+    """
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    #: The default bounds, in seconds.
+    DEFAULT_BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BOUNDS):
+        self.bounds = tuple(sorted(bounds))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def __repr__(self):
+        return '<Histogram count={0.count} sum={0.sum:.3f}>'.format(self)
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterator[Tuple[float, int]]:
+        """Yields the upper bound and the cumulative count of each bucket, ending with ``inf``."""
+        total = 0
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            total += count
+            yield bound, total
+
+    def quantile(self, q: float) -> float:
+        """Estimates the ``q`` quantile by interpolating inside its bucket, like ``histogram_quantile``."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        lower = 0.0
+        previous = 0
+        for bound, total in self.cumulative():
+            if total >= rank:
+                if bound == float('inf'):
+                    # nothing is known above the last bound
+                    return lower
+                in_bucket = total - previous
+                return lower + (bound - lower) * ((rank - previous) / in_bucket if in_bucket else 0.0)
+            lower, previous = bound, total
+        return lower
+
+
+class _RouteMetrics:
+    __slots__ = ('duration', 'wait', 'decode', 'statuses', 'errors', 'ratelimited', 'global_ratelimited', 'retries')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.duration = Histogram(bounds)
+        self.wait = Histogram(bounds)
+        self.decode = Histogram(bounds)
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.ratelimited = 0
+        self.global_ratelimited = 0
+        self.retries = 0
+
+
+class _MetricsHooks:
+    # the hooks a metrics backend registers on a client
+
+    _HOOKS = ('on_request_end', 'on_ratelimited', 'on_retry')
+
+    def install(self, client) -> '_MetricsHooks':
+        """Registers the hooks on a :class:`StatusClient` or :class:`HTTPClient` and returns itself."""
+        for event in self._HOOKS:
+            client.add_hook(event, getattr(self, event))
+        return self
+
+    def uninstall(self, client):
+        for event in self._HOOKS:
+            client.remove_hook(event, getattr(self, event))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RequestMetrics(_MetricsHooks):
+    """Collects latency histograms and counters per route template. ::
+
+        metrics = RequestMetrics().install(client)
+        ...
+        print(metrics.summary())
+
+    The metrics are kept per ``(method, route template)``, so all pages share one series
+    per endpoint:
+
+    - the duration of each attempt, from sending the request until it ended
+    - the time each attempt waited for the rate limits
+    - the time spent reading and decoding the body
+    - the responses per status and the failures per exception type
+    - the 429 responses (and how many of them were global) and the retries
+
+    :meth:`to_prometheus` renders them in the Prometheus text format and
+    :meth:`register_prometheus` exposes them through ``prometheus_client``.
+
+    Parameters
+    -----------
+    bounds: Sequence[:class:`float`]
+        The bucket bounds of the histograms, in seconds.
+    namespace: :class:`str`
+        The prefix of the exported metric names.
+    """
+
+    def __init__(self, bounds: Sequence[float] = Histogram.DEFAULT_BOUNDS, *, namespace: str = 'instatus'):
+        self.bounds = tuple(bounds)
+        self.namespace = namespace
+        self.routes: Dict[Tuple[str, str], _RouteMetrics] = {}
+
+    def __repr__(self):
+        return '<RequestMetrics routes=%d>' % len(self.routes)
+
+    def _route(self, info: RequestInfo) -> _RouteMetrics:
+        key = (info.method, info.route)
+        try:
+            return self.routes[key]
+        except KeyError:
+            metrics = self.routes[key] = _RouteMetrics(self.bounds)
+            return metrics
+
+    def on_request_end(self, info: RequestInfo):
+        metrics = self._route(info)
+        metrics.wait.observe(info.wait)
+        if info.sent is not None:
+            metrics.duration.observe(info.duration)
+        if info.status is not None:
+            metrics.statuses[info.status] += 1
+            metrics.decode.observe(info.decode)
+        if info.error is not None:
+            metrics.errors[type(info.error).__name__] += 1
+
+    def on_ratelimited(self, info: RequestInfo, retry_after: float, is_global: bool):
+        metrics = self._route(info)
+        metrics.ratelimited += 1
+        if is_global:
+            metrics.global_ratelimited += 1
+
+    def on_retry(self, info: RequestInfo, delay: float):
+        self._route(info).retries += 1
+
+    def reset(self):
+        self.routes.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the counts and the p50/p99 estimates per ``'METHOD route'``."""
+        result = {}
+        for (method, route), metrics in sorted(self.routes.items()):
+            result['%s %s' % (method, route)] = {
+                'requests': metrics.duration.count,
+                'statuses': dict(metrics.statuses),
+                'errors': dict(metrics.errors),
+                'ratelimited': metrics.ratelimited,
+                'retries': metrics.retries,
+                'p50': metrics.duration.quantile(0.5),
+                'p99': metrics.duration.quantile(0.99),
+                'wait_p99': metrics.wait.quantile(0.99),
+            }
+        return result
+
+    def to_prometheus(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format."""
+        ns = self.namespace
+        lines = []
+
+        def histogram(name: str, documentation: str, attribute: str):
+            lines.append('# HELP %s_%s %s' % (ns, name, documentation))
+            lines.append('# TYPE %s_%s histogram' % (ns, name))
+            for (method, route), metrics in sorted(self.routes.items()):
+                labels = 'method="%s",route="%s"' % (_escape(method), _escape(route))
+                hist = getattr(metrics, attribute)
+                for bound, total in hist.cumulative():
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append('%s_%s_bucket{%s,le="%s"} %d' % (ns, name, labels, le, total))
+                lines.append('%s_%s_sum{%s} %r' % (ns, name, labels, hist.sum))
+                lines.append('%s_%s_count{%s} %d' % (ns, name, labels, hist.count))
+
+        def counter(name: str, documentation: str, samples):
+            lines.append('# HELP %s_%s %s' % (ns, name, documentation))
+            lines.append('# TYPE %s_%s counter' % (ns, name))
+            for labels, value in samples:
+                lines.append('%s_%s{%s} %d' % (ns, name, ','.join('%s="%s"' % (k, _escape(str(v))) for k, v in labels),
+                                              value))
+
+        histogram('request_duration_seconds', 'The duration of the attempts of a request.', 'duration')
+        histogram('ratelimit_wait_seconds', 'The time the attempts waited for the rate limits.', 'wait')
+        histogram('decode_seconds', 'The time spent reading and decoding response bodies.', 'decode')
+        items = sorted(self.routes.items())
+        counter('responses_total', 'The responses per status.',
+                [((('method', m), ('route', r), ('status', s)), c)
+                 for (m, r), metrics in items for s, c in sorted(metrics.statuses.items())])
+        counter('errors_total', 'The attempts that failed without a response.',
+                [((('method', m), ('route', r), ('error', e)), c)
+                 for (m, r), metrics in items for e, c in sorted(metrics.errors.items())])
+        counter('ratelimited_total', 'The responses with status 429.',
+                [((('method', m), ('route', r), ('global', g)), c)
+                 for (m, r), metrics in items
+                 for g, c in (('false', metrics.ratelimited - metrics.global_ratelimited),
+                              ('true', metrics.global_ratelimited)) if c])
+        counter('retries_total', 'The retried attempts.',
+                [((('method', m), ('route', r)), metrics.retries) for (m, r), metrics in items if metrics.retries])
+        return '\n'.join(lines) + '\n'
+
+    def register_prometheus(self, registry=None):
+        """Exposes the metrics through the collector registry of ``prometheus_client``
+        (the default registry if ``registry`` is ``None``) and returns the collector.
+        """
+        from prometheus_client import REGISTRY
+        from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily
+
+        metrics = self
+        ns = self.namespace
+
+        class Collector:
+            def collect(self):
+                items = sorted(metrics.routes.items())
+                for name, documentation, attribute in (
+                        ('request_duration_seconds', 'The duration of the attempts of a request.', 'duration'),
+                        ('ratelimit_wait_seconds', 'The time the attempts waited for the rate limits.', 'wait'),
+                        ('decode_seconds', 'The time spent reading and decoding response bodies.', 'decode')):
+                    family = HistogramMetricFamily('%s_%s' % (ns, name), documentation, labels=('method', 'route'))
+                    for (method, route), route_metrics in items:
+                        hist = getattr(route_metrics, attribute)
+                        buckets = [('+Inf' if bound == float('inf') else repr(bound), total)
+                                   for bound, total in hist.cumulative()]
+                        family.add_metric((method, route), buckets, hist.sum)
+                    yield family
+
+                responses = CounterMetricFamily('%s_responses' % ns, 'The responses per status.',
+                                                labels=('method', 'route', 'status'))
+                ratelimited = CounterMetricFamily('%s_ratelimited' % ns, 'The responses with status 429.',
+                                                  labels=('method', 'route'))
+                retries = CounterMetricFamily('%s_retries' % ns, 'The retried attempts.', labels=('method', 'route'))
+                for (method, route), route_metrics in items:
+                    for status, count in route_metrics.statuses.items():
+                        responses.add_metric((method, route, str(status)), count)
+                    ratelimited.add_metric((method, route), route_metrics.ratelimited)
+                    retries.add_metric((method, route), route_metrics.retries)
+                yield responses
+                yield ratelimited
+                yield retries
+
+        collector = Collector()
+        (registry or REGISTRY).register(collector)
+        return collector
+
+
+class OpenTelemetryMetrics(_MetricsHooks):
+    """Records the request metrics with OpenTelemetry instruments. ::
+
+        OpenTelemetryMetrics().install(client)
+
+    Requires ``opentelemetry-api``; without a configured ``MeterProvider`` the
+    measurements are dropped by OpenTelemetry itself.
+
+    Parameters
+    -----------
+    meter: Optional[``opentelemetry.metrics.Meter``]
+        The meter to create the instruments with; defaults to the meter of this module.
+    namespace: :class:`str`
+        The prefix of the instrument names.
+    """
+
+    def __init__(self, meter=None, *, namespace: str = 'instatus'):
+        if meter is None:
+            from opentelemetry import metrics
+            meter = metrics.get_meter(__name__)
+        self.meter = meter
+        self._duration = meter.create_histogram(namespace + '.request.duration', unit='s',
+                                                description='The duration of the attempts of a request.')
+        self._wait = meter.create_histogram(namespace + '.ratelimit.wait', unit='s',
+                                            description='The time the attempts waited for the rate limits.')
+        self._responses = meter.create_counter(namespace + '.responses', description='The responses per status.')
+        self._errors = meter.create_counter(namespace + '.errors',
+                                            description='The attempts that failed without a response.')
+        self._ratelimited = meter.create_counter(namespace + '.ratelimited',
+                                                 description='The responses with status 429.')
+        self._retries = meter.create_counter(namespace + '.retries', description='The retried attempts.')
+
+    @staticmethod
+    def _attributes(info: RequestInfo) -> Dict[str, Any]:
+        return {'http.request.method': info.method, 'instatus.route': info.route}
+
+    def on_request_end(self, info: RequestInfo):
+        attributes = self._attributes(info)
+        self._wait.record(info.wait, attributes)
+        if info.sent is not None:
+            self._duration.record(info.duration, attributes)
+        if info.status is not None:
+            self._responses.add(1, dict(attributes, **{'http.response.status_code': info.status}))
+        if info.error is not None:
+            self._errors.add(1, dict(attributes, **{'error.type': type(info.error).__name__}))
+
+    def on_ratelimited(self, info: RequestInfo, retry_after: float, is_global: bool):
+        self._ratelimited.add(1, dict(self._attributes(info), **{'instatus.global': is_global}))
+
+    def on_retry(self, info: RequestInfo, delay: float):
+        self._retries.add(1, self._attributes(info))
@@ -24,114 +24,676 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 DEALINGS IN THE SOFTWARE.
 """
 
-class StatusPager:
-    def __init__(self, *args):
-        ...
-
-    async def update(self, *args):
-        ...
-
-    async def delete(self, *args):
-        ...
-
-
-class Component:
-    def __init__(self, *args):
-        ...
-
-    async def update(self, *args):
-        ...
-
-    async def delete(self, *args):
-        ...
-
-
-class Incident:
-    def __init__(self, *args):
-        ...
-
-    async def update(self, *args):
-        ...
-
-    async def edit_update(self, *args):
-        ...
-
-    async def delete(self, *args):
-        ...
-
-
-class IncidentUpdate:
-    def __init__(self, *args):
-        ...
-
-    async def update(self, *args):
-        ...
-
-    async def delete(self, *args):
-        ...
-
-
-class Maintenance:
-    def __init__(self, *args):
-        ...
-
-    async def update(self, *args):
-        ...
-
-    async def edit_update(self, *args):
-        ...
-
-    async def delete(self, *args):
-        ...
-
-
-class MaintenanceUpdate:
-    def __init__(self, *args):
-        ...
-
-    async def update(self, *args):
-        ...
-
-    async def delete(self, *args):
-        ...
-
-
-class TeamMember:
-    def __init__(self, *args):
-        ...
-
-    async def delete(self, *args):
-        ...
-
-
-class Subscriber:
-    def __init__(self, *args):
-        ...
-
-    async def delete(self, *args):
-        ...
-
-
-class Metric:
-    def __init__(self, *args):
-        ...
-
-    async def update(self, *args):
-        ...
-
-    async def delete(self, *args):
-        ...
-
-    async def add_datapoint(self, *args):
-        ...
-
-    async def add_datapoints(self, *args):
-        ...
-
-    async def delete_datapoint(self, *args):
-        ...
-
-
-class UserProfile:
-    def __init__(self, *args):
-        ...
+import datetime
+import functools
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from .enums import Status, ComponentStatus, IncidentStatus, MaintenanceStatus
+from .utils import cached_slot_property, parse_time
+
+if TYPE_CHECKING:
+    from .client import StatusClient
+
+__all__ = (
+    'ModelSequence',
+    'StatusPager',
+    'Component',
+    'Incident',
+    'IncidentUpdate',
+    'Maintenance',
+    'MaintenanceUpdate',
+    'TeamMember',
+    'Subscriber',
+    'Metric',
+    'UserProfile',
+)
+
+
+class ModelSequence(Sequence):
+    """A read-only list of models, created from the raw payloads on first access.
+
+    Each element is built when it is first indexed or iterated over and then replaces
+    its payload, so a list that is only partly looked at never builds the rest.
+    The sequence keeps its own copy of the list, the payload it came from is not changed.
+    """
+
+    __slots__ = ('_items', '_factory')
+
+    def __init__(self, items, factory: Callable[[Dict[str, Any]], Any]):
+        self._items: List[Any] = list(items)
+        self._factory = factory
+
+    def __repr__(self):
+        return '<ModelSequence len=%d>' % len(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+        item = self._items[index]
+        if type(item) is dict:
+            item = self._items[index] = self._factory(item)
+        return item
+
+    def __iter__(self) -> Iterator[Any]:
+        items = self._items
+        factory = self._factory
+        for index, item in enumerate(items):
+            if type(item) is dict:
+                item = items[index] = factory(item)
+            yield item
+
+    def __eq__(self, other):
+        if isinstance(other, ModelSequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def get(self, id: str) -> Optional[Any]:
+        """Returns the element with the id ``id``, if there is one."""
+        for index, item in enumerate(self._items):
+            if (item.get('id') if type(item) is dict else item.id) == id:
+                return self[index]
+        return None
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Returns the payloads of the elements."""
+        return [item if type(item) is dict else item.to_dict() for item in self._items]
+
+
+class _Model:
+    # The fields of the payload are copied into slots, all other keys are kept in
+    # ``_extra`` (``None`` if there are none), so no per object ``__dict__`` exists.
+    # Timestamps and nested lists stay raw until their property is first used;
+    # statuses are mapped to their enum value right away, which replaces a string
+    # per object with a shared one.
+
+    __slots__ = ('_state', '_page_id', '_extra')
+
+    #: (payload key, slot) of every known field.
+    _KEYS: Tuple[Tuple[str, str], ...] = ()
+    #: (slot, enum) of the fields holding an enum value.
+    _ENUMS: Tuple[Tuple[str, Any], ...] = ()
+    _KNOWN: FrozenSet[str] = frozenset()
+    #: The slot of every known field, by payload key.
+    _SLOTS: Dict[str, str] = {}
+    #: The slots of the cached properties, emptied when the object is updated in place.
+    _CACHED: Tuple[str, ...] = ()
+    _REPR: Tuple[str, ...] = ('id',)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._KNOWN = frozenset(key for key, _ in cls._KEYS)
+        cls._SLOTS = dict(cls._KEYS)
+        cls._CACHED = tuple(slot for klass in cls.__mro__ for slot in getattr(klass, '__slots__', ())
+                            if slot.startswith('_cs_'))
+
+    def __init__(self, data: Dict[str, Any], *, state: Optional['StatusClient'] = None, page_id: Optional[str] = None):
+        self._state = state
+        self._page_id = page_id
+        self._update(data)
+
+    def _update(self, data: Dict[str, Any]):
+        get = data.get
+        for key, slot in self._KEYS:
+            setattr(self, slot, get(key))
+        for slot, enum in self._ENUMS:
+            setattr(self, slot, enum.try_value(getattr(self, slot)))
+        if self._KNOWN.issuperset(data):
+            self._extra = None
+        else:
+            known = self._KNOWN
+            self._extra = {key: value for key, value in data.items() if key not in known}
+
+    def _merge(self, data: Dict[str, Any]):
+        # updates the object in place with the fields ``data`` has, keeping the others;
+        # used by the StateCache, so every response updates the one object of an id
+        for key, slot in self._KEYS:
+            if key in data:
+                setattr(self, slot, data[key])
+        for slot, enum in self._ENUMS:
+            setattr(self, slot, enum.try_value(getattr(self, slot)))
+        for slot in self._CACHED:
+            try:
+                delattr(self, slot)
+            except AttributeError:
+                pass
+        if not self._KNOWN.issuperset(data):
+            known = self._KNOWN
+            extra = self._extra or {}
+            extra.update((key, value) for key, value in data.items() if key not in known)
+            self._extra = extra
+
+    def __repr__(self):
+        return '<%s %s>' % (self.__class__.__name__, ' '.join('%s=%r' % (name, getattr(self, name)) for name in self._REPR))
+
+    def __eq__(self, other):
+        return isinstance(other, self.__class__) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    # the read-only mapping interface of the payload keeps code written against the
+    # dicts the client used to return working; json.dumps needs :meth:`to_dict` though
+
+    def __getitem__(self, key: str) -> Any:
+        slot = self._SLOTS.get(key)
+        if slot is None:
+            if self._extra is None:
+                raise KeyError(key)
+            return self._extra[key]
+        return self._raw(getattr(self, slot))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._SLOTS or (self._extra is not None and key in self._extra)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the payload value of ``key``, or ``default`` if the payload has no such key."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> List[str]:
+        """Returns the keys of the payload; the known fields are always included."""
+        keys = list(self._extra) if self._extra else []
+        keys.extend(self._SLOTS)
+        return keys
+
+    def values(self) -> List[Any]:
+        """Returns the values of the payload, in the order of :meth:`keys`."""
+        return list(self.to_dict().values())
+
+    def items(self) -> List[Tuple[str, Any]]:
+        """Returns the ``(key, value)`` pairs of the payload, in the order of :meth:`keys`."""
+        return list(self.to_dict().items())
+
+    @property
+    def page_id(self) -> Optional[str]:
+        """Optional[:class:`str`]: The id of the status page this belongs to."""
+        return self._page_id
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the payload this model represents, with ``None`` for the known fields it didn't have."""
+        data = dict(self._extra) if self._extra else {}
+        raw = self._raw
+        for key, slot in self._KEYS:
+            data[key] = raw(getattr(self, slot))
+        return data
+
+    @staticmethod
+    def _raw(value: Any) -> Any:
+        # the payload form of what a slot holds
+        if type(value) is tuple:
+            return [item.to_dict() for item in value]
+        if hasattr(value, '_actual_enum_cls_'):
+            return value.value
+        return value
+
+    def _require_state(self) -> 'StatusClient':
+        if self._state is None:
+            raise RuntimeError('%s was not created by a StatusClient' % self.__class__.__name__)
+        return self._state
+
+    def _nested(self, slot: str, model: type, **kwargs) -> Tuple[Any, ...]:
+        # nested lists are short, so they become a tuple of models in one go on first
+        # access, replacing the payloads; a ModelSequence would cost more than it saves
+        items = getattr(self, slot)
+        if type(items) is not tuple:
+            state = self._state
+            page_id = self._page_id
+            if state is not None:
+                # goes through the state cache of the client, if it has one
+                model = state._factory(model, page_id, **kwargs)
+            else:
+                model = functools.partial(model, state=state, page_id=page_id, **kwargs)
+            # some responses only list the ids of the related objects
+            items = tuple(model(item if type(item) is dict else {'id': item}) for item in items or ())
+            setattr(self, slot, items)
+        return items
+
+
+class StatusPager(_Model):
+    """A status page.
+
+    Attributes
+    -----------
+    id: :class:`str`
+        The id of the page.
+    subdomain: :class:`str`
+        The subdomain of the page on ``instatus.com``.
+    name: :class:`str`
+        The name of the page.
+    status: :class:`Status`
+        The overall status of the page.
+    """
+
+    __slots__ = ('id', 'subdomain', 'name', 'status', 'workspace_id', 'logo_url', 'favicon_url', 'website_url',
+                 'custom_domain', 'public_company_name', 'language', '_created_at', '_updated_at',
+                 '_cs_created_at', '_cs_updated_at')
+
+    _KEYS = (('id', 'id'), ('subdomain', 'subdomain'), ('name', 'name'), ('status', 'status'),
+             ('workspaceId', 'workspace_id'), ('logoUrl', 'logo_url'), ('faviconUrl', 'favicon_url'),
+             ('websiteUrl', 'website_url'), ('customDomain', 'custom_domain'),
+             ('publicCompanyName', 'public_company_name'), ('language', 'language'),
+             ('createdAt', '_created_at'), ('updatedAt', '_updated_at'))
+    _ENUMS = (('status', Status),)
+    _REPR = ('id', 'subdomain', 'status')
+
+    def __init__(self, data: Dict[str, Any], *, state: Optional['StatusClient'] = None, page_id: Optional[str] = None):
+        super().__init__(data, state=state, page_id=page_id or data.get('id'))
+
+    @cached_slot_property('_cs_created_at')
+    def created_at(self) -> Optional[datetime.datetime]:
+        return parse_time(self._created_at)
+
+    @cached_slot_property('_cs_updated_at')
+    def updated_at(self) -> Optional[datetime.datetime]:
+        return parse_time(self._updated_at)
+
+    async def update(self, **fields) -> 'StatusPager':
+        """Updates the page with the given fields of the API and returns the updated page."""
+        return await self._require_state().update_status_page(self.id, fields)
+
+    async def delete(self):
+        await self._require_state().delete_status_page(self.id)
+
+
+class Component(_Model):
+    """A component of a status page.
+
+    Attributes
+    -----------
+    id: :class:`str`
+        The id of the component.
+    name: :class:`str`
+        The name of the component.
+    description: Optional[:class:`str`]
+        The description of the component.
+    status: :class:`ComponentStatus`
+        The current status of the component.
+    order: Optional[:class:`int`]
+        The position of the component on the page.
+    """
+
+    __slots__ = ('id', 'name', 'description', 'status', 'order', 'show_uptime', 'group_id', 'is_parent',
+                 'is_collapsed', 'unique_email')
+
+    _KEYS = (('id', 'id'), ('name', 'name'), ('description', 'description'), ('status', 'status'),
+             ('order', 'order'), ('showUptime', 'show_uptime'), ('groupId', 'group_id'), ('isParent', 'is_parent'),
+             ('isCollapsed', 'is_collapsed'), ('uniqueEmail', 'unique_email'))
+    _ENUMS = (('status', ComponentStatus),)
+    _REPR = ('id', 'name', 'status')
+
+    async def update(self, **fields) -> 'Component':
+        """Updates the component with the given fields of the API and returns the updated component."""
+        return await self._require_state().update_component(self._page_id, self.id, fields)
+
+    async def delete(self):
+        await self._require_state().delete_component(self._page_id, self.id)
+
+
+class Incident(_Model):
+    """An incident on a status page.
+
+    Attributes
+    -----------
+    id: :class:`str`
+        The id of the incident.
+    name: :class:`str`
+        The name of the incident.
+    status: :class:`IncidentStatus`
+        The current status of the incident.
+    impact: Optional[:class:`str`]
+        How severe the incident is.
+    notify: Optional[:class:`bool`]
+        Whether the subscribers were notified.
+    """
+
+    __slots__ = ('id', 'name', 'status', 'impact', 'notify', '_started', '_resolved', '_created_at', '_updated_at',
+                 '_components', '_updates', '_cs_started_at', '_cs_resolved_at', '_cs_created_at', '_cs_updated_at')
+
+    _KEYS = (('id', 'id'), ('name', 'name'), ('status', 'status'), ('impact', 'impact'), ('notify', 'notify'),
+             ('started', '_started'), ('resolved', '_resolved'), ('createdAt', '_created_at'),
+             ('updatedAt', '_updated_at'), ('components', '_components'), ('incidentUpdates', '_updates'))
+    _ENUMS = (('status', IncidentStatus),)
+    _REPR = ('id', 'name', 'status')
+
+    @cached_slot_property('_cs_started_at')
+    def started_at(self) -> Optional[datetime.datetime]:
+        return parse_time(self._started)
+
+    @cached_slot_property('_cs_resolved_at')
+    def resolved_at(self) -> Optional[datetime.datetime]:
+        return parse_time(self._resolved)
+
+    @cached_slot_property('_cs_created_at')
+    def created_at(self) -> Optional[datetime.datetime]:
+        return parse_time(self._created_at)
+
+    @cached_slot_property('_cs_updated_at')
+    def updated_at(self) -> Optional[datetime.datetime]:
+        return parse_time(self._updated_at)
+
+    @property
+    def components(self) -> Tuple[Component, ...]:
+        """Tuple[:class:`Component`, ...]: The affected components."""
+        return self._nested('_components', Component)
+
+    @property
+    def updates(self) -> Tuple['IncidentUpdate', ...]:
+        """Tuple[:class:`IncidentUpdate`, ...]: The updates posted on the incident."""
+        return self._nested('_updates', IncidentUpdate, incident_id=self.id)
+
+    async def update(self, **fields) -> 'Incident':
+        """Updates the incident with the given fields of the API and returns the updated incident."""
+        return await self._require_state().update_incident(self._page_id, self.id, fields)
+
+    async def add_update(self, **fields) -> 'IncidentUpdate':
+        """Posts an update on the incident."""
+        return await self._require_state().add_incident_update(self._page_id, self.id, fields)
+
+    async def edit_update(self, incident_update_id: str, **fields) -> 'IncidentUpdate':
+        return await self._require_state().edit_incident_update(self._page_id, self.id, incident_update_id, fields)
+
+    async def delete(self):
+        await self._require_state().delete_incident(self._page_id, self.id)
+
+
+class IncidentUpdate(_Model):
+    """An update posted on an incident.
+
+    Attributes
+    -----------
+    id: :class:`str`
+        The id of the update.
+    incident_id: Optional[:class:`str`]
+        The id of the incident.
+    message: Optional[:class:`str`]
+        The message of the update.
+    status: :class:`IncidentStatus`
+        The status the incident had with the update.
+    """
+
+    __slots__ = ('id', 'incident_id', 'message', 'markdown', 'status', 'notify', '_started', '_created_at',
+                 '_updated_at', '_cs_started_at', '_cs_created_at', '_cs_updated_at')
+
+    _KEYS = (('id', 'id'), ('message', 'message'), ('markdown', 'markdown'), ('status', 'status'),
+             ('notify', 'notify'), ('started', '_started'), ('createdAt', '_created_at'), ('updatedAt', '_updated_at'))
+    _ENUMS = (('status', IncidentStatus),)
+    _REPR = ('id', 'status')
+
+    def __init__(self, data: Dict[str, Any], *, state: Optional['StatusClient'] = None, page_id: Optional[str] = None,
+                 incident_id: Optional[str] = None):
+        super().__init__(data, state=state, page_id=page_id)
+        self.incident_id = incident_id
+
+    @cached_slot_property('_cs_started_at')
+    def started_at(self) -> Optional[datetime.datetime]:
+        return parse_time(self._started)
+
+    @cached_slot_property('_cs_created_at')
+    def created_at(self) -> Optional[datetime.datetime]:
+        return parse_time(self._created_at)
+
+    @cached_slot_property('_cs_updated_at')
+    def updated_at(self) -> Optional[datetime.datetime]:
+        return parse_time(self._updated_at)
+
+    async def update(self, **fields) -> 'IncidentUpdate':
+        """Edits the update with the given fields of the API and returns the edited update."""
+        return await self._require_state().edit_incident_update(self._page_id, self.incident_id, self.id, fields)
+
+    async def delete(self):
+        await self._require_state().delete_incident_update(self._page_id, self.incident_id, self.id)
+
+
+class Maintenance(_Model):
+    """A scheduled maintenance on a status page.
+
+    Attributes
+    -----------
+    id: :class:`str`
+        The id of the maintenance.
+    name: :class:`str`
+        The name of the maintenance.
+    status: :class:`MaintenanceStatus`
+        The current status of the maintenance.
+    duration: Optional[:class:`int`]
+        The planned duration in minutes.
+    auto_start: Optional[:class:`bool`]
+        Whether the maintenance starts on its own.
+    auto_end: Optional[:class:`bool`]
+        Whether the maintenance ends on its own.
+    """
+
+    __slots__ = ('id', 'name', 'status', 'duration', 'auto_start', 'auto_end', 'notify', '_start', '_created_at',
+                 '_updated_at', '_components', '_updates', '_cs_start', '_cs_created_at', '_cs_updated_at')
+
+    _KEYS = (('id', 'id'), ('name', 'name'), ('status', 'status'), ('duration', 'duration'),
+             ('autoStart', 'auto_start'), ('autoEnd', 'auto_end'), ('notify', 'notify'), ('start', '_start'),
+             ('createdAt', '_created_at'), ('updatedAt', '_updated_at'), ('components', '_components'),
+             ('maintenanceUpdates', '_updates'))
+    _ENUMS = (('status', MaintenanceStatus),)
+    _REPR = ('id', 'name', 'status')
+
+    @cached_slot_property('_cs_start')
+    def start(self) -> Optional[datetime.datetime]:
+        return parse_time(self._start)
+
+    @cached_slot_property('_cs_created_at')
+    def created_at(self) -> Optional[datetime.datetime]:
+        return parse_time(self._created_at)
+
+    @cached_slot_property('_cs_updated_at')
+    def updated_at(self) -> Optional[datetime.datetime]:
+        return parse_time(self._updated_at)
+
+    @property
+    def end(self) -> Optional[datetime.datetime]:
+        """Optional[:class:`datetime.datetime`]: When the maintenance is planned to end."""
+        if self.start is None or self.duration is None:
+            return None
+        return self.start + datetime.timedelta(minutes=self.duration)
+
+    @property
+    def components(self) -> Tuple[Component, ...]:
+        """Tuple[:class:`Component`, ...]: The affected components."""
+        return self._nested('_components', Component)
+
+    @property
+    def updates(self) -> Tuple['MaintenanceUpdate', ...]:
+        """Tuple[:class:`MaintenanceUpdate`, ...]: The updates posted on the maintenance."""
+        return self._nested('_updates', MaintenanceUpdate, maintenance_id=self.id)
+
+    async def update(self, **fields) -> 'Maintenance':
+        """Updates the maintenance with the given fields of the API and returns the updated maintenance."""
+        return await self._require_state().update_maintenance(self._page_id, self.id, fields)
+
+    async def add_update(self, **fields) -> 'MaintenanceUpdate':
+        """Posts an update on the maintenance."""
+        return await self._require_state().add_maintenance_update(self._page_id, self.id, fields)
+
+    async def edit_update(self, maintenance_update_id: str, **fields) -> 'MaintenanceUpdate':
+        return await self._require_state().edit_maintenance_update(self._page_id, self.id, maintenance_update_id, fields)
+
+    async def delete(self):
+        await self._require_state().delete_maintenance(self._page_id, self.id)
+
+
+class MaintenanceUpdate(_Model):
+    """An update posted on a maintenance.
+
+    Attributes
+    -----------
+    id: :class:`str`
+        The id of the update.
+    maintenance_id: Optional[:class:`str`]
+        The id of the maintenance.
+    message: Optional[:class:`str`]
+        The message of the update.
+    status: :class:`MaintenanceStatus`
+        The status the maintenance had with the update.
+    """
+
+    __slots__ = ('id', 'maintenance_id', 'message', 'markdown', 'status', 'notify', '_created_at', '_updated_at',
+                 '_cs_created_at', '_cs_updated_at')
+
+    _KEYS = (('id', 'id'), ('message', 'message'), ('markdown', 'markdown'), ('status', 'status'),
+             ('notify', 'notify'), ('createdAt', '_created_at'), ('updatedAt', '_updated_at'))
+    _ENUMS = (('status', MaintenanceStatus),)
+    _REPR = ('id', 'status')
+
+    def __init__(self, data: Dict[str, Any], *, state: Optional['StatusClient'] = None, page_id: Optional[str] = None,
+                 maintenance_id: Optional[str] = None):
+        super().__init__(data, state=state, page_id=page_id)
+        self.maintenance_id = maintenance_id
+
+    @cached_slot_property('_cs_created_at')
+    def created_at(self) -> Optional[datetime.datetime]:
+        return parse_time(self._created_at)
+
+    @cached_slot_property('_cs_updated_at')
+    def updated_at(self) -> Optional[datetime.datetime]:
+        return parse_time(self._updated_at)
+
+    async def update(self, **fields) -> 'MaintenanceUpdate':
+        """Edits the update with the given fields of the API and returns the edited update."""
+        return await self._require_state().edit_maintenance_update(self._page_id, self.maintenance_id, self.id, fields)
+
+    async def delete(self):
+        await self._require_state().delete_maintenance_update(self._page_id, self.maintenance_id, self.id)
+
+
+class TeamMember(_Model):
+    """A member of the team of a status page.
+
+    Attributes
+    -----------
+    id: :class:`str`
+        The id of the member.
+    email: :class:`str`
+        The email address of the member.
+    name: Optional[:class:`str`]
+        The name of the member.
+    role: Optional[:class:`str`]
+        The role of the member.
+    """
+
+    __slots__ = ('id', 'email', 'name', 'role')
+
+    _KEYS = (('id', 'id'), ('email', 'email'), ('name', 'name'), ('role', 'role'))
+    _REPR = ('id', 'email')
+
+    async def delete(self):
+        await self._require_state().delete_teammate(self._page_id, self.id)
+
+
+class Subscriber(_Model):
+    """A subscriber of a status page.
+
+    Attributes
+    -----------
+    id: :class:`str`
+        The id of the subscriber.
+    email: Optional[:class:`str`]
+        The email address the notifications go to.
+    phone: Optional[:class:`str`]
+        The phone number the notifications go to.
+    webhook: Optional[:class:`str`]
+        The url the notifications are posted to.
+    """
+
+    __slots__ = ('id', 'email', 'phone', 'webhook', 'webhook_email', 'all_components', '_created_at',
+                 '_cs_created_at')
+
+    _KEYS = (('id', 'id'), ('email', 'email'), ('phone', 'phone'), ('webhook', 'webhook'),
+             ('webhookEmail', 'webhook_email'), ('allComponents', 'all_components'), ('createdAt', '_created_at'))
+    _REPR = ('id', 'email')
+
+    @cached_slot_property('_cs_created_at')
+    def created_at(self) -> Optional[datetime.datetime]:
+        return parse_time(self._created_at)
+
+    async def delete(self):
+        await self._require_state().delete_subscriber(self._page_id, self.id)
+
+
+class Metric(_Model):
+    """A metric shown on a status page.
+
+    Attributes
+    -----------
+    id: :class:`str`
+        The id of the metric.
+    name: :class:`str`
+        The name of the metric.
+    suffix: Optional[:class:`str`]
+        The unit shown after the values.
+    order: Optional[:class:`int`]
+        The position of the metric on the page.
+    """
+
+    __slots__ = ('id', 'name', 'suffix', 'order')
+
+    _KEYS = (('id', 'id'), ('name', 'name'), ('suffix', 'suffix'), ('order', 'order'))
+    _REPR = ('id', 'name')
+
+    async def update(self, **fields) -> 'Metric':
+        """Updates the metric with the given fields of the API and returns the updated metric."""
+        return await self._require_state().update_metric(self._page_id, self.id, fields)
+
+    async def delete(self):
+        await self._require_state().delete_metric(self._page_id, self.id)
+
+    async def add_datapoint(self, value: float, timestamp: Optional[Any] = None) -> bool:
+        """Queues a data point in the :attr:`StatusClient.datapoints` writer, which sends it
+        with the others of the metric in a batch, and returns whether it was queued.
+
+        ``timestamp`` is a datetime or unix seconds, the current time by default.
+        """
+        return await self._require_state().datapoints.put(self._page_id, self.id, value, timestamp)
+
+    async def add_datapoints(self, points: Iterable[Tuple[Any, float]]) -> int:
+        """Queues ``(timestamp, value)`` pairs like :meth:`add_datapoint` and returns how many were queued."""
+        writer = self._require_state().datapoints
+        queued = 0
+        for timestamp, value in points:
+            queued += await writer.put(self._page_id, self.id, value, timestamp)
+        return queued
+
+    async def delete_datapoint(self, timestamp: int):
+        await self._require_state().delete_datapoint(self._page_id, self.id, timestamp)
+
+
+class UserProfile(_Model):
+    """The profile of the user the api key belongs to.
+
+    Attributes
+    -----------
+    id: :class:`str`
+        The id of the user.
+    email: :class:`str`
+        The email address of the user.
+    name: Optional[:class:`str`]
+        The name of the user.
+    slug: Optional[:class:`str`]
+        The slug of the user.
+    avatar: Optional[:class:`str`]
+        The url of the avatar of the user.
+    """
+
+    __slots__ = ('id', 'email', 'name', 'slug', 'avatar', '_created_at', '_cs_created_at')
+
+    _KEYS = (('id', 'id'), ('email', 'email'), ('name', 'name'), ('slug', 'slug'), ('avatar', 'avatar'),
+             ('createdAt', '_created_at'))
+    _REPR = ('id', 'email')
+
+    @cached_slot_property('_cs_created_at')
+    def created_at(self) -> Optional[datetime.datetime]:
+        return parse_time(self._created_at)
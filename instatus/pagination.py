@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .http_requests import HTTPClient, Route
+
+__all__ = ('Paginator',)
+
+
+class Paginator:
+    """An async iterator over every item of a paginated list route.
+
+    While the items of one page are consumed, the next ``prefetch`` pages are already
+    requested. The amount of pages requested ahead never exceeds the budget left in
+    the rate limit bucket of the route. Pages that were prefetched but aren't needed
+    anymore, because the end was reached or the loop was left, get cancelled.
+
+    .. code-block:: python3
+
+        async for incident in client.paginate_incidents(page_id, per_page=100):
+            ...
+
+    Parameters
+    -----------
+    http: :class:`HTTPClient`
+        The client sending the requests.
+    route: :class:`Route`
+        The ``GET`` route of the list.
+    per_page: :class:`int`
+        How many items to request per page.
+    prefetch: :class:`int`
+        How many pages to request ahead of the one being consumed. ``0`` requests
+        each page only once the previous one was consumed.
+    start_page: :class:`int`
+        The first page to request.
+    limit: Optional[:class:`int`]
+        The maximum amount of items to yield.
+    model: Optional[Callable[[:class:`dict`], Any]]
+        Builds what is yielded from the payload of each item.
+    """
+
+    def __init__(self,
+                 http: 'HTTPClient',
+                 route: 'Route',
+                 *,
+                 per_page: int = 50,
+                 prefetch: int = 2,
+                 start_page: int = 1,
+                 limit: Optional[int] = None,
+                 model: Optional[Callable[[Any], Any]] = None):
+        if per_page < 1:
+            raise ValueError('per_page must be at least 1')
+        self.http = http
+        self.route = route
+        self.per_page = per_page
+        self.prefetch = max(prefetch, 0)
+        self.start_page = start_page
+        self.limit = limit
+        self.model = model
+
+    def __repr__(self):
+        return '<Paginator route={0.route.path!r} per_page={0.per_page} prefetch={0.prefetch}>'.format(self)
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iterate()
+
+    async def flatten(self):
+        """Returns all items as a :class:`list`."""
+        return [item async for item in self]
+
+    def _fetch(self, page: int):
+        params = {'page': page, 'per_page': self.per_page}
+        return asyncio.ensure_future(self.http.request(self.route, params=params))
+
+    def _ahead(self) -> int:
+        # don't take more of the bucket than there is left for the others
+        bucket = self.http._ratelimiter.get_bucket(self.route.bucket)
+        if bucket.remaining is None:
+            return min(self.prefetch, 1)
+        return max(min(self.prefetch, bucket.remaining), 0)
+
+    async def _iterate(self):
+        pending = deque()
+        next_page = self.start_page
+        remaining = self.limit
+        model = self.model
+        if remaining is not None and remaining <= 0:
+            return
+        try:
+            pending.append(self._fetch(next_page))
+            next_page += 1
+            while pending:
+                items = await pending.popleft()
+                if not isinstance(items, list):
+                    # not a paginated route after all
+                    yield items if model is None else model(items)
+                    return
+
+                ahead = self._ahead()
+                if remaining is not None:
+                    if len(items) >= remaining:
+                        # this page holds the last items asked for
+                        items = items[:remaining]
+                        ahead = 0
+                    else:
+                        # no more pages than the rest of the limit needs
+                        ahead = min(ahead, -(-(remaining - len(items)) // self.per_page))
+                    remaining -= len(items)
+                done = len(items) < self.per_page or remaining == 0
+                if not done:
+                    # request the next pages before handing out this one
+                    while len(pending) < ahead:
+                        pending.append(self._fetch(next_page))
+                        next_page += 1
+
+                for item in items:
+                    yield item if model is None else model(item)
+
+                if done:
+                    return
+                if not pending:
+                    # nothing was requested ahead, so the next page is only asked for now
+                    pending.append(self._fetch(next_page))
+                    next_page += 1
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import ssl
+import logging
+from typing import Optional
+
+import aiohttp
+
+log = logging.getLogger(__name__)
+
+__all__ = ('ConnectionPool',)
+
+_SSL_CONTEXT: Optional[ssl.SSLContext] = None
+
+
+def _default_ssl_context() -> ssl.SSLContext:
+    global _SSL_CONTEXT
+    if _SSL_CONTEXT is None:
+        _SSL_CONTEXT = ssl.create_default_context()
+    return _SSL_CONTEXT
+
+
+class ConnectionPool:
+    """A tuned pool of keep-alive connections to the Instatus hosts.
+
+    One pool can be shared by any number of :class:`StatusClient` instances running
+    on the same event loop, so they reuse the same keep-alive connections and DNS cache
+    instead of each opening their own.
+
+    Only a connection that is kept alive saves the TLS handshake: aiohttp doesn't resume
+    TLS sessions, so every new connection does a full handshake. What the shared TLS
+    context saves is loading the CA certificates, about 40 ms, once per pool.
+
+    Parameters
+    -----------
+    limit: :class:`int`
+        The total amount of simultaneous connections. ``0`` means no limit.
+    limit_per_host: :class:`int`
+        The amount of simultaneous connections to a single host. ``0`` means no limit.
+    keepalive_timeout: :class:`float`
+        For how many seconds an idle connection is kept open for reuse.
+    ttl_dns_cache: Optional[:class:`int`]
+        For how many seconds resolved addresses are cached. ``None`` caches them forever.
+    ssl_context: Optional[:class:`ssl.SSLContext`]
+        The TLS context used for all connections. Defaults to one context shared
+        by every pool in this process.
+    """
+
+    def __init__(self,
+                 *,
+                 limit: int = 100,
+                 limit_per_host: int = 30,
+                 keepalive_timeout: float = 60.0,
+                 ttl_dns_cache: Optional[int] = 300,
+                 ssl_context: Optional[ssl.SSLContext] = None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.ssl_context = ssl_context
+        self._connector: Optional[aiohttp.TCPConnector] = None
+
+    def __repr__(self):
+        return '<ConnectionPool limit={0.limit} limit_per_host={0.limit_per_host} ' \
+               'keepalive_timeout={0.keepalive_timeout}>'.format(self)
+
+    @property
+    def closed(self) -> bool:
+        return self._connector is not None and self._connector.closed
+
+    @property
+    def connector(self) -> aiohttp.TCPConnector:
+        """:class:`aiohttp.TCPConnector`: The connector of this pool, created on first use."""
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.ttl_dns_cache,
+                ssl=self.ssl_context or _default_ssl_context()
+            )
+        return self._connector
+
+    async def close(self):
+        if self._connector is not None:
+            await self._connector.close()
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Optional, Dict
+
+from . import utils
+
+log = logging.getLogger(__name__)
+
+__all__ = ('Bucket', 'RateLimiter')
+
+
+class Bucket:
+    """Tracks the rate limit budget of a single bucket.
+
+    The budget is taken from the ``X-Ratelimit-*`` headers of the responses.
+    Up to ``remaining`` requests may run at once, the rest is parked until
+    the bucket resets.
+
+    Attributes
+    ------------
+    key: :class:`str`
+        The bucket key of the routes sharing this budget.
+    limit: Optional[:class:`int`]
+        The amount of requests allowed per window, if the server sent it.
+    remaining: Optional[:class:`int`]
+        The amount of requests that may still be started in the current window.
+        ``None`` while nothing is known about the bucket.
+    reset_at: :class:`float`
+        The :meth:`loop.time` at which the current window resets.
+    in_flight: :class:`int`
+        The amount of requests currently running in this bucket.
+    """
+
+    __slots__ = ('key', 'limit', 'remaining', 'reset_at', 'in_flight',
+                 '_loop', '_window', '_probing', '_unlimited', '_waiters', '_timer')
+
+    def __init__(self, key: str, loop: asyncio.AbstractEventLoop):
+        self.key = key
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+        self.in_flight: int = 0
+        self._loop = loop
+        # the longest window the headers told of so far
+        self._window = 0.0
+        self._probing = False
+        self._unlimited = False
+        self._waiters = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def __repr__(self):
+        return '<Bucket key={0.key!r} remaining={0.remaining} limit={0.limit} in_flight={0.in_flight}>'.format(self)
+
+    @property
+    def is_exhausted(self) -> bool:
+        """:class:`bool`: Whether new requests have to wait for the bucket to reset."""
+        if self._unlimited or self.remaining is None:
+            return False
+        return self.remaining <= 0 and self.reset_at > self._loop.time()
+
+    def _try_take(self) -> bool:
+        if not self._unlimited:
+            if self.remaining is not None and self.remaining <= 0:
+                if self.reset_at > self._loop.time():
+                    self._schedule_reset()
+                    return False
+                # the window has passed, refill from what we know about the bucket;
+                # until a response tells otherwise the new window ends one window length from now
+                self.remaining = self.limit or None
+                self.reset_at = self._loop.time() + (self._window or 1.0)
+
+            if self.remaining is None:
+                # nothing is known about this bucket yet,
+                # let a single request through to learn its limits
+                if self._probing:
+                    return False
+                self._probing = True
+            else:
+                self.remaining -= 1
+
+        self.in_flight += 1
+        return True
+
+    async def acquire(self):
+        """Waits until the bucket has budget left and takes one request from it."""
+        while not self._try_take():
+            future = self._loop.create_future()
+            self._waiters.append(future)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # we got woken up but won't use it, pass it on
+                    self._wake()
+                else:
+                    try:
+                        self._waiters.remove(future)
+                    except ValueError:
+                        pass
+                raise
+
+    def release(self):
+        """Marks a request that was started with :meth:`acquire` as done."""
+        self.in_flight -= 1
+        if self.remaining is None:
+            # the probe failed or got cancelled before it got a response
+            self._probing = False
+        self._wake()
+
+    def update(self, response, *, use_clock: bool = False):
+        """Updates the budget from the rate limit headers of a response."""
+        headers = response.headers
+        remaining = headers.get('X-Ratelimit-Remaining')
+        self._probing = False
+        if remaining is None:
+            if self.remaining is None:
+                # this bucket is not limited by the server
+                self._unlimited = True
+            return
+
+        self._unlimited = False
+        remaining = int(remaining)
+        limit = headers.get('X-Ratelimit-Limit')
+        if limit is not None:
+            self.limit = int(limit)
+
+        try:
+            reset_after = utils._parse_ratelimit_header(response, use_clock=use_clock)
+        except (KeyError, ValueError):
+            reset_after = 1.0
+        reset_at = self._loop.time() + reset_after
+
+        if self.remaining is None or reset_at - self.reset_at > 0.5:
+            # a new window started, the other requests in flight may count against it
+            self.remaining = max(remaining - (self.in_flight - 1), 0)
+            self.reset_at = reset_at
+            self._window = max(self._window, reset_after)
+        else:
+            self.remaining = min(self.remaining, remaining)
+            self.reset_at = max(self.reset_at, reset_at)
+
+        if self.remaining <= 0:
+            log.debug('A rate limit bucket has been exhausted (bucket: %s, retry: %s).', self.key, reset_after)
+
+    def exhaust(self, retry_after: float):
+        """Marks the bucket as used up for at least ``retry_after`` seconds, e.g. after a 429."""
+        self._probing = False
+        self._unlimited = False
+        self.remaining = 0
+        self.reset_at = max(self.reset_at, self._loop.time() + retry_after)
+
+    def _wake(self):
+        if not self._waiters:
+            return
+
+        if self._unlimited:
+            count = len(self._waiters)
+        elif self.remaining is None:
+            count = 0 if self._probing else 1
+        elif self.remaining <= 0:
+            if self.reset_at > self._loop.time():
+                self._schedule_reset()
+                return
+            count = self.limit or 1
+        else:
+            count = self.remaining
+
+        while count > 0 and self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                count -= 1
+
+    def _schedule_reset(self):
+        if self._timer is None:
+            self._timer = self._loop.call_at(self.reset_at, self._on_reset)
+
+    def _on_reset(self):
+        self._timer = None
+        self._wake()
+
+
+class RateLimiter:
+    """Holds the :class:`Bucket` of every route and the global rate limit state."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self._buckets: Dict[str, Bucket] = {}
+        self._global_over = asyncio.Event()
+        self._global_over.set()
+
+    def get_bucket(self, key: str) -> Bucket:
+        try:
+            return self._buckets[key]
+        except KeyError:
+            bucket = self._buckets[key] = Bucket(key, self.loop)
+            return bucket
+
+    @property
+    def is_global_limited(self) -> bool:
+        return not self._global_over.is_set()
+
+    async def acquire(self, key: str) -> Bucket:
+        """Waits for the global rate limit and the bucket of ``key`` and returns the bucket.
+
+        The caller has to call :meth:`Bucket.release` once the request is done.
+        """
+        if not self._global_over.is_set():
+            # wait until the global lock is complete
+            await self._global_over.wait()
+
+        bucket = self.get_bucket(key)
+        await bucket.acquire()
+        return bucket
+
+    async def wait_global(self):
+        """Waits until the global rate limit is over."""
+        await self._global_over.wait()
+
+    def set_global(self, retry_after: float):
+        """Blocks all buckets for ``retry_after`` seconds."""
+        if self._global_over.is_set():
+            self._global_over.clear()
+            self.loop.call_later(retry_after, self._clear_global)
+
+    def _clear_global(self):
+        self._global_over.set()
+        log.debug('Global rate limit is now over.')
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import time
+import random
+import asyncio
+import datetime
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Iterable, Optional
+
+import aiohttp
+
+__all__ = ('RetryPolicy', 'RetryBudget')
+
+
+class RetryBudget:
+    """Limits retries to a fraction of the requests sent in a sliding window.
+
+    Every request allows ``ratio`` retries; on top of that ``min_per_second`` retries
+    per second are always allowed so a client sending few requests can still retry.
+    During an upstream brownout this keeps retries from multiplying the load.
+
+    Parameters
+    -----------
+    ratio: :class:`float`
+        The share of the requests that may be retried, e.g. ``0.2`` for 20%.
+    min_per_second: :class:`float`
+        The amount of retries per second that are allowed regardless of the ratio.
+    window: :class:`float`
+        The length of the sliding window in seconds.
+    """
+
+    def __init__(self, ratio: float = 0.2, *, min_per_second: float = 1.0, window: float = 10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window = window
+        # (second, requests, retries) per second of the window
+        self._slots = deque()
+        self._requests = 0
+        self._retries = 0
+
+    def __repr__(self):
+        return '<RetryBudget ratio={0.ratio} requests={0._requests} retries={0._retries}>'.format(self)
+
+    def _slot(self):
+        now = int(time.monotonic())
+        slots = self._slots
+        while slots and slots[0][0] <= now - self.window:
+            _, requests, retries = slots.popleft()
+            self._requests -= requests
+            self._retries -= retries
+        if not slots or slots[-1][0] != now:
+            slots.append([now, 0, 0])
+        return slots[-1]
+
+    def record_request(self):
+        """Counts a request that was sent for the first time."""
+        self._slot()[1] += 1
+        self._requests += 1
+
+    def try_retry(self) -> bool:
+        """Takes a retry from the budget; returns ``False`` if there is none left."""
+        slot = self._slot()
+        allowed = self._requests * self.ratio + self.min_per_second * self.window
+        if self._retries + 1 > allowed:
+            return False
+        slot[2] += 1
+        self._retries += 1
+        return True
+
+
+class RetryPolicy:
+    """Decides which failed requests get retried and how long to wait before.
+
+    The wait uses exponential backoff with full jitter, ``uniform(0, min(cap, base * 2 ** tries))``,
+    unless the response sent a ``Retry-After`` header.
+
+    Parameters
+    -----------
+    max_tries: :class:`int`
+        How often a request is sent at most, including the first attempt.
+    backoff_base: :class:`float`
+        The upper bound of the first backoff in seconds.
+    backoff_cap: :class:`float`
+        The highest upper bound a backoff can grow to.
+    retry_statuses: Iterable[:class:`int`]
+        The status codes that get retried.
+    respect_retry_after: :class:`bool`
+        Whether to wait as long as the ``Retry-After`` header of a response says.
+    retry_timeouts: :class:`bool`
+        Whether to retry requests that timed out.
+    retry_connection_errors: :class:`bool`
+        Whether to retry requests that failed to connect or lost their connection.
+    """
+
+    def __init__(self,
+                 max_tries: int = 5,
+                 *,
+                 backoff_base: float = 1.0,
+                 backoff_cap: float = 30.0,
+                 retry_statuses: Iterable[int] = (500, 502, 503, 504),
+                 respect_retry_after: bool = True,
+                 retry_timeouts: bool = True,
+                 retry_connection_errors: bool = True):
+        self.max_tries = max(max_tries, 1)
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retry_statuses: FrozenSet[int] = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+        self.retry_timeouts = retry_timeouts
+        self.retry_connection_errors = retry_connection_errors
+
+    def __repr__(self):
+        return '<RetryPolicy max_tries={0.max_tries} backoff_base={0.backoff_base} ' \
+               'backoff_cap={0.backoff_cap}>'.format(self)
+
+    def can_retry(self, tries: int) -> bool:
+        return tries + 1 < self.max_tries
+
+    def should_retry_status(self, status: int) -> bool:
+        return status in self.retry_statuses
+
+    def should_retry_exception(self, exc: BaseException) -> bool:
+        if isinstance(exc, asyncio.TimeoutError):
+            return self.retry_timeouts
+        if isinstance(exc, (aiohttp.ClientConnectionError, ConnectionError)):
+            return self.retry_connection_errors
+        if isinstance(exc, OSError):
+            # Connection reset by peer
+            return self.retry_connection_errors and exc.errno in (54, 10054)
+        return False
+
+    def backoff(self, tries: int) -> float:
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** tries))
+
+    def delay(self, tries: int, response=None) -> float:
+        """Returns how many seconds to wait before the next attempt."""
+        if response is not None and self.respect_retry_after:
+            retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return retry_after
+        return self.backoff(tries)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    return max((date - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0)
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .client import StatusClient
+    from .models import _Model
+
+__all__ = ('CachePolicy', 'StateCache')
+
+M = TypeVar('M', bound='_Model')
+
+
+class CachePolicy:
+    """How many objects of a model type a :class:`StateCache` keeps, and for how long.
+
+    Parameters
+    -----------
+    max_size: Optional[:class:`int`]
+        The maximum amount of objects; the least recently used ones are dropped first.
+        ``None`` keeps all of them.
+    ttl: Optional[:class:`float`]
+        For how many seconds after the last response containing it an object is returned
+        by the ``get_cached_*`` methods. ``None`` keeps it until it is evicted.
+    """
+
+    __slots__ = ('max_size', 'ttl')
+
+    def __init__(self, max_size: Optional[int] = 1024, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+
+    def __repr__(self):
+        return '<CachePolicy max_size={0.max_size} ttl={0.ttl}>'.format(self)
+
+
+class _ModelStore:
+    # the objects of one model type, keyed by (page id, id), in LRU order
+    __slots__ = ('policy', 'entries', 'hits', 'misses', 'evictions')
+
+    def __init__(self, policy: CachePolicy):
+        self.policy = policy
+        self.entries: 'OrderedDict[Tuple[Optional[str], str], List[Any]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Tuple[Optional[str], str]):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self.entries[key]
+            self.evictions += 1
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Tuple[Optional[str], str], obj):
+        ttl = self.policy.ttl
+        expires = None if ttl is None else time.monotonic() + ttl
+        entry = self.entries.get(key)
+        if entry is None:
+            self.entries[key] = [obj, expires]
+            max_size = self.policy.max_size
+            if max_size is not None:
+                while len(self.entries) > max_size:
+                    self.entries.popitem(last=False)
+                    self.evictions += 1
+        else:
+            entry[0] = obj
+            entry[1] = expires
+            self.entries.move_to_end(key)
+
+
+class StateCache:
+    """An identity map of the models a :class:`StatusClient` returns.
+
+    Pass one as the ``state_cache`` of a client to opt in. Every response then goes
+    through it: there is one object per id, and any later response including that id,
+    be it a list, a get or the result of an update, updates the object in place
+    instead of creating a new one. ::
+
+        client = StatusClient(api_key, state_cache=StateCache(policies={
+            'Component': CachePolicy(max_size=5000),
+            'Incident': CachePolicy(max_size=500, ttl=300),
+        }))
+        await client.get_all_components(page_id)
+        component = client.get_cached_component(page_id, component_id)  # no request
+
+    Objects dropped from the cache are not touched anymore, so they keep the state of
+    the last response they were part of; a later response creates a new object.
+
+    Parameters
+    -----------
+    default: Optional[:class:`CachePolicy`]
+        The policy of the model types not listed in ``policies``.
+    policies: Optional[Dict[Union[:class:`str`, :class:`type`], :class:`CachePolicy`]]
+        The policy per model type, by class or class name, e.g. ``{'Component': CachePolicy(ttl=60)}``.
+    """
+
+    def __init__(self,
+                 default: Optional[CachePolicy] = None,
+                 *,
+                 policies: Optional[Dict[Union[str, type], CachePolicy]] = None):
+        self.default = default or CachePolicy()
+        self.policies: Dict[str, CachePolicy] = {
+            key if isinstance(key, str) else key.__name__: policy for key, policy in (policies or {}).items()
+        }
+        self._stores: Dict[str, _ModelStore] = {}
+
+    def __repr__(self):
+        return '<StateCache size={0}>'.format(len(self))
+
+    def __len__(self):
+        return sum(len(store.entries) for store in self._stores.values())
+
+    def _store(self, model: type) -> _ModelStore:
+        name = model.__name__
+        try:
+            return self._stores[name]
+        except KeyError:
+            store = self._stores[name] = _ModelStore(self.policies.get(name, self.default))
+            return store
+
+    def store(self, model: Type[M], data: Dict[str, Any], *, state: Optional['StatusClient'] = None,
+              page_id: Optional[str] = None, **kwargs) -> M:
+        """Returns the object of the id in ``data``, updated with ``data``, creating it if it isn't cached."""
+        object_id = data.get('id')
+        if object_id is None:
+            return model(data, state=state, page_id=page_id, **kwargs)
+        store = self._store(model)
+        key = (page_id, object_id)
+        obj = store.get(key)
+        if obj is not None:
+            store.hits += 1
+            obj._merge(data)
+        else:
+            store.misses += 1
+            obj = model(data, state=state, page_id=page_id, **kwargs)
+            if len(data) == 1:
+                # only a reference, like the components of an incident on some routes
+                return obj
+        store.put(key, obj)
+        return obj
+
+    def get(self, model: Type[M], page_id: Optional[str], object_id: str) -> Optional[M]:
+        """Returns the cached object of ``object_id``, or ``None``."""
+        store = self._stores.get(model.__name__)
+        return store.get((page_id, object_id)) if store is not None else None
+
+    def all(self, model: Type[M], page_id: Optional[str]) -> List[M]:
+        """Returns the cached objects of a model type on a page, least recently used first."""
+        store = self._stores.get(model.__name__)
+        if store is None:
+            return []
+        keys = [key for key in store.entries if key[0] == page_id]
+        return [obj for obj in map(store.get, keys) if obj is not None]
+
+    def remove(self, model: type, page_id: Optional[str], object_id: str):
+        """Drops the object of ``object_id``, e.g. after it was deleted."""
+        store = self._stores.get(model.__name__)
+        if store is not None:
+            store.entries.pop((page_id, object_id), None)
+
+    def remove_page(self, page_id: str):
+        """Drops every object of a status page, and the page itself."""
+        for store in self._stores.values():
+            for key in [key for key in store.entries if key[0] == page_id or key == (None, page_id)]:
+                del store.entries[key]
+
+    def clear(self):
+        self._stores.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Returns per model type its size, the objects updated in place (hits) or created (misses)
+        by a response, and the objects dropped for their ttl or ``max_size``."""
+        return {
+            name: {'size': len(store.entries), 'hits': store.hits, 'misses': store.misses, 'evictions': store.evictions}
+            for name, store in self._stores.items()
+        }
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import re
+from typing import Any, AsyncIterator, List
+
+from .codec import JSONCodec
+
+__all__ = ('JSONArrayDecoder', 'iter_json_array')
+
+# the bytes that matter for finding the elements outside of and inside of strings
+_STRUCTURE = re.compile(rb'["\[\]{},]')
+_STRING = re.compile(rb'["\\]')
+_WHITESPACE = b' \t\r\n'
+
+_BEFORE, _ARRAY, _DONE, _OTHER = range(4)
+
+
+class JSONArrayDecoder:
+    """Incrementally splits a top level JSON array into its elements.
+
+    Bytes are passed in with :meth:`feed` in chunks of any size; every element is
+    decoded with the ``codec`` as soon as its closing byte arrived. Only the bytes
+    of the element that is currently incomplete are kept in memory.
+
+    If the document is not an array it is buffered and returned as a single
+    element by :meth:`close`.
+    """
+
+    __slots__ = ('codec', '_buffer', '_pos', '_start', '_depth', '_in_string', '_state')
+
+    def __init__(self, codec: JSONCodec):
+        self.codec = codec
+        self._buffer = bytearray()
+        self._pos = 0
+        self._start = 0
+        self._depth = 0
+        self._in_string = False
+        self._state = _BEFORE
+
+    def _emit(self, end: int, items: List[Any]):
+        element = bytes(self._buffer[self._start:end]).strip(_WHITESPACE)
+        if element:
+            items.append(self.codec.loads(element))
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Adds ``data`` to the buffer and returns the elements that are complete now."""
+        buffer = self._buffer
+        buffer += data
+        items = []
+
+        if self._state == _BEFORE:
+            stripped = buffer.lstrip(_WHITESPACE)
+            if not stripped:
+                buffer.clear()
+                return items
+            if stripped[0] != 0x5b:  # [
+                self._state = _OTHER
+            else:
+                del buffer[:len(buffer) - len(stripped) + 1]
+                self._state = _ARRAY
+                self._depth = 1
+
+        if self._state != _ARRAY:
+            return items
+
+        pos = self._pos
+        length = len(buffer)
+        while pos < length:
+            if self._in_string:
+                match = _STRING.search(buffer, pos)
+                if match is None:
+                    pos = length
+                    break
+                pos = match.start()
+                if buffer[pos] == 0x5c:  # backslash
+                    if pos + 1 >= length:
+                        # the escaped byte is in the next chunk
+                        break
+                    pos += 2
+                    continue
+                self._in_string = False
+                pos += 1
+                continue
+
+            match = _STRUCTURE.search(buffer, pos)
+            if match is None:
+                pos = length
+                break
+            pos = match.start()
+            char = buffer[pos]
+            if char == 0x22:  # "
+                self._in_string = True
+            elif char in b'[{':
+                self._depth += 1
+            elif char in b']}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(pos, items)
+                    self._state = _DONE
+                    buffer.clear()
+                    self._pos = self._start = 0
+                    return items
+            elif self._depth == 1:  # a comma between two elements
+                self._emit(pos, items)
+                self._start = pos + 1
+            pos += 1
+
+        # drop what has been decoded already
+        if self._start:
+            del buffer[:self._start]
+            pos -= self._start
+            self._start = 0
+        self._pos = pos
+        return items
+
+    def close(self) -> List[Any]:
+        """Returns what is left after the last chunk, if the document wasn't an array."""
+        if self._state == _OTHER:
+            data = self.codec.loads(bytes(self._buffer))
+            self._buffer.clear()
+            return data if isinstance(data, list) else [data]
+        if self._state == _ARRAY:
+            raise ValueError('Unexpected end of JSON array')
+        return []
+
+
+async def iter_json_array(stream, codec: JSONCodec, chunk_size: int = 65536) -> AsyncIterator[Any]:
+    """Yields the elements of the JSON array read from ``stream`` (a :class:`aiohttp.StreamReader`)."""
+    decoder = JSONArrayDecoder(codec)
+    async for chunk in stream.iter_chunked(chunk_size):
+        for item in decoder.feed(chunk):
+            yield item
+    for item in decoder.close():
+        yield item
@@ -0,0 +1,488 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import time
+import random
+import string
+import asyncio
+import logging
+import datetime
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from aiohttp import web
+
+from .transport import AiohttpTransport
+
+log = logging.getLogger(__name__)
+
+__all__ = ('FakeInstatus',)
+
+# the collections of a page, and the nested collections of their items
+_COLLECTIONS = ('components', 'incidents', 'maintenances', 'metrics', 'subscribers', 'team')
+_NESTED = {
+    ('incidents', 'incident-updates'): 'incidentUpdates',
+    ('maintenances', 'maintenance-updates'): 'maintenanceUpdates',
+}
+# the header the redirecting transport keeps the original host in
+_HOST_HEADER = 'X-Instatus-Host'
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+class _FixedWindow:
+    __slots__ = ('limit', 'window', 'started', 'count')
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.started = 0.0
+        self.count = 0
+
+    def hit(self, now: float) -> Tuple[int, float]:
+        """Counts a request; returns the remaining budget (negative when over) and the seconds until the reset."""
+        if now - self.started >= self.window:
+            self.started = now
+            self.count = 0
+        self.count += 1
+        return self.limit - self.count, self.window - (now - self.started)
+
+
+class _RedirectTransport(AiohttpTransport):
+    # sends the requests for any host to the fake server, keeping the host in a header
+    def __init__(self, base: str, **kwargs):
+        super().__init__(**kwargs)
+        self.base = base.rstrip('/')
+
+    def request(self, method: str, url: str, **kwargs):
+        split = urlsplit(url)
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers[_HOST_HEADER] = split.netloc
+        target = self.base + split.path + ('?' + split.query if split.query else '')
+        return super().request(method, target, headers=headers, **kwargs)
+
+
+class FakeInstatus:
+    """A local fake of the Instatus API for tests and load tests.
+
+    It serves every ``v1/...`` route of :class:`HTTPClient` and the ``summary.json`` of the
+    status pages from memory, and behaves like the real service where it matters for load:
+    ``X-Ratelimit-*`` headers, ``429`` responses with ``retry_after`` and ``global``, latency
+    and ``5xx`` faults. ::
+
+        async with FakeInstatus(rate_limit=30, latency=0.02) as fake:
+            page = fake.add_page(components=50)
+            client = fake.client()
+            async for component in client.paginate_components(page):
+                ...
+
+    Parameters
+    -----------
+    rate_limit: :class:`int`
+        The requests per ``window`` allowed per api key and page (or per api key for
+        the routes without a page).
+    window: :class:`float`
+        The length of a rate limit window in seconds.
+    global_limit: Optional[:class:`int`]
+        The requests per ``window`` allowed per api key over all routes.
+    latency: Union[:class:`float`, Tuple[:class:`float`, :class:`float`]]
+        The seconds every response is delayed, or the bounds of a uniformly random delay.
+    error_rate: :class:`float`
+        The share of the requests answered with one of ``error_statuses``.
+    error_statuses: Tuple[:class:`int`, ...]
+        The statuses of the injected faults.
+    seed: Optional[:class:`int`]
+        Seeds the latency, the faults and the generated ids.
+    host: :class:`str`
+        The host to listen on.
+    port: :class:`int`
+        The port to listen on; ``0`` picks a free one.
+
+    Attributes
+    -----------
+    stats: :class:`collections.Counter`
+        ``requests``, ``ok``, ``rate_limited``, ``global_rate_limited``, ``faults`` and
+        the metric ``datapoints`` received, plus the requests per ``'METHOD route'``.
+    """
+
+    def __init__(self,
+                 *,
+                 rate_limit: int = 30,
+                 window: float = 1.0,
+                 global_limit: Optional[int] = None,
+                 latency: Union[float, Tuple[float, float]] = 0.0,
+                 error_rate: float = 0.0,
+                 error_statuses: Tuple[int, ...] = (500, 502, 503),
+                 seed: Optional[int] = None,
+                 host: str = '127.0.0.1',
+                 port: int = 0):
+        self.rate_limit = rate_limit
+        self.window = window
+        self.global_limit = global_limit
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.host = host
+        self.port = port
+        self.stats = Counter()
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self._random = random.Random(seed)
+        self._windows: Dict[Tuple, _FixedWindow] = {}
+        self._runner: Optional[web.AppRunner] = None
+
+    def __repr__(self):
+        return '<FakeInstatus url={0.url!r} pages={1}>'.format(self, len(self.pages))
+
+    async def __aenter__(self) -> 'FakeInstatus':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def url(self) -> Optional[str]:
+        """Optional[:class:`str`]: The base url of the server, once it is started."""
+        if self._runner is None:
+            return None
+        return 'http://%s:%d/' % (self.host, self.port)
+
+    # setup
+
+    def _id(self) -> str:
+        # shaped like the cuids of the real api
+        return 'cl' + ''.join(self._random.choices(string.ascii_lowercase + string.digits, k=23))
+
+    def add_page(self,
+                 page_id: Optional[str] = None,
+                 *,
+                 subdomain: Optional[str] = None,
+                 components: int = 0,
+                 incidents: int = 0,
+                 maintenances: int = 0,
+                 metrics: int = 0,
+                 subscribers: int = 0) -> str:
+        """Adds a status page with that many generated items and returns its id."""
+        page_id = page_id or self._id()
+        subdomain = subdomain or 'page-%d' % (len(self.pages) + 1)
+        page = self.pages[page_id] = {
+            'id': page_id, 'subdomain': subdomain, 'name': subdomain.title(), 'status': 'UP',
+            'createdAt': _now(), **{collection: {} for collection in _COLLECTIONS}
+        }
+        for index in range(components):
+            self._create(page, 'components', {'name': 'Component %d' % index, 'status': 'OPERATIONAL',
+                                              'description': '', 'order': index, 'showUptime': True})
+        for index in range(incidents):
+            self._create(page, 'incidents', {'name': 'Incident %d' % index, 'status': 'RESOLVED',
+                                             'started': _now(), 'resolved': _now(), 'components': []})
+        for index in range(maintenances):
+            self._create(page, 'maintenances', {'name': 'Maintenance %d' % index, 'status': 'COMPLETED',
+                                                'start': _now(), 'duration': 60, 'components': []})
+        for index in range(metrics):
+            self._create(page, 'metrics', {'name': 'Metric %d' % index, 'suffix': 'ms', 'order': index, 'data': []})
+        for index in range(subscribers):
+            self._create(page, 'subscribers', {'email': 'subscriber%d@example.com' % index})
+        return page_id
+
+    def _create(self, page: Dict[str, Any], collection: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        item = dict(data, id=self._id(), createdAt=_now(), updatedAt=_now())
+        for (parent, _), key in _NESTED.items():
+            if parent == collection:
+                item.setdefault(key, [])
+        page[collection][item['id']] = item
+        return item
+
+    # server
+
+    async def start(self) -> str:
+        """Starts the server and returns its :attr:`url`."""
+        app = web.Application(middlewares=[self._middleware])
+        router = app.router
+        router.add_get('/summary.json', self._summary)
+        router.add_get('/v1/pages', self._get_pages)
+        router.add_post('/v1/pages', self._create_page)
+        router.add_put('/v1/{page_id}', self._update_page)
+        router.add_delete('/v1/{page_id}', self._delete_page)
+        router.add_get('/v1/{page_id}/{collection}', self._list)
+        router.add_post('/v1/{page_id}/{collection}', self._create_item)
+        router.add_get('/v1/{page_id}/{collection}/{item_id}', self._get_item)
+        router.add_put('/v1/{page_id}/{collection}/{item_id}', self._update_item)
+        router.add_delete('/v1/{page_id}/{collection}/{item_id}', self._delete_item)
+        router.add_post('/v1/{page_id}/{collection}/{item_id}', self._add_datapoints)
+        router.add_delete('/v1/{page_id}/{collection}/{item_id}/{timestamp}', self._delete_datapoint)
+        router.add_post('/v1/{page_id}/{collection}/{item_id}/{nested}', self._create_nested)
+        router.add_get('/v1/{page_id}/{collection}/{item_id}/{nested}/{nested_id}', self._get_nested)
+        router.add_put('/v1/{page_id}/{collection}/{item_id}/{nested}/{nested_id}', self._update_nested)
+        router.add_delete('/v1/{page_id}/{collection}/{item_id}/{nested}/{nested_id}', self._delete_nested)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if not self.port:
+            self.port = site._server.sockets[0].getsockname()[1]
+        return self.url
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def transport(self, **kwargs) -> AiohttpTransport:
+        """Returns a transport sending the requests for any host, including the summary hosts, to this server."""
+        return _RedirectTransport(self.url, **kwargs)
+
+    def client(self, api_key: str = 'fake-key', **options):
+        """Returns a :class:`StatusClient` talking to this server, on the running loop."""
+        from .client import StatusClient
+        options.setdefault('loop', asyncio.get_running_loop())
+        options.setdefault('transport', self.transport())
+        return StatusClient(api_key, **options)
+
+    # behaviour
+
+    def _delay(self) -> float:
+        if isinstance(self.latency, tuple):
+            return self._random.uniform(*self.latency)
+        return self.latency
+
+    def _window(self, key: Tuple, limit: int) -> _FixedWindow:
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = _FixedWindow(limit, self.window)
+        return window
+
+    def _rate_limited(self, retry_after: float, is_global: bool, headers: Dict[str, str]) -> web.Response:
+        body = {'message': 'You are being rate limited.', 'retry_after': int(retry_after * 1000) + 1,
+                'global': is_global}
+        headers['Retry-After'] = str(max(int(retry_after + 0.999), 1))
+        # the client only retries 429s that passed the edge proxy
+        headers['Via'] = '1.1 fake-instatus'
+        return web.json_response(body, status=429, headers=headers)
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        stats = self.stats
+        stats['requests'] += 1
+        route = request.match_info.route.resource
+        stats['%s %s' % (request.method, route.canonical if route is not None else request.path)] += 1
+
+        delay = self._delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        now = time.monotonic()
+        key = request.headers.get('Authorization')
+        headers = {}
+        if request.path != '/summary.json':
+            if self.global_limit is not None:
+                remaining, reset_after = self._window((key, None), self.global_limit).hit(now)
+                if remaining < 0:
+                    stats['rate_limited'] += 1
+                    stats['global_rate_limited'] += 1
+                    return self._rate_limited(reset_after, True, headers)
+
+            major = request.match_info.get('page_id')
+            remaining, reset_after = self._window((key, major), self.rate_limit).hit(now)
+            headers.update({
+                'X-Ratelimit-Limit': str(self.rate_limit),
+                'X-Ratelimit-Remaining': str(max(remaining, 0)),
+                'X-Ratelimit-Reset': '%.3f' % (time.time() + reset_after),
+                'X-Ratelimit-Reset-After': '%.3f' % reset_after,
+            })
+            if remaining < 0:
+                stats['rate_limited'] += 1
+                return self._rate_limited(reset_after, False, headers)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            stats['faults'] += 1
+            status = self._random.choice(self.error_statuses)
+            return web.json_response({'message': 'Injected fault'}, status=status, headers=headers)
+
+        response = await handler(request)
+        if response.status < 400:
+            stats['ok'] += 1
+        response.headers.update(headers)
+        return response
+
+    # handlers
+
+    def _page(self, request: web.Request) -> Dict[str, Any]:
+        try:
+            return self.pages[request.match_info['page_id']]
+        except KeyError:
+            raise web.HTTPNotFound(text='{"message":"Page not found"}', content_type='application/json')
+
+    def _collection(self, request: web.Request) -> Dict[str, Dict[str, Any]]:
+        collection = request.match_info['collection']
+        if collection not in _COLLECTIONS:
+            raise web.HTTPNotFound(text='{"message":"Unknown route"}', content_type='application/json')
+        return self._page(request)[collection]
+
+    def _item(self, request: web.Request) -> Dict[str, Any]:
+        try:
+            return self._collection(request)[request.match_info['item_id']]
+        except KeyError:
+            raise web.HTTPNotFound(text='{"message":"Not found"}', content_type='application/json')
+
+    def _nested(self, request: web.Request) -> list:
+        key = _NESTED.get((request.match_info['collection'], request.match_info['nested']))
+        if key is None:
+            raise web.HTTPNotFound(text='{"message":"Unknown route"}', content_type='application/json')
+        return self._item(request)[key]
+
+    def _nested_item(self, request: web.Request) -> Tuple[list, Dict[str, Any]]:
+        updates = self._nested(request)
+        for update in updates:
+            if update['id'] == request.match_info['nested_id']:
+                return updates, update
+        raise web.HTTPNotFound(text='{"message":"Not found"}', content_type='application/json')
+
+    @staticmethod
+    def _paginate(request: web.Request, items: list) -> list:
+        if 'page' not in request.query and 'per_page' not in request.query:
+            return items
+        page = max(int(request.query.get('page', 1)), 1)
+        per_page = max(int(request.query.get('per_page', 50)), 1)
+        return items[(page - 1) * per_page:page * per_page]
+
+    @staticmethod
+    async def _body(request: web.Request) -> Dict[str, Any]:
+        if not request.body_exists:
+            return {}
+        data = await request.json()
+        if not isinstance(data, dict):
+            raise web.HTTPBadRequest(text='{"message":"Expected an object"}', content_type='application/json')
+        return data
+
+    @staticmethod
+    def _public(page: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in page.items() if key not in _COLLECTIONS}
+
+    async def _summary(self, request: web.Request) -> web.Response:
+        host = request.headers.get(_HOST_HEADER, request.host)
+        subdomain = request.query.get('prod_name') or host.split('.', 1)[0]
+        for page in self.pages.values():
+            if page['subdomain'] == subdomain:
+                break
+        else:
+            raise web.HTTPNotFound(text='{"message":"Page not found"}', content_type='application/json')
+        components = list(page['components'].values())
+        active = [incident for incident in page['incidents'].values() if incident.get('status') != 'RESOLVED']
+        return web.json_response({
+            'page': {'name': page['name'], 'url': 'https://%s.instatus.com' % subdomain,
+                     'status': 'HASISSUES' if active else 'UP'},
+            'activeIncidents': active,
+            'activeMaintenances': [m for m in page['maintenances'].values() if m.get('status') == 'INPROGRESS'],
+            'components': components,
+        })
+
+    async def _get_pages(self, request: web.Request) -> web.Response:
+        return web.json_response(self._paginate(request, [self._public(page) for page in self.pages.values()]))
+
+    async def _create_page(self, request: web.Request) -> web.Response:
+        data = await self._body(request)
+        page_id = self.add_page(subdomain=data.get('subdomain'))
+        self.pages[page_id].update({key: value for key, value in data.items() if key not in _COLLECTIONS})
+        return web.json_response(self._public(self.pages[page_id]))
+
+    async def _update_page(self, request: web.Request) -> web.Response:
+        page = self._page(request)
+        data = await self._body(request)
+        page.update({key: value for key, value in data.items() if key not in _COLLECTIONS and key != 'id'})
+        return web.json_response(self._public(page))
+
+    async def _delete_page(self, request: web.Request) -> web.Response:
+        page = self._page(request)
+        del self.pages[page['id']]
+        return web.json_response({'id': page['id']})
+
+    async def _list(self, request: web.Request) -> web.Response:
+        return web.json_response(self._paginate(request, list(self._collection(request).values())))
+
+    async def _create_item(self, request: web.Request) -> web.Response:
+        self._collection(request)
+        item = self._create(self._page(request), request.match_info['collection'], await self._body(request))
+        return web.json_response(item)
+
+    async def _get_item(self, request: web.Request) -> web.Response:
+        return web.json_response(self._item(request))
+
+    async def _update_item(self, request: web.Request) -> web.Response:
+        item = self._item(request)
+        data = await self._body(request)
+        item.update({key: value for key, value in data.items() if key != 'id'}, updatedAt=_now())
+        return web.json_response(item)
+
+    async def _delete_item(self, request: web.Request) -> web.Response:
+        item = self._item(request)
+        del self._collection(request)[item['id']]
+        return web.json_response({'id': item['id']})
+
+    def _metric(self, request: web.Request) -> Dict[str, Any]:
+        if request.match_info['collection'] != 'metrics':
+            raise web.HTTPNotFound(text='{"message":"Unknown route"}', content_type='application/json')
+        return self._item(request)
+
+    async def _add_datapoints(self, request: web.Request) -> web.Response:
+        metric = self._metric(request)
+        data = await self._body(request)
+        points = data['data'] if 'data' in data else [data]
+        if not all(isinstance(point, dict) and 'timestamp' in point and 'value' in point for point in points):
+            raise web.HTTPBadRequest(text='{"message":"Expected timestamp and value"}', content_type='application/json')
+        metric.setdefault('data', []).extend({'timestamp': point['timestamp'], 'value': point['value']}
+                                             for point in points)
+        self.stats['datapoints'] += len(points)
+        return web.json_response({'id': metric['id'], 'count': len(points)})
+
+    async def _delete_datapoint(self, request: web.Request) -> web.Response:
+        metric = self._metric(request)
+        timestamp = float(request.match_info['timestamp'])
+        metric['data'] = [point for point in metric.get('data', ()) if point['timestamp'] != timestamp]
+        return web.json_response({'id': metric['id']})
+
+    async def _create_nested(self, request: web.Request) -> web.Response:
+        updates = self._nested(request)
+        update = dict(await self._body(request), id=self._id(), createdAt=_now(), updatedAt=_now())
+        updates.append(update)
+        return web.json_response(update)
+
+    async def _get_nested(self, request: web.Request) -> web.Response:
+        return web.json_response(self._nested_item(request)[1])
+
+    async def _update_nested(self, request: web.Request) -> web.Response:
+        _, update = self._nested_item(request)
+        data = await self._body(request)
+        update.update({key: value for key, value in data.items() if key != 'id'}, updatedAt=_now())
+        return web.json_response(update)
+
+    async def _delete_nested(self, request: web.Request) -> web.Response:
+        updates, update = self._nested_item(request)
+        updates.remove(update)
+        return web.json_response({'id': update['id']})
@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import re
+import json
+import inspect
+import logging
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from .pool import ConnectionPool
+
+log = logging.getLogger(__name__)
+
+__all__ = ('Transport', 'AiohttpTransport', 'MemoryTransport', 'MemoryRequest', 'MemoryResponse')
+
+
+class Transport:
+    """The interface :class:`HTTPClient` sends its requests through.
+
+    :meth:`request` takes the arguments of :meth:`aiohttp.ClientSession.request` and returns
+    an async context manager yielding the response. The response needs ``status``, ``reason``,
+    ``method``, ``url``, ``headers``, ``charset``, ``read()``, ``release()`` and a ``content``
+    with ``iter_chunked(size)``, like :class:`aiohttp.ClientResponse`.
+
+    Connection errors are expected as :exc:`OSError`, :exc:`aiohttp.ClientConnectionError`
+    or :exc:`asyncio.TimeoutError`, so they get retried.
+    """
+
+    def request(self, method: str, url: str, **kwargs) -> AsyncContextManager:
+        raise NotImplementedError
+
+    @property
+    def closed(self) -> bool:
+        """:class:`bool`: Whether the transport got closed after it was used."""
+        return False
+
+    def recreate(self):
+        """Makes a closed transport usable again."""
+
+    async def close(self):
+        """Closes the connections of the transport."""
+
+
+class AiohttpTransport(Transport):
+    """The default :class:`Transport`, an :class:`aiohttp.ClientSession` created on first use.
+
+    Parameters
+    -----------
+    connector: Optional[:class:`aiohttp.BaseConnector`]
+        A connector to use instead of the one of ``pool``; it is not closed with the transport.
+    pool: Optional[:class:`ConnectionPool`]
+        The pool to take the connections from; a new one is created (and closed) if omitted.
+    cookie_jar: Optional[:class:`aiohttp.CookieJar`]
+        The cookie jar of the session.
+    unix_socket: Optional[:class:`str`]
+        Sends every request through this Unix socket, e.g. the one of the gateway.
+    \\*\\*session_kwargs
+        Passed to :class:`aiohttp.ClientSession`.
+    """
+
+    def __init__(self,
+                 connector: Optional[aiohttp.BaseConnector] = None,
+                 *,
+                 pool: Optional[ConnectionPool] = None,
+                 cookie_jar: Optional[aiohttp.CookieJar] = None,
+                 unix_socket: Optional[str] = None,
+                 **session_kwargs):
+        self.connector = connector
+        # a pool passed in may be shared with other clients, so only close the one we created
+        self._owns_pool = pool is None
+        self.pool = pool or ConnectionPool()
+        self.cookie_jar = cookie_jar
+        self.unix_socket = unix_socket
+        self.session_kwargs = session_kwargs
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def __repr__(self):
+        return '<AiohttpTransport pool={0.pool!r} unix_socket={0.unix_socket!r}>'.format(self)
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        if self.cookie_jar is None:
+            self.cookie_jar = aiohttp.CookieJar()
+        if self.unix_socket is not None:
+            return aiohttp.ClientSession(
+                connector=aiohttp.UnixConnector(path=self.unix_socket),
+                cookie_jar=self.cookie_jar,
+                **self.session_kwargs
+            )
+        return aiohttp.ClientSession(
+            connector=self.connector or self.pool.connector,
+            connector_owner=False,
+            cookie_jar=self.cookie_jar,
+            **self.session_kwargs
+        )
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """:class:`aiohttp.ClientSession`: The session, created on first use so it binds to the running loop."""
+        if self._session is None:
+            self._session = self._create_session()
+        return self._session
+
+    def request(self, method: str, url: str, **kwargs):
+        return self.session.request(method, url, **kwargs)
+
+    @property
+    def closed(self) -> bool:
+        return self._session is not None and self._session.closed
+
+    def recreate(self):
+        if self._session is not None and self._session.closed:
+            self._session = self._create_session()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+        if self._owns_pool:
+            await self.pool.close()
+
+
+class MemoryRequest:
+    """A request received by a handler of :class:`MemoryTransport`.
+
+    Attributes
+    -----------
+    method: :class:`str`
+        The HTTP method.
+    url: :class:`str`
+        The full url, including the query.
+    path: :class:`str`
+        The path of the url.
+    match_info: Dict[:class:`str`, :class:`str`]
+        The values of the ``{placeholders}`` of the matched pattern.
+    query: Dict[:class:`str`, :class:`str`]
+        The query parameters.
+    headers: :class:`multidict.CIMultiDict`
+        The request headers.
+    body: :class:`bytes`
+        The raw body.
+    """
+
+    __slots__ = ('method', 'url', 'path', 'match_info', 'query', 'headers', 'body')
+
+    def __init__(self, method, url, path, match_info, query, headers, body):
+        self.method = method
+        self.url = url
+        self.path = path
+        self.match_info = match_info
+        self.query = query
+        self.headers = headers
+        self.body = body
+
+    def __repr__(self):
+        return '<MemoryRequest method={0.method!r} url={0.url!r}>'.format(self)
+
+    def json(self) -> Any:
+        """Decodes the body as JSON; ``None`` if there is none."""
+        return json.loads(self.body) if self.body else None
+
+
+class _MemoryContent:
+    __slots__ = ('_body',)
+
+    def __init__(self, body: bytes):
+        self._body = body
+
+    async def iter_chunked(self, size: int):
+        body = self._body
+        for start in range(0, len(body), size):
+            yield body[start:start + size]
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+class MemoryResponse:
+    """A response of a handler of :class:`MemoryTransport`.
+
+    Handlers may also return a plain JSON serializable object for a ``200``, or
+    raise an :exc:`OSError` to fail like a broken connection.
+
+    Parameters
+    -----------
+    status: :class:`int`
+        The status code.
+    json: Any
+        The JSON body; the ``Content-Type`` is set for it.
+    body: Union[:class:`bytes`, :class:`str`]
+        A raw body, if there is no ``json``.
+    headers: Optional[Dict[:class:`str`, :class:`str`]]
+        The response headers.
+    reason: Optional[:class:`str`]
+        The reason phrase; derived from ``status`` if omitted.
+    """
+
+    __slots__ = ('status', 'reason', 'headers', 'method', 'url', '_body', 'content')
+
+    def __init__(self,
+                 status: int = 200,
+                 *,
+                 json: Any = None,
+                 body: Union[bytes, str] = b'',
+                 headers: Optional[Dict[str, str]] = None,
+                 reason: Optional[str] = None):
+        headers = CIMultiDict(headers or {})
+        if json is not None:
+            body = _dumps(json)
+            headers.setdefault('Content-Type', 'application/json; charset=utf-8')
+        elif isinstance(body, str):
+            body = body.encode()
+            headers.setdefault('Content-Type', 'text/plain; charset=utf-8')
+        self.status = status
+        self.reason = reason or _REASONS.get(status, '')
+        self.headers = CIMultiDictProxy(headers)
+        self.method = None
+        self.url = None
+        self._body = body
+        self.content = _MemoryContent(body)
+
+    def __repr__(self):
+        return '<MemoryResponse status={0.status} method={0.method!r} url={0.url!r}>'.format(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    @property
+    def charset(self) -> Optional[str]:
+        match = _CHARSET.search(self.headers.get('Content-Type', ''))
+        return match.group(1) if match else None
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self) -> str:
+        return self._body.decode(self.charset or 'utf-8', 'replace')
+
+    async def release(self):
+        pass
+
+
+Handler = Callable[[MemoryRequest], Union[Awaitable[Any], Any]]
+
+_CHARSET = re.compile(r'charset=([\w-]+)', re.IGNORECASE)
+_PLACEHOLDER = re.compile(r'\\{(\w+)\\}')
+_REASONS = {200: 'OK', 201: 'Created', 204: 'No Content', 304: 'Not Modified', 400: 'Bad Request',
+            401: 'Unauthorized', 403: 'Forbidden', 404: 'Not Found', 429: 'Too Many Requests',
+            500: 'Internal Server Error', 502: 'Bad Gateway', 503: 'Service Unavailable',
+            504: 'Gateway Timeout'}
+
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=True).encode()
+
+
+def _compile(pattern: str) -> 're.Pattern':
+    # '/v1/{page_id}/components' -> '/v1/(?P<page_id>[^/]+)/components'
+    return re.compile('^%s$' % _PLACEHOLDER.sub(r'(?P<\1>[^/]+)', re.escape('/' + pattern.lstrip('/'))))
+
+
+class MemoryTransport(Transport):
+    """A :class:`Transport` answering every request from Python handlers, without any sockets.
+
+    This runs the rate limiting, retries and parsing of :class:`HTTPClient` at full speed,
+    e.g. in load tests. Handlers are matched on the method and the path of the url; the
+    host is ignored. Unmatched requests get a ``404``. ::
+
+        transport = MemoryTransport()
+
+        @transport.route('GET', '/v1/{page_id}/components')
+        async def components(request):
+            return [{'id': 'c1', 'name': 'API'}]
+
+        client = StatusClient(api_key, transport=transport)
+
+    Attributes
+    -----------
+    requests: :class:`int`
+        The amount of requests answered.
+    """
+
+    def __init__(self):
+        self._routes: List[Tuple[str, 're.Pattern', Handler]] = []
+        self.requests = 0
+
+    def __repr__(self):
+        return '<MemoryTransport routes={0} requests={1.requests}>'.format(len(self._routes), self)
+
+    def add_route(self, method: str, pattern: str, handler: Handler):
+        """Answers ``method`` requests to paths matching ``pattern`` with ``handler``; ``'*'`` matches any method."""
+        self._routes.append((method.upper(), _compile(pattern), handler))
+
+    def route(self, method: str, pattern: str) -> Callable[[Handler], Handler]:
+        """A decorator to :meth:`add_route` a handler."""
+        def decorator(handler: Handler) -> Handler:
+            self.add_route(method, pattern, handler)
+            return handler
+        return decorator
+
+    def request(self, method: str, url: str, **kwargs):
+        return _MemoryRequestContext(self._respond(method, url, **kwargs))
+
+    async def _respond(self, method: str, url: str, *, params=None, headers=None, data=None, json=None,
+                       **_) -> MemoryResponse:
+        split = urlsplit(url)
+        query = dict(parse_qsl(split.query))
+        if params:
+            query.update((key, str(value)) for key, value in params.items())
+        if json is not None:
+            data = _dumps(json)
+        elif isinstance(data, str):
+            data = data.encode()
+        elif not isinstance(data, (bytes, bytearray)):
+            # form data and the like aren't inspected
+            data = b''
+
+        path = split.path or '/'
+        for route_method, pattern, handler in self._routes:
+            if route_method != '*' and route_method != method:
+                continue
+            match = pattern.match(path)
+            if match is None:
+                continue
+            request = MemoryRequest(method, url if not params else '%s?%s' % (url.split('?')[0], urlencode(query)),
+                                    path, match.groupdict(), query, CIMultiDict(headers or {}), bytes(data))
+            result = handler(request)
+            if inspect.isawaitable(result):
+                result = await result
+            break
+        else:
+            result = MemoryResponse(404, json={'message': 'No route matches %s %s' % (method, path)})
+
+        if not isinstance(result, MemoryResponse):
+            result = MemoryResponse(json=result)
+        result.method = method
+        result.url = url
+        self.requests += 1
+        return result
+
+
+class _MemoryRequestContext:
+    __slots__ = ('_coro', '_response')
+
+    def __init__(self, coro: Awaitable[MemoryResponse]):
+        self._coro = coro
+        self._response = None
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self) -> MemoryResponse:
+        self._response = await self._coro
+        return self._response
+
+    async def __aexit__(self, *exc_info):
+        pass
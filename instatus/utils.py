@@ -1,9 +1,75 @@
+import os
 import json
 import datetime
 from itertools import chain
 from typing import Union, Optional, List, Dict, Any
 
 
+def new_event_loop():
+    """Creates an event loop; a uvloop one if uvloop is installed, unless ``INSTATUS_NO_UVLOOP`` is set."""
+    import asyncio
+    if not os.environ.get('INSTATUS_NO_UVLOOP'):
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+class _MissingSentinel:
+    def __eq__(self, other):
+        return False
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return '...'
+
+
+MISSING: Any = _MissingSentinel()
+
+
+class CachedSlotProperty:
+    # a property that computes its value once and stores it in a slot of the instance
+    __slots__ = ('name', 'function', '__doc__')
+
+    def __init__(self, name: str, function):
+        self.name = name
+        self.function = function
+        self.__doc__ = getattr(function, '__doc__')
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        try:
+            return getattr(instance, self.name)
+        except AttributeError:
+            value = self.function(instance)
+            setattr(instance, self.name, value)
+            return value
+
+
+def cached_slot_property(name: str):
+    """Like :class:`functools.cached_property`, for classes with ``__slots__``;
+    the value is kept in the slot ``name``, which the class has to declare.
+    """
+    def decorator(func):
+        return CachedSlotProperty(name, func)
+    return decorator
+
+
+def parse_time(timestamp: Optional[str]) -> Optional[datetime.datetime]:
+    """Parses an ISO 8601 timestamp of the API, like ``2022-05-01T10:00:00.000Z``."""
+    if not timestamp:
+        return None
+    if timestamp[-1] == 'Z':
+        timestamp = timestamp[:-1] + '+00:00'
+    return datetime.datetime.fromisoformat(timestamp)
+
+
 def to_json(obj):
     return json.dumps(obj, separators=(',', ':'), ensure_ascii=True)
 
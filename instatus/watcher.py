@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""
+The MIT License (MIT)
+
+Copyright (c) 2022-present mccoderpy
+
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import json
+import asyncio
+import hashlib
+import logging
+from typing import Any, Callable, Coroutine, Dict, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+
+from .models import Component, Incident, IncidentUpdate, Maintenance, MaintenanceUpdate
+
+if TYPE_CHECKING:
+    from .client import StatusClient
+
+log = logging.getLogger(__name__)
+
+__all__ = ('FieldChange', 'Watcher')
+
+Listener = Callable[..., Coroutine[Any, Any, Any]]
+
+
+class FieldChange(NamedTuple):
+    """The values of a field before and after a change."""
+    before: Any
+    after: Any
+
+
+class _Kind:
+    # how one collection of a page is fetched and diffed
+    __slots__ = ('name', 'model', 'fetch', 'updates_key', 'update_model', 'parent_arg', 'slots')
+
+    def __init__(self, name, model, fetch, updates_key=None, update_model=None, parent_arg=None):
+        self.name = name
+        self.model = model
+        self.fetch = fetch
+        self.updates_key = updates_key
+        self.update_model = update_model
+        self.parent_arg = parent_arg
+        # payload key -> the public attribute of the model, e.g. 'started' -> 'started_at'
+        self.slots = {key: _attribute(model, slot) for key, slot in model._KEYS}
+
+
+def _attribute(model: type, slot: str) -> str:
+    if not slot.startswith('_'):
+        return slot
+    for name in (slot[1:], slot[1:] + '_at'):
+        if hasattr(model, name):
+            return name
+    return slot
+
+
+_KINDS = {
+    'component': _Kind('component', Component, 'get_all_components'),
+    'incident': _Kind('incident', Incident, 'get_all_incidents', 'incidentUpdates', IncidentUpdate, 'incident_id'),
+    'maintenance': _Kind('maintenance', Maintenance, 'get_all_maintenances', 'maintenanceUpdates', MaintenanceUpdate,
+                         'maintenance_id'),
+}
+
+
+def _fingerprint(item: Dict[str, Any]) -> bytes:
+    # a digest of the canonical form of the payload, so the key order of the
+    # response doesn't matter and equal payloads get equal fingerprints in any process
+    canonical = json.dumps(item, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).digest()
+
+
+class Watcher:
+    """Polls the components, incidents and maintenances of a status page and
+    dispatches an event for every change.
+
+    Every poll is compared against the snapshot of the last one: each object has a
+    content hash, and only the objects whose hash changed are compared field by field.
+    When the response cache answered with the very same payload, the diff is skipped.
+    Diffing yields to the event loop every ``chunk_size`` objects, so watching thousands
+    of components doesn't block it.
+
+    The events go through a queue of ``queue_size`` events to the listeners. A full
+    queue stops the polling until the listeners caught up, so slow listeners delay the
+    next poll instead of piling up events. Listeners are coroutines registered like the
+    events of discord.py, by their name: ::
+
+        watcher = client.watch(page_id, interval=15)
+
+        @watcher.event
+        async def on_component_status_change(component, before, after):
+            print(component.name, before, '->', after)
+
+        await watcher.start()
+
+    The events, with their arguments:
+
+    - ``on_<kind>_create(obj)`` and ``on_<kind>_delete(obj)``
+    - ``on_<kind>_edit(before, after, changes)``, with ``changes`` mapping the
+      attribute names to a :class:`FieldChange`
+    - ``on_<kind>_status_change(obj, before, after)``
+    - ``on_incident_update(incident, update)`` and ``on_maintenance_update(maintenance, update)``
+      for an update posted on it
+    - ``on_watch_error(exception)`` when a poll failed; the watcher keeps polling
+
+    where ``<kind>`` is ``component``, ``incident`` or ``maintenance``. The objects are
+    the models the client returns, so with a :class:`~instatus.StateCache` the ``after``
+    object is the cached one. The ``before`` object of an edit and the object of a delete
+    are detached snapshots: they aren't bound to the client, so their methods that send
+    requests raise :exc:`RuntimeError`.
+
+    Parameters
+    -----------
+    client: :class:`StatusClient`
+        The client to poll with.
+    page_id: :class:`str`
+        The status page to watch.
+    interval: :class:`float`
+        The seconds between the start of two polls.
+    watch: Tuple[:class:`str`, ...]
+        The kinds of objects to watch.
+    queue_size: :class:`int`
+        The maximum amount of events waiting for the listeners.
+    chunk_size: :class:`int`
+        The objects diffed between two yields to the event loop.
+    initial_events: :class:`bool`
+        Whether the first poll dispatches a create event for every object,
+        instead of only taking the snapshot.
+    """
+
+    def __init__(self,
+                 client: 'StatusClient',
+                 page_id: str,
+                 *,
+                 interval: float = 30.0,
+                 watch: Tuple[str, ...] = ('component', 'incident'),
+                 queue_size: int = 1000,
+                 chunk_size: int = 500,
+                 initial_events: bool = False):
+        unknown = set(watch).difference(_KINDS)
+        if unknown:
+            raise ValueError('Cannot watch %s, only %s' % (', '.join(sorted(unknown)), ', '.join(_KINDS)))
+        self.client = client
+        self.page_id = page_id
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.initial_events = initial_events
+        self._kinds = [_KINDS[name] for name in watch]
+        self._listeners: Dict[str, List[Listener]] = {}
+        self._queue: 'asyncio.Queue[Tuple[str, tuple]]' = asyncio.Queue(queue_size)
+        # the last payload list of each kind, and the (fingerprint, payload) of each object in it
+        self._payloads: Dict[str, Any] = {}
+        self._snapshots: Dict[str, Dict[str, Tuple[bytes, Dict[str, Any]]]] = {}
+        self._poller: Optional[asyncio.Task] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def __repr__(self):
+        return '<Watcher page_id={0.page_id!r} interval={0.interval} running={0.is_running}>'.format(self)
+
+    async def __aenter__(self) -> 'Watcher':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    @property
+    def is_running(self) -> bool:
+        return self._poller is not None and not self._poller.done()
+
+    # Listeners
+
+    def event(self, coro: Listener) -> Listener:
+        """A decorator registering a coroutine as the listener of the event it is named after."""
+        if not asyncio.iscoroutinefunction(coro):
+            raise TypeError('event registered must be a coroutine function')
+        self.add_listener(coro)
+        return coro
+
+    def listen(self, name: Optional[str] = None):
+        """A decorator registering a coroutine as a listener of ``name``, or the event it is named after."""
+        def decorator(coro: Listener) -> Listener:
+            self.add_listener(coro, name)
+            return coro
+        return decorator
+
+    def add_listener(self, func: Listener, name: Optional[str] = None):
+        if not asyncio.iscoroutinefunction(func):
+            raise TypeError('Listeners must be coroutine functions')
+        self._listeners.setdefault(name or func.__name__, []).append(func)
+
+    def remove_listener(self, func: Listener, name: Optional[str] = None):
+        try:
+            self._listeners[name or func.__name__].remove(func)
+        except (KeyError, ValueError):
+            pass
+
+    # Running
+
+    async def start(self):
+        """Takes the first snapshot and starts polling in the background."""
+        if self.is_running:
+            return
+        self._dispatcher = asyncio.ensure_future(self._dispatch_events())
+        await self.poll()
+        self._poller = asyncio.ensure_future(self._poll_forever())
+
+    async def stop(self):
+        """Stops polling; the events already queued are dispatched first."""
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+        if self._dispatcher is not None:
+            await self._queue.join()
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+    async def _poll_forever(self):
+        loop = asyncio.get_running_loop()
+        next_poll = loop.time() + self.interval
+        while True:
+            await asyncio.sleep(max(next_poll - loop.time(), 0))
+            next_poll = loop.time() + self.interval
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                log.warning('Polling status page %s failed: %r', self.page_id, exc)
+                await self._emit('watch_error', exc)
+
+    async def poll(self):
+        """Fetches every watched kind once and queues the events of the changes."""
+        http = self.client._http
+        results = await asyncio.gather(*(getattr(http, kind.fetch)(self.page_id) for kind in self._kinds))
+        for kind, payloads in zip(self._kinds, results):
+            await self._diff(kind, payloads)
+
+    # Diffing
+
+    async def _diff(self, kind: _Kind, payloads: List[Dict[str, Any]]):
+        if payloads is self._payloads.get(kind.name):
+            # the response cache returned the same list, so nothing changed
+            return
+        self._payloads[kind.name] = payloads
+
+        first = kind.name not in self._snapshots
+        old = self._snapshots.get(kind.name, {})
+        new: Dict[str, Tuple[bytes, Dict[str, Any]]] = {}
+        emit = not first or self.initial_events
+        chunk_size = self.chunk_size
+
+        for index, item in enumerate(payloads):
+            if index and index % chunk_size == 0:
+                await asyncio.sleep(0)
+            object_id = item.get('id')
+            fingerprint = _fingerprint(item)
+            new[object_id] = (fingerprint, item)
+            previous = old.get(object_id)
+            if previous is None:
+                if emit:
+                    await self._emit(kind.name + '_create', self._build(kind, item))
+            elif previous[0] != fingerprint:
+                await self._changed(kind, previous[1], item)
+
+        self._snapshots[kind.name] = new
+        for object_id, (_, item) in old.items():
+            if object_id not in new:
+                self.client._forget(kind.model, self.page_id, object_id)
+                await self._emit(kind.name + '_delete', self._build(kind, item, cached=False))
+
+    async def _changed(self, kind: _Kind, before_payload: Dict[str, Any], after_payload: Dict[str, Any]):
+        changes = {}
+        for key in before_payload.keys() | after_payload.keys():
+            before_value = before_payload.get(key)
+            after_value = after_payload.get(key)
+            if before_value != after_value:
+                changes[kind.slots.get(key, key)] = (key, before_value, after_value)
+        if not changes:
+            return
+
+        before = self._build(kind, before_payload, cached=False)
+        after = self._build(kind, after_payload)
+        fields = {}
+        for name, (key, before_value, after_value) in changes.items():
+            if key in kind.slots:
+                # the model's value, e.g. the enum of a status or a datetime
+                before_value = getattr(before, name)
+                after_value = getattr(after, name)
+            fields[name] = FieldChange(before_value, after_value)
+        await self._emit(kind.name + '_edit', before, after, fields)
+
+        status = fields.get('status')
+        if status is not None:
+            await self._emit(kind.name + '_status_change', after, status.before, status.after)
+
+        if kind.updates_key is not None and kind.slots[kind.updates_key] in changes:
+            known = {update.get('id') for update in before_payload.get(kind.updates_key) or ()
+                     if isinstance(update, dict)}
+            for update in after.updates:
+                if update.id not in known:
+                    await self._emit(kind.name + '_update', after, update)
+
+    def _build(self, kind: _Kind, payload: Dict[str, Any], *, cached: bool = True):
+        if cached:
+            return self.client._model(kind.model, payload, self.page_id)
+        # a snapshot of the old state, never the object of the state cache; without a
+        # state its nested models aren't built through the cache either, which would
+        # roll the cached objects back to the old payloads
+        return kind.model(payload, state=None, page_id=self.page_id)
+
+    # Dispatching
+
+    async def _emit(self, event: str, *args):
+        name = 'on_' + event
+        if self._listeners.get(name):
+            # waits while the queue is full
+            await self._queue.put((name, args))
+
+    async def _dispatch_events(self):
+        queue = self._queue
+        while True:
+            name, args = await queue.get()
+            try:
+                for listener in tuple(self._listeners.get(name, ())):
+                    try:
+                        await listener(*args)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception:
+                        log.exception('Ignoring exception in the %s listener %r', name, listener)
+            finally:
+                queue.task_done()
@@ -54,6 +54,9 @@ extras_require = {
         'sphinx==3.0.3',
         'sphinxcontrib_trio==1.1.2',
         'sphinxcontrib-websupport',
+    ],
+    'analytics': [
+        'numpy>=1.17',
     ]
 }
 
@@ -0,0 +1,67 @@
+import asyncio
+
+from instatus.bulk import run_bulk
+from instatus.errors import NotFound
+from instatus.testing import FakeInstatus
+
+
+async def test_updates_components_and_reports_failures():
+    async with FakeInstatus(rate_limit=1000) as fake:
+        page_id = fake.add_page(components=5)
+        components = list(fake.pages[page_id]['components'])
+        client = fake.client()
+        updates = {component: {'status': 'MAJOROUTAGE'} for component in components}
+        updates['missing'] = {'status': 'MAJOROUTAGE'}
+        progress = []
+        result = await client.bulk_update_components(page_id, updates, concurrency=3,
+                                                     on_progress=lambda *args: progress.append(args[:3]))
+        await client.close()
+
+        assert all(item['status'] == 'MAJOROUTAGE' for item in fake.pages[page_id]['components'].values())
+
+    assert not result.ok
+    assert sorted(result.succeeded) == sorted(components)
+    assert list(result.failed) == ['missing'] and isinstance(result.failed['missing'], NotFound)
+    assert [done for done, _, _ in progress] == [1, 2, 3, 4, 5, 6]
+    assert {total for _, total, _ in progress} == {6}
+
+
+async def test_bounded_concurrency():
+    running = peak = 0
+
+    def call(i):
+        async def run():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return i
+        return run
+
+    result = await run_bulk(((i, call(i)) for i in range(20)), concurrency=4)
+    assert peak == 4
+    assert result == {i: i for i in range(20)}
+
+
+async def test_broken_progress_callbacks_are_ignored():
+    async def fail(i):
+        raise ValueError(i)
+
+    calls = []
+
+    def broken(done, total, key, value):
+        calls.append(key)
+        raise RuntimeError('broken callback')
+
+    async def broken_async(done, total, key, value):
+        raise RuntimeError('broken coroutine callback')
+
+    items = [(i, lambda i=i: fail(i) if i % 2 else asyncio.sleep(0, i)) for i in range(6)]
+    first = await run_bulk(items, concurrency=2, on_progress=broken)
+    second = await run_bulk(items, concurrency=2, on_progress=broken_async)
+
+    for result in (first, second):
+        assert sorted(result.succeeded) == [0, 2, 4]
+        assert sorted(result.failed) == [1, 3, 5]
+    assert sorted(calls) == list(range(6))
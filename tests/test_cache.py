@@ -0,0 +1,95 @@
+import asyncio
+
+from instatus import ResponseCache, StatusClient
+from instatus.http_requests import Route
+from instatus.transport import MemoryTransport
+
+
+def transport_with_components():
+    transport = MemoryTransport()
+    gates = {}
+
+    @transport.route('GET', '/v1/{page_id}/components')
+    async def components(request):
+        gate = gates.get(request.match_info['page_id'])
+        if gate is not None:
+            await gate.wait()
+        return [{'id': 'c1', 'name': 'API', 'page': request.match_info['page_id']}]
+
+    @transport.route('PUT', '/v1/{page_id}/components/{component_id}')
+    async def update(request):
+        return {'id': request.match_info['component_id']}
+
+    return transport, gates
+
+
+def cached_client(transport, cache):
+    return StatusClient('key', loop=asyncio.get_running_loop(), transport=transport, response_cache=cache)
+
+
+async def test_hits_return_copies():
+    transport, _ = transport_with_components()
+    client = cached_client(transport, ResponseCache())
+    first = await client._http.get_all_components('a')
+    first[0]['name'] = 'changed'
+    first.append({})
+    second = await client._http.get_all_components('a')
+    second[0]['name'] = 'changed again'
+    third = await client._http.get_all_components('a')
+    await client.close()
+
+    assert transport.requests == 1
+    assert third == [{'id': 'c1', 'name': 'API', 'page': 'a'}]
+
+
+async def test_modification_drops_only_its_page():
+    transport, _ = transport_with_components()
+    cache = ResponseCache()
+    client = cached_client(transport, cache)
+    for page_id in ('a', 'b'):
+        await client._http.get_all_components(page_id)
+    await client._http.update_component('a', 'c1', {'status': 'OPERATIONAL'})
+    await client._http.get_all_components('b')
+    assert transport.requests == 3
+    await client._http.get_all_components('a')
+    await client.close()
+
+    assert transport.requests == 4
+    assert cache.invalidations == 1
+
+
+async def test_response_in_flight_during_a_modification_is_not_stored():
+    transport, gates = transport_with_components()
+    client = cached_client(transport, ResponseCache())
+    gates['a'] = asyncio.Event()
+    reading = asyncio.ensure_future(client._http.get_all_components('a'))
+    await asyncio.sleep(0.01)
+    await client._http.update_component('a', 'c1', {'status': 'OPERATIONAL'})
+    gates['a'].set()
+    await reading
+    await client._http.get_all_components('a')
+    await client.close()
+
+    assert transport.requests == 3
+
+
+def test_generation_counters_stay_bounded():
+    cache = ResponseCache(max_size=4)
+    headers = {}
+    for i in range(100):
+        route = Route('GET', 'v1/{page_id}/components', page_id='page%d' % i)
+        cache.set(cache.key(route), route, [i], headers, cache.generation(route))
+        cache.invalidate(Route('PUT', 'v1/{page_id}/components/{component_id}', page_id='page%d' % i,
+                               component_id='c'))
+    assert len(cache) <= 4
+    assert len(cache._generations) <= 4
+    assert len(cache._majors) <= 4
+
+    # a page that was modified after its request started isn't stored, its counter or not
+    route = Route('GET', 'v1/{page_id}/components', page_id='page0')
+    generation = cache.generation(route)
+    cache.invalidate(Route('PUT', 'v1/{page_id}', page_id='page0'))
+    for i in range(1, 10):
+        cache.invalidate(Route('PUT', 'v1/{page_id}', page_id='other%d' % i))
+    cache.set(cache.key(route), route, [0], headers, generation)
+    assert cache.get(cache.key(route)) is None
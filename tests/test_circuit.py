@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import pytest
+
+from instatus import StatusClient
+from instatus.circuit import CircuitBreaker, CircuitBreakers
+from instatus.enums import CircuitState
+from instatus.errors import CircuitOpen, InstatusServerError
+from instatus.retry import RetryPolicy
+from instatus.transport import MemoryResponse, MemoryTransport
+
+
+def test_opens_at_the_failure_threshold_and_recovers():
+    breaker = CircuitBreaker('api.instatus.com', failure_threshold=0.5, min_calls=4, open_timeout=0.05)
+    for success in (True, False, True):
+        breaker.before_call()
+        breaker.record(success)
+    assert breaker.state is CircuitState.CLOSED
+    breaker.before_call()
+    breaker.record(False)
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()
+
+    time.sleep(0.06)
+    # one trial call is let through, a second one isn't
+    breaker.before_call()
+    assert breaker.state is CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()
+    breaker.record(True)
+    assert breaker.state is CircuitState.CLOSED and breaker.failure_rate == 0.0
+
+
+def test_failed_trial_opens_again_and_cancelled_trial_is_given_back():
+    breaker = CircuitBreaker('key', min_calls=1, open_timeout=0.01)
+    breaker.before_call()
+    breaker.record(False)
+    time.sleep(0.02)
+    breaker.before_call()
+    breaker.release()
+    breaker.before_call()
+    breaker.record(False)
+    assert breaker.state is CircuitState.OPEN
+
+
+async def test_client_fails_fast_while_the_host_is_down():
+    transport = MemoryTransport()
+    transport.add_route('GET', '/v1/{page_id}/components',
+                        lambda request: MemoryResponse(503, json={'message': 'unavailable'}))
+    transport.add_route('GET', '/summary.json', lambda request: {'page': {'name': 'Page'}})
+    breakers = CircuitBreakers('host', min_calls=3, open_timeout=60)
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport,
+                          retry_policy=RetryPolicy(1), circuit_breakers=breakers)
+    for _ in range(3):
+        with pytest.raises(InstatusServerError):
+            await client._http.get_all_components('page')
+    with pytest.raises(CircuitOpen) as raised:
+        await client._http.get_all_components('page')
+    # the summary host has a breaker of its own
+    summary = await client.fetch_summary('mypage')
+    await client.close()
+
+    assert transport.requests == 4
+    assert raised.value.key == 'api.instatus.com' and raised.value.retry_after > 0
+    assert summary is not None
+    assert sorted(breaker.key for breaker in breakers) == ['api.instatus.com', 'mypage.instatus.com']
@@ -0,0 +1,41 @@
+import pytest
+
+from instatus.codec import OrjsonCodec, StdlibCodec, default_codec
+from instatus.http_requests import json_or_text
+from instatus.transport import MemoryResponse
+
+PAYLOAD = {'name': 'Störung – API', 'ok': True, 'items': [1, 2.5, None]}
+
+
+def codecs():
+    found = [StdlibCodec()]
+    try:
+        found.append(OrjsonCodec())
+    except ImportError:
+        pass
+    return found
+
+
+@pytest.mark.parametrize('codec', codecs(), ids=lambda codec: codec.name)
+def test_round_trip(codec):
+    body = codec.dumps(PAYLOAD)
+    assert isinstance(body, bytes)
+    assert codec.loads(body) == PAYLOAD
+    assert codec.loads(body.decode()) == PAYLOAD
+
+
+def test_stdlib_encodes_ascii():
+    # the same bytes the client sent before the codecs
+    assert StdlibCodec().dumps(PAYLOAD) == b'{"name":"St\\u00f6rung \\u2013 API","ok":true,"items":[1,2.5,null]}'
+
+
+def test_default_codec_is_cached():
+    assert default_codec() is default_codec()
+
+
+async def test_json_or_text():
+    assert await json_or_text(MemoryResponse(json=PAYLOAD)) == PAYLOAD
+    assert await json_or_text(MemoryResponse(body='plain')) == 'plain'
+    latin = MemoryResponse(body='{"name": "Störung"}'.encode('latin-1'),
+                           headers={'Content-Type': 'application/json; charset=latin-1'})
+    assert await json_or_text(latin) == {'name': 'Störung'}
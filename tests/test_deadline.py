@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+import pytest
+
+from instatus import StatusClient
+from instatus.deadline import Deadline
+from instatus.errors import RequestTimeout
+from instatus.transport import MemoryResponse, MemoryTransport
+
+
+def test_deadline_counts_down():
+    deadline = Deadline(0.05)
+    assert 0 < deadline.remaining() <= 0.05 and not deadline.expired
+    assert deadline.client_timeout().total <= 0.05
+    time.sleep(0.06)
+    assert deadline.remaining() == 0.0 and deadline.expired
+
+    later = Deadline(10)
+    deadline.extend(later)
+    assert deadline.when == later.when
+    deadline.extend(None)
+    assert deadline.remaining() == float('inf') and deadline.client_timeout().total is None
+
+
+def slow_transport(delay):
+    transport = MemoryTransport()
+    cancelled = []
+
+    @transport.route('GET', '/v1/{page_id}/components')
+    async def components(request):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(request.url)
+            raise
+        return [{'id': 'c1'}]
+
+    return transport, cancelled
+
+
+async def test_coalesced_callers_keep_their_own_deadlines():
+    transport, cancelled = slow_transport(0.1)
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport)
+    short, long = await asyncio.gather(client._http.get_all_components('page', timeout=0.02),
+                                       client._http.get_all_components('page', timeout=2),
+                                       return_exceptions=True)
+    await client.close()
+
+    # the caller that gave up first didn't cut the shared request short for the other
+    assert isinstance(short, RequestTimeout) and short.timeout == 0.02
+    assert long == [{'id': 'c1'}]
+    assert transport.requests == 1 and not cancelled
+
+
+async def test_shared_request_is_cancelled_once_every_caller_timed_out():
+    transport, cancelled = slow_transport(1)
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport)
+    results = await asyncio.gather(*(client._http.get_all_components('page', timeout=0.02) for _ in range(2)),
+                                   return_exceptions=True)
+    await asyncio.sleep(0.01)
+    await client.close()
+
+    assert all(isinstance(result, RequestTimeout) for result in results)
+    assert len(cancelled) == 1
+
+
+async def test_backoff_past_the_deadline_fails_right_away():
+    transport = MemoryTransport()
+    transport.add_route('GET', '/v1/{page_id}/components',
+                        lambda request: MemoryResponse(503, json={}, headers={'Retry-After': '30'}))
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport)
+    started = time.monotonic()
+    with pytest.raises(RequestTimeout):
+        await client._http.get_all_components('page', timeout=5)
+    await client.close()
+
+    assert time.monotonic() - started < 1
+    assert transport.requests == 1
+
+
+async def test_shared_request_works_towards_the_latest_deadline():
+    transport = MemoryTransport()
+    statuses = [503]
+
+    @transport.route('GET', '/v1/{page_id}/components')
+    async def components(request):
+        if statuses:
+            return MemoryResponse(statuses.pop(), json={}, headers={'Retry-After': '0.1'})
+        return [{'id': 'c1'}]
+
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport)
+    short, unlimited = await asyncio.gather(client._http.get_all_components('page', timeout=0.05),
+                                            client._http.get_all_components('page', timeout=None),
+                                            return_exceptions=True)
+    await client.close()
+
+    # the backoff is longer than the first caller has, but the other one has no deadline
+    assert isinstance(short, RequestTimeout)
+    assert unlimited == [{'id': 'c1'}]
+    assert transport.requests == 2
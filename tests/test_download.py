@@ -0,0 +1,152 @@
+import asyncio
+import os
+
+import aiohttp
+import pytest
+
+from instatus import StatusClient
+from instatus.download import DiskCache
+from instatus.errors import HTTPException
+from instatus.retry import RetryPolicy
+from instatus.transport import MemoryResponse, MemoryTransport
+
+ASSET = os.urandom(50000)
+URL = 'https://cdn.instatus.com/logo.png'
+
+
+class BrokenContent:
+    # sends the first ``size`` bytes of the body, then the connection breaks
+    def __init__(self, body, size):
+        self.body = body
+        self.size = size
+
+    async def iter_chunked(self, chunk_size):
+        yield self.body[:self.size]
+        raise aiohttp.ClientPayloadError('connection lost')
+
+
+class Asset:
+    def __init__(self, transport, etag='"v1"', body=ASSET):
+        self.etag = etag
+        self.body = body
+        self.requests = []
+        # per request: break the transfer after that many bytes, or ignore the range
+        self.plan = []
+        transport.add_route('GET', '/{name}', self.handle)
+
+    def handle(self, request):
+        headers = dict(request.headers)
+        self.requests.append(headers)
+        step = self.plan.pop(0) if self.plan else None
+        if headers.get('If-None-Match') == self.etag:
+            return MemoryResponse(304)
+        start = 0
+        if 'Range' in headers and step != 'ignore range' and headers.get('If-Range') == self.etag:
+            start = int(headers['Range'][6:-1])
+        body = self.body[start:]
+        response_headers = {'ETag': self.etag, 'Content-Type': 'image/png', 'Content-Length': str(len(body))}
+        if start:
+            response_headers['Content-Range'] = 'bytes %d-%d/%d' % (start, len(self.body) - 1, len(self.body))
+        response = MemoryResponse(206 if start else 200, body=body, headers=response_headers)
+        if isinstance(step, int):
+            response.content = BrokenContent(body, step)
+        return response
+
+
+def client_for(transport):
+    return StatusClient('key', loop=asyncio.get_running_loop(), transport=transport,
+                        retry_policy=RetryPolicy(backoff_base=0.01))
+
+
+async def test_broken_transfer_resumes_with_a_range():
+    transport = MemoryTransport()
+    asset = Asset(transport)
+    asset.plan = [20000]
+    client = client_for(transport)
+    download = client._http.download(URL)
+    assert await download.read() == ASSET
+    await client.close()
+
+    assert download.size == len(ASSET) and download.etag == '"v1"'
+    assert asset.requests[1]['Range'] == 'bytes=20000-' and asset.requests[1]['If-Range'] == '"v1"'
+
+
+async def test_resume_when_the_server_ignores_the_range():
+    transport = MemoryTransport()
+    asset = Asset(transport)
+    asset.plan = [20000, 'ignore range']
+    client = client_for(transport)
+    assert await client._http.download(URL).read() == ASSET
+    await client.close()
+
+
+async def test_asset_changed_during_the_download():
+    transport = MemoryTransport()
+    asset = Asset(transport)
+    asset.plan = [20000]
+    client = client_for(transport)
+    chunks = []
+    with pytest.raises(HTTPException):
+        async for chunk in client._http.download(URL):
+            chunks.append(chunk)
+            asset.etag = '"v2"'
+    await client.close()
+    assert b''.join(chunks) == ASSET[:20000]
+
+
+async def test_to_file_resumes_a_left_over_part(tmp_path):
+    transport = MemoryTransport()
+    asset = Asset(transport)
+    asset.plan = [30000]
+    client = client_for(transport)
+    path = str(tmp_path / 'logo.png')
+    # the first call gives up after the connection broke
+    with pytest.raises(aiohttp.ClientPayloadError):
+        await client._http.download(URL, retry_policy=RetryPolicy(1)).to_file(path)
+    assert os.path.getsize(path + '.part') == 30000 and os.path.exists(path + '.part.etag')
+
+    # the next one continues at the end of the part, also when the server answers with a 200
+    asset.plan = ['ignore range']
+    assert await client._http.download(URL).to_file(path) == len(ASSET)
+    await client.close()
+
+    with open(path, 'rb') as fp:
+        assert fp.read() == ASSET
+    assert asset.requests[-1]['Range'] == 'bytes=30000-'
+    assert not os.path.exists(path + '.part') and not os.path.exists(path + '.part.etag')
+
+
+async def test_disk_cache_revalidates_and_dedupes(tmp_path):
+    transport = MemoryTransport()
+    asset = Asset(transport)
+    cache = DiskCache(str(tmp_path / 'cache'))
+    client = client_for(transport)
+    first = client._http.download(URL, cache=cache)
+    assert await first.read() == ASSET and not first.from_cache
+
+    again = client._http.download(URL, cache=cache)
+    assert await again.read() == ASSET and again.from_cache
+    assert asset.requests[-1]['If-None-Match'] == '"v1"'
+
+    # the same content under another url is stored once
+    await client._http.download('https://cdn.instatus.com/favicon.png', cache=cache).read()
+    await client.close()
+    objects = [name for _, _, names in os.walk(tmp_path / 'cache' / 'objects') for name in names]
+    assert len(objects) == 1
+
+
+async def test_fresh_entries_are_not_revalidated_and_prune_keeps_the_limit(tmp_path):
+    transport = MemoryTransport()
+    asset = Asset(transport)
+    cache = DiskCache(str(tmp_path / 'cache'), fresh_for=60, max_size=len(ASSET))
+    client = client_for(transport)
+    await client._http.download(URL, cache=cache).read()
+    assert await client._http.download(URL, cache=cache).read() == ASSET
+    assert len(asset.requests) == 1
+
+    asset.body = os.urandom(len(ASSET))
+    await client._http.download('https://cdn.instatus.com/other.png', cache=cache).read()
+    await client.close()
+    # the least recently used url was dropped to stay within max_size
+    assert cache.lookup(URL) is None
+    assert cache.lookup('https://cdn.instatus.com/other.png') is not None
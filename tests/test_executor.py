@@ -0,0 +1,87 @@
+import gc
+import asyncio
+import warnings
+import concurrent.futures
+
+import pytest
+
+from instatus.executor import LoopExecutor, SyncStatusClient
+from instatus.testing import FakeInstatus
+
+
+async def value(x):
+    await asyncio.sleep(0)
+    return x
+
+
+async def fail():
+    raise ValueError('failed')
+
+
+@pytest.fixture
+def executor():
+    executor = LoopExecutor()
+    yield executor
+    executor.shutdown()
+
+
+def test_submit(executor):
+    assert executor.submit(value(1)) == 1
+    # a function is called on the loop
+    assert executor.submit(lambda: value(2)) == 2
+    with pytest.raises(ValueError):
+        executor.submit(fail())
+
+
+def test_submit_timeout_cancels(executor):
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(concurrent.futures.TimeoutError):
+        executor.submit(slow(), timeout=0.05)
+    executor.submit(asyncio.sleep(0.05))
+    assert cancelled == [True]
+
+
+def test_submit_many(executor):
+    assert executor.submit_many([value(1), lambda: value(2)]) == [1, 2]
+    results = executor.submit_many([fail(), value(3)], return_exceptions=True)
+    assert isinstance(results[0], ValueError) and results[1] == 3
+    with pytest.raises(ValueError):
+        executor.submit_many([fail(), value(3)])
+
+
+def test_failed_submission_leaves_no_coroutine_unawaited():
+    executor = LoopExecutor()
+    loop = executor.loop_for()
+    executor.shutdown()
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        with pytest.raises(RuntimeError):
+            executor.submit(value(1), loop=loop)
+        with pytest.raises(RuntimeError):
+            executor.submit_many([value(1), value(2)], loop=loop)
+        gc.collect()
+    assert not [warning for warning in caught if 'never awaited' in str(warning.message)]
+
+
+def test_sync_client(executor):
+    fake = FakeInstatus()
+    executor.submit(fake.start())
+    try:
+        page_id = fake.add_page(components=3)
+        client = SyncStatusClient('fake-key', executor=executor, transport=fake.transport())
+        components = client.get_all_components(page_id)
+        assert len(components) == 3
+        component_ids = [component.id for component in components]
+        fetched = client.submit_many('get_component', [(page_id, component_id) for component_id in component_ids])
+        assert [component.id for component in fetched] == component_ids
+        client.close()
+    finally:
+        executor.submit(fake.close())
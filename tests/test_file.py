@@ -0,0 +1,82 @@
+import asyncio
+import io
+import os
+
+from aiohttp import web
+
+from instatus import StatusClient
+from instatus.file import File
+from instatus.http_requests import Route
+from instatus.retry import RetryPolicy
+
+CONTENT = os.urandom(100000)
+
+
+def read(file):
+    return b''.join(bytes(chunk) for chunk in file.iter_chunks())
+
+
+def test_every_source_reads_the_same_chunks(tmp_path):
+    path = tmp_path / 'logo.png'
+    path.write_bytes(CONTENT)
+    buffer = io.BytesIO(b'skipped' + CONTENT)
+    buffer.seek(7)
+    # no file descriptor, so the reads seek under a lock
+    unbuffered = io.BufferedReader(io.BytesIO(CONTENT))
+
+    sources = [File(CONTENT, 'logo.png'), File(str(path), chunk_size=4096), File(path, use_mmap=True),
+               File(buffer, 'logo.png'), File(unbuffered, 'logo.png')]
+    for file in sources:
+        with file:
+            assert file.size == len(CONTENT)
+            assert file.filename == 'logo.png' and file.content_type == 'image/png'
+            assert read(file) == CONTENT and read(file) == CONTENT
+            assert bytes(file.read_chunk(99990, 100)) == CONTENT[99990:]
+
+
+def test_path_is_closed_with_the_file(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(b'data')
+    file = File(path)
+    assert file.content_type == 'application/octet-stream'
+    file.close()
+    assert file.fp.closed
+
+    kept = open(path, 'rb')
+    File(kept).close()
+    assert not kept.closed
+    kept.close()
+
+
+async def test_upload_is_retried_from_the_start(tmp_path):
+    bodies = []
+
+    async def upload(request):
+        bodies.append((request.headers.get('Content-Length'), await request.read()))
+        if len(bodies) == 1:
+            return web.json_response({'message': 'unavailable'}, status=503)
+        return web.json_response({'ok': True})
+
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', upload)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    socket = str(tmp_path / 'server.sock')
+    await web.UnixSite(runner, socket).start()
+    try:
+        client = StatusClient('key', loop=asyncio.get_running_loop(), gateway=socket,
+                              retry_policy=RetryPolicy(backoff_base=0.01))
+        path = tmp_path / 'logo.png'
+        path.write_bytes(CONTENT)
+        with File(path, chunk_size=8192) as logo:
+            result = await client._http.request(Route('PUT', 'v1/{page_id}', page_id='page'),
+                                                form=[logo.form_field('logo')], files=[logo])
+        await client.close()
+    finally:
+        await runner.cleanup()
+
+    assert result == {'ok': True}
+    assert len(bodies) == 2
+    for length, body in bodies:
+        # sent with a length rather than chunked, and the retry with the whole file again
+        assert int(length) == len(body) and CONTENT in body
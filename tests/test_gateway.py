@@ -0,0 +1,82 @@
+import time
+
+import aiohttp
+
+from instatus.gateway import Gateway
+from instatus.http_requests import GATEWAY_BUCKET_HEADER, GATEWAY_URL_HEADER
+from instatus.transport import MemoryResponse, MemoryTransport
+
+
+async def test_forwards_only_instatus_urls(tmp_path):
+    transport = MemoryTransport()
+    seen = []
+
+    async def anything(request):
+        seen.append((request.url, request.headers.get('Authorization')))
+        return {'ok': True}
+
+    transport.add_route('GET', '/v1/pages', anything)
+    transport.add_route('GET', '/summary.json', anything)
+
+    gateway = Gateway(str(tmp_path / 'gateway.sock'), transport=transport)
+    await gateway.start()
+    try:
+        async with aiohttp.ClientSession(connector=aiohttp.UnixConnector(path=gateway.path)) as session:
+            async def send(url):
+                headers = {GATEWAY_URL_HEADER: url, 'Authorization': 'Bearer secret'}
+                async with session.get('http://gateway/', headers=headers) as r:
+                    return r.status
+
+            assert await send('https://api.instatus.com/v1/pages') == 200
+            assert await send('https://page.instatus.com/summary.json') == 200
+            for url in ('https://example.com/', 'http://api.instatus.com/v1/pages',
+                        'https://api.instatus.com.example.com/', 'https://user@api.instatus.com/'):
+                assert await send(url) == 400, url
+            async with session.get('http://gateway/') as r:
+                assert r.status == 400
+    finally:
+        await gateway.close()
+
+    assert seen == [('https://api.instatus.com/v1/pages', 'Bearer secret'),
+                    ('https://page.instatus.com/summary.json', 'Bearer secret')]
+
+
+async def test_shares_a_429_and_answers_502_for_connection_errors(tmp_path):
+    transport = MemoryTransport()
+    arrived = []
+
+    def components(request):
+        arrived.append(time.monotonic())
+        if len(arrived) == 1:
+            # another process ran the bucket dry
+            return MemoryResponse(429, json={'message': 'You are being rate limited.', 'retry_after': 300,
+                                             'global': False},
+                                  headers={'X-Ratelimit-Remaining': '0', 'X-Ratelimit-Reset-After': '0.3'})
+        return MemoryResponse(200, json=[], headers={'X-Ratelimit-Remaining': '10', 'X-Ratelimit-Limit': '30'})
+
+    def unreachable(request):
+        raise OSError('connection refused')
+
+    transport.add_route('GET', '/v1/{page_id}/components', components)
+    transport.add_route('GET', '/v1/pages', unreachable)
+
+    gateway = Gateway(str(tmp_path / 'gateway.sock'), transport=transport)
+    await gateway.start()
+    try:
+        async with aiohttp.ClientSession(connector=aiohttp.UnixConnector(path=gateway.path)) as session:
+            async def send(url, authorization='Bearer secret'):
+                headers = {GATEWAY_URL_HEADER: url, GATEWAY_BUCKET_HEADER: 'GET /v1/p1/components',
+                           'Authorization': authorization}
+                async with session.get('http://gateway/', headers=headers) as r:
+                    return r.status
+
+            url = 'https://api.instatus.com/v1/p1/components'
+            assert await send(url) == 429
+            # a request of another worker with the same key waits for the retry_after the gateway saw
+            assert await send(url) == 200
+            assert arrived[1] - arrived[0] >= 0.25
+            # a different api key has a budget of its own
+            assert await send(url, 'Bearer other') == 200
+            assert await send('https://api.instatus.com/v1/pages') == 502
+    finally:
+        await gateway.close()
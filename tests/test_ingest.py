@@ -0,0 +1,102 @@
+import asyncio
+import threading
+
+from instatus import StatusClient
+from instatus.retry import RetryPolicy
+from instatus.testing import FakeInstatus
+from instatus.transport import MemoryResponse, MemoryTransport
+
+
+async def test_batches_points_per_metric():
+    async with FakeInstatus() as fake:
+        page_id = fake.add_page(metrics=2)
+        first, second = fake.pages[page_id]['metrics']
+        client = fake.client()
+        writer = client.datapoint_writer(max_batch=3, max_age=60)
+        for i in range(5):
+            assert writer.write(page_id, first, i, timestamp=1000 + i)
+        assert await writer.put(page_id, second, 1.5, timestamp=1000)
+        await writer.close()
+        await client.close()
+
+        assert [point['value'] for point in fake.pages[page_id]['metrics'][first]['data']] == [0, 1, 2, 3, 4]
+        assert fake.pages[page_id]['metrics'][second]['data'] == [{'timestamp': 1000, 'value': 1.5}]
+    stats = writer.stats()
+    assert (stats['flushed'], stats['batches'], stats['failed'], stats['pending']) == (6, 3, 0, 0)
+
+
+async def test_failed_batches_are_retried():
+    transport = MemoryTransport()
+    received = []
+    statuses = [503, 503]
+
+    @transport.route('POST', '/v1/{page_id}/metrics/{metric_id}')
+    async def datapoints(request):
+        if statuses:
+            return MemoryResponse(statuses.pop(0), json={'message': 'unavailable'})
+        received.append(request.body)
+        return {'id': request.match_info['metric_id']}
+
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport,
+                          retry_policy=RetryPolicy(backoff_base=0.01))
+    writer = client.datapoint_writer(max_age=60)
+    writer.write('page', 'metric', 1.0, timestamp=1000)
+    await writer.close()
+    await client.close()
+
+    # one request per attempt, the http client didn't retry on top of the writer
+    assert transport.requests == 3
+    assert len(received) == 1
+    stats = writer.stats()
+    assert (stats['flushed'], stats['failed'], stats['retried']) == (1, 0, 2)
+
+
+async def test_gives_up_after_the_retry_policy():
+    transport = MemoryTransport()
+    transport.add_route('POST', '/v1/{page_id}/metrics/bad', lambda request: MemoryResponse(400, json={}))
+    transport.add_route('POST', '/v1/{page_id}/metrics/{metric_id}', lambda request: MemoryResponse(500, json={}))
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport)
+    writer = client.datapoint_writer(max_age=60, retry_policy=RetryPolicy(2, backoff_base=0.01))
+    writer.write('page', 'metric', 1.0)
+    writer.write('page', 'bad', 1.0)
+    await writer.close()
+    await client.close()
+
+    # a 400 isn't retried, the 500 is sent max_tries times
+    assert transport.requests == 3
+    stats = writer.stats()
+    assert (stats['flushed'], stats['failed'], stats['retried'], stats['pending']) == (0, 2, 1, 0)
+
+
+async def test_blocked_write_returns_false_once_closed():
+    transport = MemoryTransport()
+    release = asyncio.Event()
+
+    @transport.route('POST', '/v1/{page_id}/metrics/{metric_id}')
+    async def datapoints(request):
+        await release.wait()
+        return {}
+
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport)
+    writer = client.datapoint_writer(max_pending=1, max_age=0)
+    assert await writer.put('page', 'metric', 1.0)
+    # the first point is in flight and holds all the room
+    await asyncio.sleep(0.01)
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(writer.write('page', 'metric', 2.0)))
+    thread.start()
+    waiter = asyncio.ensure_future(writer.put('page', 'metric', 3.0))
+    await asyncio.sleep(0.01)
+
+    closing = asyncio.ensure_future(writer.close())
+    await asyncio.sleep(0.01)
+    release.set()
+    await closing
+    await asyncio.get_running_loop().run_in_executor(None, thread.join)
+    await client.close()
+
+    assert results == [False]
+    assert await waiter is False
+    stats = writer.stats()
+    assert (stats['flushed'], stats['dropped']) == (1, 2)
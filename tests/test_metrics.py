@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from instatus.metrics import Histogram, RequestMetrics
+from instatus.retry import RetryPolicy
+from instatus.testing import FakeInstatus
+
+
+def test_histogram_quantiles():
+    histogram = Histogram((0.1, 0.2, 0.4))
+    for value in (0.05, 0.15, 0.15, 0.3):
+        histogram.observe(value)
+    assert list(histogram.cumulative()) == [(0.1, 1), (0.2, 3), (0.4, 4), (float('inf'), 4)]
+    assert histogram.quantile(0.5) == pytest.approx(0.15)
+    assert histogram.quantile(1.0) == pytest.approx(0.4)
+    assert Histogram().quantile(0.5) == 0.0
+
+
+async def test_hooks_see_every_attempt():
+    async with FakeInstatus(rate_limit=1, window=0.2) as fake:
+        page_id = fake.add_page(components=1)
+        component_id = next(iter(fake.pages[page_id]['components']))
+        client = fake.client(coalesce_requests=False, retry_policy=RetryPolicy(backoff_base=0.01))
+        events = []
+        client.add_hook('on_request_start', lambda info: events.append(('start', info.attempt)))
+        client.add_hook('on_request_end', lambda info: events.append(('end', info.status)))
+        client.add_hook('on_ratelimited', lambda info, retry_after, is_global: events.append(('429', is_global)))
+        client.add_hook('on_retry', lambda info, delay: events.append(('retry', info.attempt)))
+
+        def broken(info):
+            raise RuntimeError('broken hook')
+
+        client.add_hook('on_request_end', broken)
+        metrics = RequestMetrics().install(client)
+        # another client with the same key used up the window, so the first attempt gets a 429
+        other = fake.client()
+        await other.get_component(page_id, component_id)
+        await other.close()
+        await client.get_component(page_id, component_id)
+        await client.get_component(page_id, component_id)
+        metrics.uninstall(client)
+        await client.get_component(page_id, component_id)
+        await client.close()
+
+    assert events[:5] == [('start', 0), ('429', False), ('end', 429), ('retry', 0), ('start', 1)]
+    assert events.count(('end', 200)) == 3
+
+    summary = metrics.summary()['GET v1/{page_id}/components/{component_id}']
+    assert summary['requests'] == 3 and summary['statuses'] == {200: 2, 429: 1}
+    assert summary['ratelimited'] == 1 and summary['retries'] == 1
+    text = metrics.to_prometheus()
+    assert 'instatus_request_duration_seconds_bucket{' in text
+    assert 'route="v1/{page_id}/components/{component_id}"' in text
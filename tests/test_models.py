@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from instatus.enums import ComponentStatus
+from instatus.models import Component, Incident, ModelSequence
+
+
+def incident_payload(**extra):
+    return dict({
+        'id': 'i1',
+        'name': 'Outage',
+        'status': 'INVESTIGATING',
+        'impact': 'MAJOROUTAGE',
+        'started': '2022-05-01T10:00:00.000Z',
+        'components': [{'id': 'c1', 'name': 'API', 'status': 'MAJOROUTAGE'}],
+        'incidentUpdates': [{'id': 'u1', 'message': 'Looking into it', 'status': 'INVESTIGATING'}],
+    }, **extra)
+
+
+def test_attributes_are_parsed():
+    incident = Incident(incident_payload())
+    assert incident.name == 'Outage'
+    assert incident.started_at.year == 2022
+    assert [update.message for update in incident.updates] == ['Looking into it']
+    assert incident.components[0].status is ComponentStatus.MAJOROUTAGE
+
+
+def test_mapping_interface():
+    payload = incident_payload(unknownKey=1)
+    incident = Incident(payload)
+    # the nested models are built first, the mapping still returns the payloads
+    incident.updates
+    assert incident['name'] == 'Outage'
+    assert incident['status'] == 'INVESTIGATING'
+    assert [update['message'] for update in incident['incidentUpdates']] == ['Looking into it']
+    assert incident['unknownKey'] == 1
+    assert incident.get('name') == 'Outage'
+    assert incident.get('missing', 'default') == 'default'
+    assert 'name' in incident and 'unknownKey' in incident and 'missing' not in incident
+    # the known fields are there even if the payload didn't have them
+    assert 'resolved' in incident and incident['resolved'] is None
+    assert set(incident.keys()) >= set(payload)
+    assert dict(incident) == incident.to_dict() == dict(incident.items())
+    assert json.loads(json.dumps(incident.to_dict()))['name'] == 'Outage'
+    with pytest.raises(KeyError):
+        incident['missing']
+
+
+def test_component_ids_as_strings():
+    incident = Incident(incident_payload(components=['c1', 'c2']))
+    assert [component.id for component in incident.components] == ['c1', 'c2']
+
+
+def test_sequence_builds_lazily():
+    payloads = [{'id': 'c%d' % i, 'name': 'Component %d' % i, 'status': 'OPERATIONAL'} for i in range(3)]
+    built = []
+
+    def factory(data):
+        built.append(data['id'])
+        return Component(data)
+
+    components = ModelSequence(payloads, factory)
+    assert len(components) == 3 and built == []
+    assert components[1].name == 'Component 1'
+    assert built == ['c1']
+    assert components.get('c2').id == 'c2'
+    assert [component.id for component in components] == ['c0', 'c1', 'c2']
+    assert built == ['c1', 'c2', 'c0']
+    assert [payload['name'] for payload in components.to_list()] == ['Component 0', 'Component 1', 'Component 2']
+    assert payloads[0] is not components[0]
@@ -0,0 +1,51 @@
+import asyncio
+
+from instatus import StatusClient
+from instatus.transport import MemoryTransport
+
+
+def paginated(count):
+    transport = MemoryTransport()
+    pages = []
+
+    @transport.route('GET', '/v1/{page_id}/components')
+    async def components(request):
+        page, per_page = int(request.query['page']), int(request.query['per_page'])
+        pages.append(page)
+        start = (page - 1) * per_page
+        return [{'id': 'c%d' % i, 'name': 'Component %d' % i} for i in range(start, min(start + per_page, count))]
+
+    return transport, pages
+
+
+async def test_yields_every_item_across_pages():
+    transport, pages = paginated(25)
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport)
+    components = await client.paginate_components('page', per_page=10).flatten()
+    await client.close()
+
+    assert [component.id for component in components] == ['c%d' % i for i in range(25)]
+    assert sorted(pages) == [1, 2, 3]
+
+
+async def test_limit_on_a_page_boundary_requests_no_more_pages():
+    for prefetch in (0, 1, 5):
+        transport, pages = paginated(100)
+        client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport)
+        components = await client.paginate_components('page', per_page=10, prefetch=prefetch, limit=20).flatten()
+        await client.close()
+
+        assert len(components) == 20
+        assert sorted(pages) == [1, 2], prefetch
+
+
+async def test_limit_inside_a_page():
+    transport, pages = paginated(100)
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport)
+    components = await client.paginate_components('page', per_page=10, prefetch=5, limit=15).flatten()
+    none = await client.paginate_components('page', per_page=10, limit=0).flatten()
+    await client.close()
+
+    assert [component.id for component in components] == ['c%d' % i for i in range(15)]
+    assert none == []
+    assert sorted(pages) == [1, 2]
@@ -0,0 +1,54 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from instatus import StatusClient
+from instatus.errors import RequestTimeout
+from instatus.http_requests import Route, RouteTemplate
+from instatus.transport import MemoryTransport
+
+
+def test_route_timeouts():
+    assert Route('GET', 'v1/{page_id}/components', page_id='p').template.timeout == 60.0
+    assert Route('GET', 'v1/{page_id}/components/{component_id}', page_id='p',
+                 component_id='c').template.timeout == RouteTemplate.DEFAULT_TIMEOUT
+
+
+async def test_route_timeout_is_the_default_deadline(monkeypatch):
+    transport = MemoryTransport()
+
+    @transport.route('GET', '/v1/{page_id}/components')
+    async def components(request):
+        await asyncio.sleep(0.2)
+        return []
+
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport)
+    monkeypatch.setattr(RouteTemplate.get('v1/{page_id}/components'), 'timeout', 0.05)
+    with pytest.raises(RequestTimeout) as raised:
+        await client._http.get_all_components('page')
+    # an explicit timeout takes precedence over the one of the template
+    assert await asyncio.wait_for(client._http.get_all_components('page', timeout=None), 2) == []
+    await client.close()
+
+    assert raised.value.timeout == 0.05
+
+
+async def test_warmup_opens_connections_to_each_host():
+    transport = MemoryTransport()
+    hosts = []
+
+    @transport.route('HEAD', '/')
+    async def head(request):
+        host = request.url.split('/')[2]
+        hosts.append(host)
+        if host == 'down.instatus.com':
+            raise aiohttp.ClientConnectionError('unreachable')
+        return {}
+
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport)
+    # a host that can't be reached doesn't fail the warmup
+    await client.warmup(2, prod_names=['mypage', 'down'])
+    await client.close()
+
+    assert sorted(hosts) == ['api.instatus.com'] * 2 + ['down.instatus.com'] * 2 + ['mypage.instatus.com'] * 2
@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+from instatus.ratelimit import Bucket
+from instatus.testing import FakeInstatus
+
+
+class Response:
+    def __init__(self, remaining, limit=10, reset_after=1.0):
+        self.headers = {'X-Ratelimit-Remaining': str(remaining), 'X-Ratelimit-Limit': str(limit),
+                        'X-Ratelimit-Reset-After': str(reset_after)}
+
+
+async def test_unknown_bucket_lets_one_probe_through():
+    bucket = Bucket('v1/{page_id}/components:p', asyncio.get_running_loop())
+    await bucket.acquire()
+    second = asyncio.ensure_future(bucket.acquire())
+    third = asyncio.ensure_future(bucket.acquire())
+    await asyncio.sleep(0)
+    assert not second.done() and not third.done()
+
+    # the response of the probe tells there is room for both
+    bucket.update(Response(remaining=5))
+    bucket.release()
+    await asyncio.wait_for(asyncio.gather(second, third), 1)
+    assert bucket.in_flight == 2
+
+
+async def test_exhausted_bucket_waits_for_the_reset():
+    bucket = Bucket('key', asyncio.get_running_loop())
+    await bucket.acquire()
+    bucket.update(Response(remaining=0, reset_after=0.1))
+    bucket.release()
+    assert bucket.is_exhausted
+
+    started = time.monotonic()
+    await asyncio.wait_for(bucket.acquire(), 1)
+    assert time.monotonic() - started >= 0.05
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    bucket = Bucket('key', asyncio.get_running_loop())
+    await bucket.acquire()
+    waiter = asyncio.ensure_future(bucket.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    assert not bucket._waiters
+
+
+async def test_concurrent_requests_stay_within_the_limit():
+    async with FakeInstatus(rate_limit=10, window=0.5, latency=0.02) as fake:
+        page_id = fake.add_page(components=5)
+        components = list(fake.pages[page_id]['components'])
+        client = fake.client(coalesce_requests=False)
+        started = time.monotonic()
+        await asyncio.gather(*(client.get_component(page_id, components[i % 5]) for i in range(25)))
+        elapsed = time.monotonic() - started
+        await client.close()
+
+    # 25 requests at 10 per half second need two resets, and none of them was turned away
+    assert fake.stats['requests'] == 25
+    assert fake.stats['rate_limited'] == 0
+    assert elapsed >= 0.9
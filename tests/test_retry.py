@@ -0,0 +1,86 @@
+import asyncio
+import email.utils
+import time
+
+import aiohttp
+import pytest
+
+from instatus import StatusClient
+from instatus.errors import InstatusServerError, NotFound
+from instatus.retry import RetryBudget, RetryPolicy
+from instatus.transport import MemoryResponse, MemoryTransport
+
+
+class Response:
+    def __init__(self, retry_after):
+        self.headers = {'Retry-After': retry_after}
+
+
+def test_policy_decisions():
+    policy = RetryPolicy(3, backoff_base=1.0, backoff_cap=4.0)
+    assert [policy.can_retry(tries) for tries in range(3)] == [True, True, False]
+    assert policy.should_retry_status(503) and not policy.should_retry_status(404)
+    assert policy.should_retry_exception(asyncio.TimeoutError())
+    assert policy.should_retry_exception(aiohttp.ServerDisconnectedError())
+    assert not policy.should_retry_exception(ValueError())
+    assert not RetryPolicy(retry_timeouts=False).should_retry_exception(asyncio.TimeoutError())
+    assert all(0 <= policy.backoff(tries) <= 4.0 for tries in range(10) for _ in range(20))
+
+
+def test_retry_after_header():
+    policy = RetryPolicy()
+    assert policy.delay(0, Response('7')) == 7.0
+    date = email.utils.formatdate(time.time() + 60, usegmt=True)
+    assert 55 < policy.delay(0, Response(date)) <= 60
+    # an unparsable header falls back to the backoff
+    assert 0 <= policy.delay(0, Response('soon')) <= 1.0
+    assert RetryPolicy(respect_retry_after=False).delay(0, Response('7')) <= 1.0
+
+
+def test_budget_limits_the_share_of_retries():
+    budget = RetryBudget(0.5, min_per_second=0, window=10)
+    for _ in range(4):
+        budget.record_request()
+    assert [budget.try_retry() for _ in range(3)] == [True, True, False]
+
+
+def flaky(statuses):
+    transport = MemoryTransport()
+
+    @transport.route('GET', '/v1/{page_id}/components')
+    async def components(request):
+        if statuses:
+            return MemoryResponse(statuses.pop(0), json={'message': 'failed'}, headers={'Retry-After': '0'})
+        return [{'id': 'c1'}]
+
+    return transport
+
+
+async def test_retries_the_retry_statuses():
+    transport = flaky([503, 502])
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport)
+    assert await client._http.get_all_components('page') == [{'id': 'c1'}]
+    await client.close()
+    assert transport.requests == 3
+
+
+async def test_gives_up_after_max_tries_or_on_other_statuses():
+    transport = flaky([500, 500, 404])
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport,
+                          retry_policy=RetryPolicy(2))
+    with pytest.raises(InstatusServerError):
+        await client._http.get_all_components('page')
+    with pytest.raises(NotFound):
+        await client._http.get_all_components('page')
+    await client.close()
+    assert transport.requests == 3
+
+
+async def test_empty_budget_stops_the_retries():
+    transport = flaky([503, 503])
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport,
+                          retry_budget=RetryBudget(0, min_per_second=0))
+    with pytest.raises(InstatusServerError):
+        await client._http.get_all_components('page')
+    await client.close()
+    assert transport.requests == 1
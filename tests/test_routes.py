@@ -0,0 +1,29 @@
+from instatus.http_requests import Route, RouteTemplate
+
+
+def test_templates_are_interned():
+    first = Route('GET', 'v1/{page_id}/incidents/{incident_id}', page_id='p1', incident_id='i1')
+    second = Route('PUT', 'v1/{page_id}/incidents/{incident_id}', page_id='p1', incident_id='i2')
+    assert first.template is second.template is RouteTemplate.get('v1/{page_id}/incidents/{incident_id}')
+
+
+def test_urls_quote_the_parameters():
+    route = Route('GET', 'v1/{page_id}/components/{component_id}', page_id='p 1', component_id='c?1')
+    assert route.url == 'https://api.instatus.com/v1/p%201/components/c%3F1'
+    assert Route('GET', 'v1/pages').url == 'https://api.instatus.com/v1/pages'
+    summary = Route('GET', full_url='https://{prod_name}.instatus.com/summary.json', prod_name='mypage')
+    assert summary.url == 'https://mypage.instatus.com/summary.json'
+
+
+def test_bucket_is_the_template_and_its_major_parameter():
+    first = Route('GET', 'v1/{page_id}/incidents/{incident_id}', page_id='p1', incident_id='i1')
+    second = Route('GET', 'v1/{page_id}/incidents/{incident_id}', page_id='p1', incident_id='i2')
+    other_page = Route('GET', 'v1/{page_id}/incidents/{incident_id}', page_id='p2', incident_id='i1')
+
+    # all ids of a page share one bucket, the same interned string
+    assert first.bucket is second.bucket
+    assert first.bucket == 'v1/{page_id}/incidents/{incident_id}:p1'
+    assert other_page.bucket != first.bucket
+    assert Route('GET', 'v1/pages').bucket == 'v1/pages'
+    assert Route('GET', full_url='https://{prod_name}.instatus.com/summary.json',
+                 prod_name='mypage').template.major == 'prod_name'
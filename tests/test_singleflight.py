@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from instatus import StatusClient
+from instatus.errors import NotFound
+from instatus.singleflight import SingleFlight
+from instatus.transport import MemoryResponse, MemoryTransport
+
+
+def slow_components(status=200):
+    transport = MemoryTransport()
+
+    @transport.route('GET', '/v1/{page_id}/components')
+    async def components(request):
+        await asyncio.sleep(0.05)
+        if status != 200:
+            return MemoryResponse(status, json={'message': 'Not found'})
+        return [{'id': 'c1', 'page': request.match_info['page_id']}]
+
+    @transport.route('POST', '/v1/{page_id}/components')
+    async def create(request):
+        await asyncio.sleep(0.05)
+        return {'id': 'c2'}
+
+    return transport
+
+
+async def test_identical_gets_share_one_request():
+    transport = slow_components()
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport)
+    same = await asyncio.gather(*(client._http.get_all_components('a') for _ in range(5)))
+    other = await client._http.get_all_components('b')
+    await asyncio.gather(*(client._http.create_component('a', {'name': 'Web'}) for _ in range(2)))
+    await client.close()
+
+    assert all(result == [{'id': 'c1', 'page': 'a'}] for result in same)
+    assert other == [{'id': 'c1', 'page': 'b'}]
+    # one GET for page a, one for page b, and both POSTs
+    assert transport.requests == 4
+    assert client._http._single_flight.coalesced == 4
+
+
+async def test_every_caller_gets_the_exception():
+    transport = slow_components(status=404)
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport)
+    results = await asyncio.gather(*(client._http.get_all_components('a') for _ in range(3)),
+                                   return_exceptions=True)
+    await client.close()
+
+    assert all(isinstance(result, NotFound) for result in results)
+    assert transport.requests == 1
+
+
+async def test_shared_task_is_cancelled_with_its_last_caller():
+    flight = SingleFlight()
+    started = asyncio.Event()
+    release = asyncio.Event()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        started.set()
+        await release.wait()
+        return 'done'
+
+    first = asyncio.ensure_future(flight.do('key', work))
+    second = asyncio.ensure_future(flight.do('key', work))
+    await started.wait()
+    task = flight._calls['key'].task
+
+    first.cancel()
+    await asyncio.gather(first, return_exceptions=True)
+    assert not task.cancelled()
+    release.set()
+    assert await second == 'done'
+    assert runs == [1] and len(flight) == 0
+
+    release.clear()
+    third = asyncio.ensure_future(flight.do('key', work))
+    await asyncio.sleep(0)
+    task = flight._calls['key'].task
+    third.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await third
+    await asyncio.sleep(0)
+    assert task.cancelled() and len(flight) == 0
@@ -0,0 +1,72 @@
+import time
+
+from instatus.enums import ComponentStatus, IncidentStatus
+from instatus.models import Component
+from instatus.state import CachePolicy, StateCache
+from instatus.testing import FakeInstatus
+
+
+async def test_one_object_per_id_updated_in_place():
+    async with FakeInstatus() as fake:
+        page_id = fake.add_page(components=3, incidents=1)
+        client = fake.client(state_cache=StateCache())
+        components = await client.get_all_components(page_id)
+        component = components[0]
+        assert client.get_cached_component(page_id, component.id) is component
+        assert len(client.get_cached_components(page_id)) == 3
+
+        fake.pages[page_id]['components'][component.id]['name'] = 'Renamed'
+        assert await client.get_component(page_id, component.id) is component
+        assert component.name == 'Renamed'
+
+        updated = await client.update_component(page_id, component.id, {'status': 'MAJOROUTAGE'})
+        assert updated is component and component.status is ComponentStatus.MAJOROUTAGE
+
+        incident_id = next(iter(fake.pages[page_id]['incidents']))
+        incident = await client.get_incident(page_id, incident_id)
+        fake.pages[page_id]['incidents'][incident_id]['status'] = 'MONITORING'
+        await client.getall_incidents(page_id)
+        assert client.get_cached_incident(page_id, incident_id) is incident
+        assert incident.status is IncidentStatus.MONITORING
+
+        await client.delete_component(page_id, component.id)
+        assert client.get_cached_component(page_id, component.id) is None
+        await client.delete_status_page(page_id)
+        assert client.get_cached_components(page_id) == [] and client.get_cached_incident(page_id, incident_id) is None
+        await client.close()
+
+
+async def test_without_a_cache_every_response_is_a_new_object():
+    async with FakeInstatus() as fake:
+        page_id = fake.add_page(components=1)
+        client = fake.client()
+        component_id = next(iter(fake.pages[page_id]['components']))
+        assert await client.get_component(page_id, component_id) is not await client.get_component(page_id, component_id)
+        assert client.get_cached_component(page_id, component_id) is None
+        await client.close()
+
+
+def test_references_do_not_wipe_cached_objects():
+    cache = StateCache()
+    component = cache.store(Component, {'id': 'c1', 'name': 'API', 'status': 'OPERATIONAL'}, page_id='p1')
+    assert cache.store(Component, {'id': 'c1'}, page_id='p1') is component
+    assert component.name == 'API'
+    # a reference to an object that isn't cached is not inserted
+    cache.store(Component, {'id': 'c2'}, page_id='p1')
+    assert cache.get(Component, 'p1', 'c2') is None
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    cache = StateCache(policies={Component: CachePolicy(max_size=2, ttl=60)})
+    for object_id in ('c1', 'c2'):
+        cache.store(Component, {'id': object_id, 'name': object_id}, page_id='p1')
+    cache.get(Component, 'p1', 'c1')
+    cache.store(Component, {'id': 'c3', 'name': 'c3'}, page_id='p1')
+    # c2 was the least recently used
+    assert cache.get(Component, 'p1', 'c2') is None
+    assert [c.id for c in cache.all(Component, 'p1')] == ['c1', 'c3']
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 61)
+    assert cache.get(Component, 'p1', 'c1') is None and len(cache) == 1
+    assert cache.stats()['Component'] == {'size': 1, 'hits': 0, 'misses': 3, 'evictions': 2}
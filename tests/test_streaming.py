@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+import pytest
+
+from instatus import StatusClient
+from instatus.codec import StdlibCodec
+from instatus.retry import RetryPolicy
+from instatus.streaming import JSONArrayDecoder
+from instatus.transport import MemoryResponse, MemoryTransport
+
+DOCUMENT = [
+    {'id': 'a', 'name': 'with "quotes", [brackets] and {braces}', 'nested': {'list': [1, [2, {}]]}},
+    {'id': 'b', 'name': 'back\\slash\\', 'unicode': 'Störung – API ✓'},
+    [], 'string', 12.5, None, True,
+]
+
+
+def decode(body, size):
+    decoder = JSONArrayDecoder(StdlibCodec())
+    items = []
+    for start in range(0, len(body), size):
+        items.extend(decoder.feed(body[start:start + size]))
+    items.extend(decoder.close())
+    return items
+
+
+def test_decodes_any_chunking():
+    body = json.dumps(DOCUMENT, ensure_ascii=False, indent=1).encode()
+    for size in (1, 2, 3, 7, 64, len(body)):
+        assert decode(body, size) == DOCUMENT, size
+    assert decode(b' [ ] ', 1) == []
+
+
+def test_other_documents_are_one_element():
+    assert decode(b'{"message": "not a list"}', 4) == [{'message': 'not a list'}]
+
+
+def test_truncated_array_raises():
+    with pytest.raises(ValueError):
+        decode(b'[{"id": "a"}, {"id": ', 5)
+
+
+class BrokenContent:
+    # yields the first part of the body, then loses the connection
+    def __init__(self, body):
+        self.body = body
+
+    async def iter_chunked(self, size):
+        yield self.body[:len(self.body) // 2]
+        raise ConnectionResetError('connection lost')
+
+
+async def test_iterates_a_list_route():
+    transport = MemoryTransport()
+    components = [{'id': 'c%d' % i, 'name': 'Component %d' % i} for i in range(50)]
+    failures = [503]
+
+    @transport.route('GET', '/v1/{page_id}/components')
+    async def handler(request):
+        if failures:
+            return MemoryResponse(failures.pop(), json={'message': 'unavailable'})
+        return components
+
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport,
+                          retry_policy=RetryPolicy(backoff_base=0.01))
+    items = [item async for item in client._http.iter_components('page')]
+    await client.close()
+
+    # the 503 before the first item was retried
+    assert items == components
+    assert transport.requests == 2
+
+
+async def test_connection_lost_after_items_is_not_retried():
+    transport = MemoryTransport()
+
+    @transport.route('GET', '/v1/{page_id}/components')
+    async def handler(request):
+        response = MemoryResponse(json=[{'id': 'c%d' % i} for i in range(20)])
+        response.content = BrokenContent(response._body)
+        return response
+
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport)
+    items = []
+    with pytest.raises(ConnectionResetError):
+        async for item in client._http.iter_components('page'):
+            items.append(item)
+    await client.close()
+
+    # what was yielded can't be taken back, so the request isn't sent again
+    assert 0 < len(items) < 20
+    assert transport.requests == 1
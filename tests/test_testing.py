@@ -0,0 +1,73 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from instatus.errors import InstatusServerError, NotFound
+from instatus.retry import RetryPolicy
+from instatus.testing import FakeInstatus
+
+
+async def test_crud_and_summary():
+    async with FakeInstatus() as fake:
+        page_id = fake.add_page(subdomain='mypage', components=2)
+        client = fake.client()
+        created = await client.create_component(page_id, {'name': 'Web', 'status': 'MAJOROUTAGE'})
+        assert fake.pages[page_id]['components'][created.id]['name'] == 'Web'
+        assert len(await client.get_all_components(page_id)) == 3
+
+        summary = await client.fetch_summary('mypage')
+        assert summary['page']['name'] == 'Mypage' and len(summary['components']) == 3
+
+        await client.delete_component(page_id, created.id)
+        assert created.id not in fake.pages[page_id]['components']
+        with pytest.raises(NotFound):
+            await client.get_component(page_id, created.id)
+        with pytest.raises(NotFound):
+            await client.get_all_components('unknown')
+        await client.close()
+
+
+async def test_rate_limit_headers_and_429s():
+    async with FakeInstatus(rate_limit=3, window=10) as fake:
+        page_id = fake.add_page(components=1)
+        async with aiohttp.ClientSession() as session:
+            statuses = []
+            for _ in range(4):
+                async with session.get(fake.url + 'v1/%s/components' % page_id) as r:
+                    statuses.append((r.status, r.headers.get('X-Ratelimit-Remaining')))
+                    body = await r.json()
+            assert r.headers['Via'] and int(r.headers['Retry-After']) >= 1
+            # the summary isn't limited
+            async with session.get(fake.url + 'summary.json', params={'prod_name': 'page-1'}) as r:
+                assert r.status == 200
+
+    assert statuses == [(200, '2'), (200, '1'), (200, '0'), (429, '0')]
+    assert body['retry_after'] > 0 and body['global'] is False
+    assert fake.stats['rate_limited'] == 1
+
+
+async def test_global_limit_over_all_pages():
+    async with FakeInstatus(rate_limit=100, global_limit=2, window=10) as fake:
+        pages = [fake.add_page() for _ in range(3)]
+        async with aiohttp.ClientSession() as session:
+            statuses = []
+            for page_id in pages:
+                async with session.get(fake.url + 'v1/%s/components' % page_id) as r:
+                    statuses.append(r.status)
+                    body = await r.json()
+
+    assert statuses == [200, 200, 429] and body['global'] is True
+    assert fake.stats['global_rate_limited'] == 1
+
+
+async def test_injected_faults():
+    async with FakeInstatus(error_rate=1.0, error_statuses=(502,), seed=1) as fake:
+        page_id = fake.add_page(components=1)
+        client = fake.client(retry_policy=RetryPolicy(2, backoff_base=0.01))
+        with pytest.raises(InstatusServerError) as raised:
+            await client.get_all_components(page_id)
+        await client.close()
+
+    assert raised.value.status == 502
+    assert fake.stats['faults'] == 2 and fake.stats['ok'] == 0
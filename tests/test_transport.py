@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from instatus import StatusClient
+from instatus.errors import NotFound
+from instatus.retry import RetryPolicy
+from instatus.transport import AiohttpTransport, MemoryResponse, MemoryTransport
+
+
+async def test_routes_requests_to_handlers():
+    transport = MemoryTransport()
+    seen = []
+
+    @transport.route('*', '/v1/{page_id}/components/{component_id}')
+    def component(request):
+        seen.append((request.method, request.match_info, request.query, request.json(),
+                     request.headers['Authorization']))
+        return {'id': request.match_info['component_id']}
+
+    client = StatusClient('secret', loop=asyncio.get_running_loop(), transport=transport)
+    assert await client._http.get_component('p1', 'c1') == {'id': 'c1'}
+    assert await client._http.update_component('p1', 'c2', {'status': 'OPERATIONAL'}) == {'id': 'c2'}
+    with pytest.raises(NotFound):
+        await client._http.get_all_components('p1')
+    await client.close()
+
+    assert seen == [('GET', {'page_id': 'p1', 'component_id': 'c1'}, {}, None, 'Bearer secret'),
+                    ('PUT', {'page_id': 'p1', 'component_id': 'c2'}, {}, {'status': 'OPERATIONAL'},
+                     'Bearer secret')]
+    assert transport.requests == 3
+
+
+async def test_response_works_like_the_aiohttp_one():
+    response = MemoryResponse(json={'name': 'Störung'}, headers={'X-Ratelimit-Remaining': '3'})
+    async with response as r:
+        assert r.status == 200 and r.reason == 'OK'
+        assert r.headers['content-type'] == 'application/json; charset=utf-8' and r.charset == 'utf-8'
+        assert await r.read() == b'{"name":"St\\u00f6rung"}'
+        assert [chunk async for chunk in r.content.iter_chunked(8)][0] == b'{"name":'
+        assert await r.release() is None
+
+    text = MemoryResponse(503, body='down')
+    assert text.reason == 'Service Unavailable' and await text.text() == 'down'
+
+
+async def test_handler_raising_oserror_is_a_connection_error():
+    transport = MemoryTransport()
+    failures = [ConnectionResetError('reset')]
+
+    @transport.route('GET', '/v1/{page_id}/components')
+    def components(request):
+        if failures:
+            raise failures.pop()
+        return []
+
+    client = StatusClient('key', loop=asyncio.get_running_loop(), transport=transport,
+                          retry_policy=RetryPolicy(backoff_base=0.01))
+    assert await client._http.get_all_components('page') == []
+    await client.close()
+    assert transport.requests == 1
+
+
+async def test_aiohttp_transport_closes_only_its_own_pool():
+    own = AiohttpTransport()
+    session = own.session
+    assert own.session is session and not own.closed
+    await own.close()
+    assert own.closed and own.pool.closed
+    own.recreate()
+    assert not own.closed
+    await own.close()
+
+    shared = AiohttpTransport(pool=own.pool)
+    shared.session
+    await shared.close()
+    assert shared.closed and not shared.pool.closed
+    await own.pool.close()
@@ -0,0 +1,57 @@
+import asyncio
+
+from instatus import StateCache
+from instatus.testing import FakeInstatus
+from instatus.watcher import _fingerprint
+
+
+def test_fingerprint_ignores_key_order():
+    assert _fingerprint({'id': 'a', 'name': 'API'}) == _fingerprint({'name': 'API', 'id': 'a'})
+    assert _fingerprint({'id': 'a', 'name': 'API'}) != _fingerprint({'id': 'a', 'name': 'Web'})
+
+
+async def test_edit_events():
+    async with FakeInstatus() as fake:
+        page_id = fake.add_page(components=2)
+        client = fake.client()
+        watcher = client.watch(page_id, interval=3600)
+        changes = []
+
+        @watcher.event
+        async def on_component_status_change(component, before, after):
+            changes.append((component.id, before.value, after.value))
+
+        await watcher.start()
+        component_id, component = next(iter(fake.pages[page_id]['components'].items()))
+        component['status'] = 'MAJOROUTAGE'
+        await watcher.poll()
+        await watcher.stop()
+        await client.close()
+
+    assert changes == [(component_id, 'OPERATIONAL', 'MAJOROUTAGE')]
+
+
+async def test_snapshot_does_not_roll_back_the_state_cache():
+    async with FakeInstatus() as fake:
+        page_id = fake.add_page(incidents=1)
+        incident_id, incident = next(iter(fake.pages[page_id]['incidents'].items()))
+        incident['incidentUpdates'].append({'id': 'u1', 'message': 'old', 'status': 'INVESTIGATING'})
+        client = fake.client(state_cache=StateCache())
+        watcher = client.watch(page_id, interval=3600, watch=('incident',))
+        seen = []
+
+        @watcher.event
+        async def on_incident_edit(before, after, changes):
+            # reading the nested models of the old snapshot must not touch the cached ones
+            seen.append([update.message for update in before.updates])
+
+        await watcher.start()
+        incident['incidentUpdates'][0]['message'] = 'new'
+        await watcher.poll()
+        await watcher.stop()
+
+        cached = client.get_cached_incident(page_id, incident_id)
+        await client.close()
+
+    assert seen == [['old']]
+    assert [update.message for update in cached.updates] == ['new']